@@ -0,0 +1,176 @@
+"""Benchmark suite of the evaluator, the score system and the ranking generator.
+
+Run it with python -m analysis.benchmark. Hands are generated before timing, so only
+evaluation is measured. Every benchmark reports the best of several repetitions,
+and its peak memory from a separate traced run.
+
+Results are printed as JSON, or written to --output. With --baseline, results are
+compared with a stored run, and the process exits with status 1 when a benchmark is
+slower than its baseline by more than --tolerance. Baselines depend on the machine:
+refresh analysis/benchmark_baseline.json with --save-baseline after hardware changes.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from src import rank_generator, hand_evaluator, score_system
+
+try:
+    from src import batch_evaluator
+except ImportError:
+    batch_evaluator = None
+
+# (values, suits, size): standard deck, 7-card hands, short deck and large decks
+CONFIGS = [(13, 4, 5), (13, 4, 7), (9, 4, 5), (20, 5, 5), (26, 8, 7)]
+BASELINE = "analysis/benchmark_baseline.json"
+
+
+def make_hands(values: int, suits: int, size: int, n: int, seed: int = 0) -> list[list[tuple[int, int]]]:
+    """n random hands of a deck with cards valued from 2 to values + 1.
+    """
+    rng = random.Random(seed)
+    deck = [(value, suit) for value in range(2, values + 2) for suit in range(suits)]
+    return [rng.sample(deck, size) for _ in range(n)]
+
+
+def measure(function, count: int, repeat: int) -> dict:
+    """Best time of repeat calls of function, which processes count units,
+    and peak memory allocated in one extra call.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        function()
+        best = min(best, time.perf_counter_ns() - start)
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"count": count, "seconds": best / 1e9, "per_second": count * 1e9 / max(best, 1),
+            "ns_each": best / count, "peak_bytes": peak}
+
+
+def run_suite(configs: list[tuple[int, int, int]] = CONFIGS,
+              hands: int = 20000,
+              repeat: int = 5) -> list[dict]:
+    """Runs every benchmark on every configuration.
+
+    Parameters
+    ----------
+    configs : list[tuple[int, int, int]], default CONFIGS
+        (values, suits, size) of the configurations.
+    hands : int, default 20000
+        Number of hands per benchmark.
+    repeat : int, default 5
+        Number of timed repetitions. The best one is reported.
+
+    Returns
+    -------
+    list[dict]
+        One record per benchmark and configuration. Units are hands, except for
+        generate_ranking, which counts uncached calls.
+    """
+    results = []
+    previous_dir = rank_generator._cache_dir
+    rank_generator.set_cache_dir(None)
+    try:
+        for values, suits, size in configs:
+            ace_value = values + 1
+            name = {"values": values, "suits": suits, "size": size}
+
+            def ranking_calls(calls=20):
+                for _ in range(calls):
+                    rank_generator.clear_cache()
+                    rank_generator.generate_ranking(values, suits, size)
+            records = {"generate_ranking": (measure(ranking_calls, 20, repeat), "call")}
+
+            ranking, _ = rank_generator.generate_ranking(values, suits, size)
+            records["generate_hands"] = (measure(
+                lambda: make_hands(values, suits, size, hands), hands, repeat), "hand")
+            sample = make_hands(values, suits, size, hands)
+            evaluated = [hand_evaluator.evaluate_hand(hand, ace_value) for hand in sample]
+            card_values = [[card[0] for card in result[0]] for result in evaluated]
+            ranks = [ranking[result[1:]] for result in evaluated]
+
+            records["evaluate_hand"] = (measure(
+                lambda: [hand_evaluator.evaluate_hand(hand, ace_value) for hand in sample], hands, repeat), "hand")
+            records["hand_score"] = (measure(
+                lambda: [score_system.hand_score(v, r, ace_value) for v, r in zip(card_values, ranks)],
+                hands, repeat), "hand")
+            records["log_score"] = (measure(
+                lambda: [score_system.log_score(v, r, ace_value) for v, r in zip(card_values, ranks)],
+                hands, repeat), "hand")
+            if batch_evaluator is not None:
+                codes = batch_evaluator.random_hands(hands, values, suits, size)
+                records["evaluate_batch"] = (measure(
+                    lambda: batch_evaluator.evaluate_batch(codes, values, suits, ranking=ranking),
+                    hands, repeat), "hand")
+
+            for benchmark, (record, unit) in records.items():
+                results.append({"benchmark": benchmark, **name, "unit": unit, **record})
+    finally:
+        rank_generator.set_cache_dir(previous_dir)
+    return results
+
+
+def _key(record: dict) -> tuple:
+    return record["benchmark"], record["values"], record["suits"], record["size"]
+
+
+def compare(results: list[dict], baseline: list[dict], tolerance: float = 0.5) -> list[str]:
+    """Descriptions of the benchmarks slower than their baseline by more than tolerance,
+    as a fraction of the baseline time. Benchmarks missing from the baseline are skipped.
+    """
+    reference = {_key(record): record for record in baseline}
+    regressions = []
+    for record in results:
+        base = reference.get(_key(record))
+        if base is not None and record["ns_each"] > base["ns_each"] * (1 + tolerance):
+            regressions.append(f"{record['benchmark']} {record['values']}x{record['suits']}x{record['size']}: "
+                               f"{record['ns_each']:.0f} ns per {record['unit']}, "
+                               f"baseline {base['ns_each']:.0f} ns")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark suite of the hand evaluator.")
+    parser.add_argument("--hands", type=int, default=20000, help="hands per benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="timed repetitions, the best one is kept")
+    parser.add_argument("--output", default=None, help="JSON file for the results, stdout by default")
+    parser.add_argument("--baseline", nargs="?", const=BASELINE, default=None,
+                        help=f"compare with a stored run, {BASELINE} by default")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown over the baseline")
+    parser.add_argument("--save-baseline", nargs="?", const=BASELINE, default=None,
+                        help=f"store the results as the new baseline, {BASELINE} by default")
+    args = parser.parse_args(argv)
+
+    results = run_suite(hands=args.hands, repeat=args.repeat)
+    report = {"python": platform.python_version(), "machine": platform.machine(), "results": results}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as file:
+            file.write(text + "\n")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,32 +2,39 @@ import matplotlib.pyplot as plt
 import numpy as np
 
 from matplotlib.colors import ListedColormap, BoundaryNorm
-from src import rank_generator
+from src import parameter_sweep
 
 cmap = ListedColormap(['darkgray', 'black', 'firebrick'])
 bounds = [-1.5, -0.1, 0.1, 1.5]
 norm = BoundaryNorm(bounds, cmap.N)
 
 x, y = 3, 3
+number_suits = np.arange(1, 6)
+sweep = parameter_sweep.sweep(range(3, 3 + x * y + 10), number_suits, range(3, 3 + x * y))
+
+
+def counts_of(rows):
+    return {(int(a), int(b), int(c)): n for a, b, c, n in
+            zip(sweep['values'][rows], sweep['suits'][rows], sweep['size'][rows], sweep['count'][rows])}
+
+
+flushes = counts_of(sweep['is_flush'] & ~sweep['is_straight'])
+straights = counts_of(sweep['is_straight'] & ~sweep['is_flush'])
+
 fig, axes = plt.subplots(x, y, figsize=(12, 6))
 for k, ax in enumerate(axes.flatten()):
     hand_size = k + 3
 
-    flush = (tuple(hand_size * [1]), False, True, False)
-    straight = (tuple(hand_size * [1]), True, False, False)
-
     number_values = np.arange(hand_size, hand_size + 10, 1)
-    number_suits = np.arange(1, 6)
 
     v, s = np.meshgrid(number_values, number_suits)
     z = np.zeros_like(v, dtype=int)
 
     for i in range(v.shape[0]):
         for j in range(v.shape[1]):
-            ranking, odds = rank_generator.generate_ranking(int(v[i][j]), int(s[i][j]), hand_size)
-            flushes = odds.get(flush, 0)
-            straights = odds.get(straight, 0)
-            z[i, j] = - int(flushes > straights) + int(flushes < straights)
+            cell = (int(v[i][j]), int(s[i][j]), hand_size)
+            flush_count, straight_count = flushes.get(cell, 0), straights.get(cell, 0)
+            z[i, j] = - int(flush_count > straight_count) + int(flush_count < straight_count)
 
     sc = ax.scatter(v, s, s=10, c=z, cmap=cmap, norm=norm)
 
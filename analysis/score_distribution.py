@@ -1,7 +1,7 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.lines import Line2D
-from src import rank_generator, hand_evaluator, score_system
+from src import rank_generator, batch_evaluator
 
 hand_size = 5
 sample_size = 1000000
@@ -13,28 +13,16 @@ hand_names = [
     'Flush', 'Full House', 'Four of a Kind', 'Straight Flush', 'Royal Flush'
 ]
 
-cards_range = list(range(number_values * number_suits))
-cards = [(i, j) for i in range(2, 15) for j in range(1, 5)]
-
-samples = [np.random.choice(cards_range, 5, replace=False) for i in range(sample_size)]
-hands = [[cards[i] for i in hand] for hand in samples]
-
-hand_scores = []
-for hand in hands:
-    sorted_cards, frequencies, is_straight, is_flush, is_royal_flush = \
-        hand_evaluator.evaluate_hand(hand, ace_value, alt_ace_value=alt_value)
-    sorted_values = [card[0] for card in sorted_cards]
-    odd = odds[(frequencies, is_straight, is_flush, is_royal_flush)]
-    hand_rank = ranking[(frequencies, is_straight, is_flush, is_royal_flush)]
-    hand_score = score_system.log_score(sorted_values, hand_rank, ace_value)
-    hand_scores.append((hand_rank, hand_score, odd))
+samples = batch_evaluator.random_hands(sample_size, number_values, number_suits, hand_size, ace_value)
+hands = batch_evaluator.evaluate_batch(samples, number_values, number_suits, ace_value,
+                                       alt_ace_value=alt_value, ranking=ranking)
 
 quantiles = np.linspace(0, 1, sample_size)
-hand_scores.sort(key=lambda tup: tup[1])
-ranks, scores, odds = list(zip(*hand_scores))
+order = np.argsort(hands['log_score'], kind='stable')
+ranks, scores = hands['hand_rank'][order], hands['log_score'][order]
 
 cmap = plt.get_cmap('tab10')
-colors = [cmap(val/9) for val in ranks]
+colors = cmap(ranks / 9)
 
 fig, ax = plt.subplots(figsize=(8, 6))
 sc = ax.scatter(quantiles, scores, s=10, c=colors)
@@ -1,6 +1,6 @@
 import numpy as np
 import time
-from src import rank_generator, hand_evaluator, score_system
+from src import rank_generator, hand_evaluator, score_system, batch_evaluator
 
 hand_size = 5
 sample_size = 1000000
@@ -25,3 +25,12 @@ for hand in hands:
 end_time = time.time()
 elapsed = end_time - start_time
 print(f'Total execution time for evaluating {sample_size} hands: {elapsed:.3f} seconds')
+
+# card i of cards_range has value i // 4 + 2 and suit index i % 4, so its code is i + 8
+codes = np.array(samples) + 2 * number_suits
+start_time = time.time()
+batch = batch_evaluator.evaluate_batch(codes, number_values, number_suits, ace_value,
+                                       alt_ace_value=alt_value, ranking=ranking)
+end_time = time.time()
+elapsed = end_time - start_time
+print(f'Total execution time for evaluating {sample_size} hands in one batch: {elapsed:.3f} seconds')
@@ -1,4 +1,4 @@
-from setuptools import setup, find_packages
+from setuptools import setup
 
 setup(
     name="combinatorial-poker-hand-evaluator",
@@ -6,15 +6,19 @@ setup(
     description="A combinatorial, general, and efficient poker hand evaluator with scoring.",
     author="Victor Mendez",
     author_email="vick08bv@gmail.com",
-    packages=find_packages(where="src"),
-    package_dir={"": "src"},
+    packages=["poker_evaluator"],
+    package_dir={"poker_evaluator": "src"},
     python_requires=">=3.9",
     install_requires=[
 
     ],
     extras_require={
+        "batch": ["numpy"],
         "dev": ["pytest", "numpy", "matplotlib"]
     },
+    entry_points={
+        "console_scripts": ["poker-pipeline=poker_evaluator.pipeline:main"]
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -0,0 +1,263 @@
+"""Vectorized evaluator for arrays of n-card hands. Requires numpy.
+
+Hands are rows of integer card codes, value * suits + suit,
+as in bitmask_evaluator.
+"""
+
+import numpy as np
+from itertools import combinations
+from .batch_scores import horner, hand_score_batch, log_score_batch
+from .rank_generator import generate_ranking
+
+
+def hand_dtype(size: int, exact_score: bool = True) -> np.dtype:
+    """Structured dtype of the results of evaluate_batch.
+    """
+    return np.dtype([
+        ('sorted_values', np.int16, (size, )),
+        ('frequency_signature', np.int16, (size, )),
+        ('is_straight', np.bool_),
+        ('is_flush', np.bool_),
+        ('is_royal_flush', np.bool_),
+        ('hand_rank', np.int32),
+        ('score', np.int64 if exact_score else np.float64),
+        ('log_score', np.float64),
+    ])
+
+
+def _category_keys(ranking: dict[tuple, int], suits: int, size: int) -> tuple[np.ndarray, np.ndarray]:
+    """Sorted integer keys of the ranking categories, and their ranks.
+    """
+    keys = {}
+    for (frequencies, is_straight, is_flush, is_royal_flush), rank in ranking.items():
+        key = 0
+        for f in frequencies + (size - len(frequencies)) * (0, ):
+            key = key * (suits + 1) + f
+        keys[key * 8 + 4 * is_straight + 2 * is_flush + is_royal_flush] = rank
+    sorted_keys = sorted(keys)
+    return np.array(sorted_keys, dtype=np.int64), np.array([keys[k] for k in sorted_keys], dtype=np.int64)
+
+
+def _sort_rows_descending(rows: np.ndarray) -> np.ndarray:
+    """Sorts every row in descending order.
+    Short rows go through an odd-even transposition network over columns,
+    which is faster than one np.sort call per row.
+    """
+    size = rows.shape[1]
+    if size > 8:
+        return np.sort(rows, axis=1)[:, ::-1]
+    columns = [rows[:, k] for k in range(size)]
+    for step in range(size):
+        for k in range(step % 2, size - 1, 2):
+            columns[k], columns[k + 1] = np.maximum(columns[k], columns[k + 1]), np.minimum(columns[k], columns[k + 1])
+    return np.column_stack(columns)
+
+
+def random_hands(n: int, values: int, suits: int, size: int,
+                 main_ace_value: int = None, rng: np.random.Generator = None) -> np.ndarray:
+    """Deals n hands without repeated cards inside a hand.
+
+    Parameters
+    ----------
+    n : int
+        Number of hands.
+    values : int
+        Number of cards per suit.
+    suits : int
+        Number of suits in the deck.
+    size : int
+        Hand size used.
+    main_ace_value : int, default values + 1
+        Numerical value of the aces, the best valued cards in the deck.
+    rng : np.random.Generator, optional
+        Source of randomness. A new default generator is used when missing.
+
+    Returns
+    -------
+    np.ndarray
+        Card codes with shape (n, size).
+    """
+    if main_ace_value is None:
+        main_ace_value = values + 1
+    if rng is None:
+        rng = np.random.default_rng()
+    lowest_code = (main_ace_value - values + 1) * suits
+    deck = values * suits
+    keys = rng.random((n, deck))
+    return np.argpartition(keys, size - 1, axis=1)[:, :size] + lowest_code
+
+
+def _evaluate_columns(cards: np.ndarray, values: int, suits: int, main_ace_value: int, royal_flush: bool,
+                      dual_ace: bool, replace_value: bool, alt_ace_value: int,
+                      ranking: dict[tuple, int], with_score: bool = True) -> dict[str, np.ndarray]:
+    """Fields of evaluate_batch as separate arrays, except log_score.
+    The score is left out when with_score is False.
+    """
+    cards = np.asarray(cards)
+    n, size = cards.shape
+    if main_ace_value is None:
+        main_ace_value = values + 1
+    if ranking is None:
+        ranking, _ = generate_ranking(values, suits, size, royal_flush, dual_ace)
+    base = main_ace_value + 1
+    max_rank = max(ranking.values())
+
+    # small integers keep the per-card arrays cheap to sort and compare
+    max_key = max(size * base + main_ace_value, (main_ace_value + 1) * suits)
+    small = next(t for t in (np.int16, np.int32, np.int64) if max_key <= np.iinfo(t).max)
+    code_values = np.arange((main_ace_value + 1) * suits, dtype=small) // suits
+    card_values = code_values[cards]
+    card_suits = (np.arange((main_ace_value + 1) * suits, dtype=small) % suits)[cards]
+
+    # value frequency of every card
+    if size * size <= values * suits:
+        card_counts = np.zeros((n, size), dtype=small)
+        for k in range(size):
+            card_counts += card_values == card_values[:, k:k + 1]
+    else:
+        rank_index = card_values - (main_ace_value - values + 1)
+        rows = np.arange(n)[:, None]
+        counts = np.bincount((rows * values + rank_index).ravel(), minlength=n * values).reshape(n, values)
+        card_counts = counts[rows, rank_index].astype(small)
+
+    # cards sorted by value frequency and then by value
+    sort_keys = _sort_rows_descending(card_counts * small(base) + card_values)
+    key_counts = np.arange(max_key + 1, dtype=small) // base
+    sorted_counts = key_counts[sort_keys]
+    sorted_values = sort_keys - sorted_counts * small(base)
+    high, low = sorted_values[:, 0], sorted_values[:, -1]
+
+    # frequency signature, one frequency per group of equal values
+    group_starts = np.ones((n, size), dtype=bool)
+    group_starts[:, 1:] = sorted_values[:, 1:] != sorted_values[:, :-1]
+    signature = _sort_rows_descending(sorted_counts * group_starts)
+    special = sorted_counts[:, 0] == 1
+
+    is_flush = special.copy()
+    for k in range(1, size):
+        is_flush &= card_suits[:, k] == card_suits[:, 0]
+    is_straight = special & (high - low == size - 1)
+    is_royal_flush = is_straight & is_flush & (high == main_ace_value) & royal_flush
+
+    # wheel hand
+    if dual_ace and size > 1:
+        is_wheel = special & ~is_straight & (high == main_ace_value) & \
+            (sorted_values[:, 1] - low == size - 2) & (low - alt_ace_value == 1)
+        wheels = sorted_values[is_wheel]
+        wheels = np.roll(wheels, -1, axis=1)
+        if replace_value:
+            wheels[:, -1] = alt_ace_value
+        sorted_values[is_wheel] = wheels
+        is_straight |= is_wheel
+
+    # hand ranks, looked up once per distinct category
+    flags = 4 * is_straight + 2 * is_flush + is_royal_flush
+    if (suits + 1) ** size * 8 < 2 ** 63:
+        keys, key_ranks = _category_keys(ranking, suits, size)
+        hand_keys = horner(signature, np.int64(suits + 1)) * 8 + flags
+        hand_rank = key_ranks[np.searchsorted(keys, hand_keys)]
+    else:
+        categories = np.column_stack([signature, flags])
+        unique_categories, inverse = np.unique(categories, axis=0, return_inverse=True)
+        category_ranks = np.array([
+            ranking[(tuple(int(f) for f in row[:size] if f), bool(row[size] & 4), bool(row[size] & 2),
+                     bool(row[size] & 1))]
+            for row in unique_categories
+        ], dtype=np.int64)
+        hand_rank = category_ranks[inverse.ravel()]
+
+    columns = {'sorted_values': sorted_values, 'frequency_signature': signature, 'is_straight': is_straight,
+               'is_flush': is_flush, 'is_royal_flush': is_royal_flush, 'hand_rank': hand_rank}
+    if with_score:
+        columns['score'] = hand_score_batch(sorted_values, hand_rank, main_ace_value, max_rank)
+    return columns
+
+
+def evaluate_batch(cards: np.ndarray,
+                   values: int,
+                   suits: int,
+                   main_ace_value: int = None,
+                   royal_flush: bool = True,
+                   dual_ace: bool = True,
+                   replace_value: bool = True,
+                   alt_ace_value: int = 1,
+                   ranking: dict[tuple, int] = None) -> np.ndarray:
+    """Classifies and scores every hand in an array, without looping over hands.
+    Same results as evaluate_hand, generate_ranking and hand_score applied to each row.
+
+    Parameters
+    ----------
+    cards : np.ndarray
+        Card codes with shape (N, size).
+    values : int
+        Number of cards per suit.
+    suits : int
+        Number of suits in the deck.
+    main_ace_value : int, default values + 1
+        Numerical value of the aces, the best valued cards in the deck.
+    royal_flush : bool, default True
+        Treats royal flush separately from straight flush.
+    dual_ace : bool, default True
+        Allow aces to form wheel straights.
+    replace_value : bool default True
+        Change ace value in a wheel.
+    alt_ace_value : int default 1
+        Alternative ace value in wheels.
+    ranking : dict[tuple, int], optional
+        Ranking from generate_ranking. Computed when missing.
+
+    Returns
+    -------
+    np.ndarray
+        Structured array with shape (N, ) and dtype hand_dtype(size).
+        Frequency signatures are padded with zeros up to size.
+        Scores are float approximations when the highest score does not fit in 64 bits.
+    """
+    columns = _evaluate_columns(cards, values, suits, main_ace_value, royal_flush, dual_ace,
+                                replace_value, alt_ace_value, ranking)
+    size = columns['sorted_values'].shape[1]
+    result = np.zeros(len(columns['score']), dtype=hand_dtype(size, columns['score'].dtype == np.int64))
+    for name in result.dtype.names:
+        if name != 'log_score':
+            result[name] = columns[name]
+    result['log_score'] = log_score_batch(columns['sorted_values'], columns['hand_rank'],
+                                          values + 1 if main_ace_value is None else main_ace_value)
+    return result
+
+
+def best_scores_batch(cards: np.ndarray,
+                      size: int,
+                      values: int,
+                      suits: int,
+                      main_ace_value: int = None,
+                      royal_flush: bool = True,
+                      dual_ace: bool = True,
+                      replace_value: bool = True,
+                      alt_ace_value: int = 1,
+                      ranking: dict[tuple, int] = None) -> np.ndarray:
+    """Score of the best hand of size cards in every row of cards.
+    Every subset of size columns is scored with evaluate_batch, and the best score is kept.
+
+    Parameters
+    ----------
+    cards : np.ndarray
+        Card codes with shape (N, n), where n >= size.
+    size : int
+        Hand size used.
+    values, suits, main_ace_value, royal_flush, dual_ace, replace_value, alt_ace_value, ranking
+        Same as in evaluate_batch.
+
+    Returns
+    -------
+    np.ndarray
+        Best scores with shape (N, ). Scores are exact integers when they fit in 64 bits.
+    """
+    cards = np.asarray(cards)
+    n_hands, n_cards = cards.shape
+    if ranking is None:
+        ranking, _ = generate_ranking(values, suits, size, royal_flush, dual_ace)
+    subsets = np.array(list(combinations(range(n_cards), size)), dtype=np.intp)
+    hands = cards[:, subsets].reshape(-1, size)
+    scores = _evaluate_columns(hands, values, suits, main_ace_value, royal_flush, dual_ace,
+                               replace_value, alt_ace_value, ranking)['score']
+    return scores.reshape(n_hands, len(subsets)).max(axis=1)
@@ -0,0 +1,97 @@
+"""Vectorized versions of the hand indices, for arrays of hands. Requires numpy.
+
+Hands are arrays of card codes, value * suits + suit index, as in evaluate_batch.
+"""
+
+import numpy as np
+from .deck_config import DeckConfig
+from .enumeration import binomial_columns, combinations_at
+from .hand_index import _groups, _shapes, binomial, canonical_count
+
+
+def hands_to_indices(cards: np.ndarray, config: DeckConfig = DeckConfig()) -> np.ndarray:
+    """Indices of many hands at once. Same results as hand_to_index applied to each row.
+
+    Parameters
+    ----------
+    cards : np.ndarray
+        Card codes with shape (N, size), in any order within a row.
+    config : DeckConfig, default DeckConfig()
+        Game configuration.
+
+    Returns
+    -------
+    np.ndarray
+        int64 indices with shape (N, ).
+    """
+    positions = np.sort(np.asarray(cards, dtype=np.int64), axis=1) - config.lowest_value * config.suits
+    table = binomial_columns(config.values * config.suits, config.size)
+    indices = np.zeros(len(positions), dtype=np.int64)
+    for i in range(positions.shape[1]):
+        indices += table[i + 1, positions[:, i]]
+    return indices
+
+
+def indices_to_hands(indices: np.ndarray, config: DeckConfig = DeckConfig()) -> np.ndarray:
+    """Card codes of the hands at many indices, every row sorted. Inverse of hands_to_indices.
+    """
+    return combinations_at(indices, config.values * config.suits, config.size) + config.lowest_value * config.suits
+
+
+def canonical_indices(cards: np.ndarray, config: DeckConfig = DeckConfig()) -> np.ndarray:
+    """Canonical indices of many hands at once. Same results as canonical_index applied to each row.
+
+    Parameters
+    ----------
+    cards : np.ndarray
+        Card codes with shape (N, size), in any order within a row.
+    config : DeckConfig, default DeckConfig()
+        Game configuration.
+
+    Returns
+    -------
+    np.ndarray
+        int64 canonical indices with shape (N, ).
+    """
+    if canonical_count(config) >= 2 ** 63:
+        raise ValueError("canonical indices of this configuration do not fit in 64 bits")
+    values, suits, size = config.values, config.suits, config.size
+    positions = np.sort(np.asarray(cards, dtype=np.int64), axis=1) - config.lowest_value * suits
+    ranks, suit = positions // suits, positions % suits
+
+    # rank set index of every suit: card i is the j-th card of its suit, in ascending order
+    table = binomial_columns(values, size)
+    counts = np.zeros((len(positions), suits), dtype=np.int64)
+    keys = np.zeros((len(positions), suits), dtype=np.int64)
+    rows = np.arange(len(positions))
+    for i in range(size):
+        j = counts[rows, suit[:, i]]
+        keys[rows, suit[:, i]] += table[j + 1, ranks[:, i]]
+        counts[rows, suit[:, i]] += 1
+
+    # suits sorted by number of cards and then by rank set index, in descending order
+    radix = max(binomial(values, s) for s in range(size + 1))
+    order = -np.sort(-(counts * radix + keys), axis=1)
+    counts, keys = order // radix, order % radix
+
+    shapes, offsets = _shapes(values, suits, size)
+    shape_codes = (counts * (size + 1) ** np.arange(suits - 1, -1, -1)).sum(axis=1)
+    indices = np.zeros(len(positions), dtype=np.int64)
+    for shape, offset in zip(shapes, offsets):
+        padded = np.array(shape + (0, ) * (suits - len(shape)))
+        selected = shape_codes == (padded * (size + 1) ** np.arange(suits - 1, -1, -1)).sum()
+        if not selected.any():
+            continue
+        index = np.zeros(selected.sum(), dtype=np.int64)
+        column = 0
+        for s, m in _groups(shape):
+            options = binomial(values, s)
+            group = keys[selected, column:column + m][:, ::-1]
+            multisets = binomial_columns(options + m, m)
+            group_index = np.zeros(len(group), dtype=np.int64)
+            for i in range(m):
+                group_index += multisets[i + 1, group[:, i] + i]
+            index = index * binomial(options + m - 1, m) + group_index
+            column += m
+        indices[selected] = offset + index
+    return indices
@@ -0,0 +1,200 @@
+"""Vectorized versions of the score system, for arrays of hands. Requires numpy.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+
+def horner(digits: np.ndarray, base) -> np.ndarray:
+    """Value of every row of digits in the given base, most significant digit first.
+    The type of base (np.int64 or float) sets the type of the result.
+    """
+    number = digits[:, 0].astype(type(base))
+    for k in range(1, digits.shape[1]):
+        number *= base
+        number += digits[:, k]
+    return number
+
+
+def fits_int64(ace_value: int, size: int, max_rank: int) -> bool:
+    """Check if every score of hands with size cards and ranks up to max_rank fits in an int64.
+    """
+    base = ace_value + 1
+    return (base ** size - 1) * base ** max_rank < 2 ** 63
+
+
+def hand_score_batch(card_values: np.ndarray, hand_rank: np.ndarray, ace_value: int,
+                     max_rank: int = None) -> np.ndarray:
+    """Scores of many hands at once. Same results as hand_score applied to each row.
+
+    Parameters
+    ----------
+    card_values : np.ndarray
+        Card values with shape (N, size), every row sorted as for hand_score.
+    hand_rank : np.ndarray
+        Hand ranks with shape (N, ).
+    ace_value : int
+        Numerical value of aces: the most valuated cards in the game.
+    max_rank : int, optional
+        Highest possible hand rank. Defaults to the highest rank in hand_rank.
+
+    Returns
+    -------
+    np.ndarray
+        Scores with shape (N, ). They are exact int64 values when every possible score
+        fits in 64 bits, and float64 approximations otherwise.
+    """
+    card_values = np.asarray(card_values)
+    hand_rank = np.asarray(hand_rank, dtype=np.intp)
+    base = ace_value + 1
+    if max_rank is None:
+        max_rank = int(hand_rank.max()) if hand_rank.size else 0
+    if fits_int64(ace_value, card_values.shape[1], max_rank):
+        rank_powers = np.array([base ** r for r in range(max_rank + 1)], dtype=np.int64)
+        return horner(card_values, np.int64(base)) * rank_powers[hand_rank]
+    return horner(card_values, float(base)) * float(base) ** hand_rank
+
+
+def exact_score_batch(card_values: np.ndarray, hand_rank: np.ndarray, ace_value: int) -> np.ndarray:
+    """Exact scores of many hands at once, as Python integers. Same results as hand_score applied
+    to each row, also when the scores do not fit in 64 bits.
+
+    Parameters
+    ----------
+    card_values : np.ndarray
+        Card values with shape (N, size), every row sorted as for hand_score.
+    hand_rank : np.ndarray
+        Hand ranks with shape (N, ).
+    ace_value : int
+        Numerical value of aces: the most valuated cards in the game.
+
+    Returns
+    -------
+    np.ndarray
+        Scores with shape (N, ) and object dtype.
+    """
+    card_values = np.asarray(card_values).astype(object)
+    hand_rank = np.asarray(hand_rank, dtype=np.intp)
+    base = ace_value + 1
+    max_rank = int(hand_rank.max()) if hand_rank.size else 0
+    rank_powers = np.array([base ** r for r in range(max_rank + 1)], dtype=object)
+    kicker = card_values[:, 0].copy()
+    for k in range(1, card_values.shape[1]):
+        kicker = kicker * base + card_values[:, k]
+    return kicker * rank_powers[hand_rank]
+
+
+def log_score_batch(card_values: np.ndarray, hand_rank: np.ndarray, ace_value: int) -> np.ndarray:
+    """Logarithms of the scores of many hands at once, in base (ace_value + 1).
+    Same results as log_score applied to each row, without building the scores.
+
+    Parameters
+    ----------
+    card_values : np.ndarray
+        Card values with shape (N, size), every row sorted as for hand_score.
+    hand_rank : np.ndarray
+        Hand ranks with shape (N, ).
+    ace_value : int
+        Numerical value of aces: the most valuated cards in the game.
+
+    Returns
+    -------
+    np.ndarray
+        Float scores with shape (N, ).
+    """
+    base = float(ace_value + 1)
+    return np.asarray(hand_rank) + np.log(horner(np.asarray(card_values), base)) / np.log(base)
+
+
+def _decode_int(score: int, size: int, base: int, kicker_bits: Optional[int]) -> tuple[int, list[int]]:
+    """Hand rank and card values of a non negative Python integer score, packed when kicker_bits is given.
+    """
+    if kicker_bits is not None:
+        hand_rank, score = score >> kicker_bits, score & ((1 << kicker_bits) - 1)
+    else:
+        hand_rank = 0
+        while score and score % base == 0:
+            score //= base
+            hand_rank += 1
+    card_values = []
+    for _ in range(size):
+        score, value = divmod(score, base)
+        card_values.append(value)
+    return hand_rank, card_values[::-1]
+
+
+def decode_score(score, size: int, ace_value: int, packed: bool = False) -> tuple:
+    """Hand rank and card values of hand_score results. Inverse of hand_score.
+
+    Card values are the digits of the score in base (ace_value + 1). All of them are
+    positive, so the hand rank is the number of trailing zero digits. Packed scores
+    of ScoreEngine hold the hand rank in their high bits instead.
+
+    Parameters
+    ----------
+    score : int or np.ndarray
+        Exact scores, as Python integers, an integer array or an object array of Python
+        integers, such as the results of exact_score_batch, of any shape.
+        Zeros in arrays, such as unused lookup table slots, decode to rank 0 and zero values.
+    size : int
+        Hand size used.
+    ace_value : int
+        Numerical value of aces: the most valuated cards in the game.
+    packed : bool, default False
+        Scores are ScoreEngine packed scores, such as uint64 arrays, instead of hand_score results.
+
+    Returns
+    -------
+    hand_rank : int or np.ndarray
+        Hand ranks, with the shape of score.
+    card_values : list[int] or np.ndarray
+        Card values, with an extra last axis of length size.
+
+    Raises
+    ------
+    ValueError
+        When a Python integer score is not positive, when an array holds negative scores,
+        and when integer array scores that are not packed do not fit in an int64.
+    TypeError
+        For float scores, which are not exact.
+    """
+    base = ace_value + 1
+    kicker_bits = (base ** size - 1).bit_length() if packed else None
+    if isinstance(score, int):
+        if score <= 0:
+            raise ValueError("only positive scores can be decoded")
+        return _decode_int(score, size, base, kicker_bits)
+
+    score = np.asarray(score)
+    if score.dtype == object:
+        hand_rank = np.empty(score.size, dtype=np.int64)
+        card_values = np.empty((score.size, size), dtype=np.int64)
+        for i, value in enumerate(score.ravel().tolist()):
+            if value < 0:
+                raise ValueError("only non negative scores can be decoded")
+            hand_rank[i], card_values[i] = _decode_int(int(value), size, base, kicker_bits)
+        return hand_rank.reshape(score.shape), card_values.reshape(score.shape + (size, ))
+    if not np.issubdtype(score.dtype, np.integer):
+        raise TypeError("only exact integer scores can be decoded, use exact_score_batch or packed scores")
+    if score.size and score.min() < 0:
+        raise ValueError("only non negative scores can be decoded")
+
+    if packed:
+        packed_scores = score.astype(np.uint64).ravel()
+        hand_rank = (packed_scores >> np.uint64(kicker_bits)).astype(np.int64)
+        kicker = (packed_scores & np.uint64((1 << kicker_bits) - 1)).astype(np.int64)
+    else:
+        if score.size and int(score.max()) >= 2 ** 63:
+            raise ValueError("scores do not fit in an int64, decode them as an object array")
+        kicker = score.astype(np.int64).ravel()
+        hand_rank = np.zeros(kicker.shape, dtype=np.int64)
+        shifted = (kicker % base == 0) & (kicker > 0)
+        while shifted.any():
+            kicker[shifted] //= base
+            hand_rank += shifted
+            shifted = (kicker % base == 0) & (kicker > 0)
+    card_values = np.empty((kicker.size, size), dtype=np.int64)
+    for k in range(size - 1, -1, -1):
+        kicker, card_values[:, k] = np.divmod(kicker, base)
+    return hand_rank.reshape(score.shape), card_values.reshape(score.shape + (size, ))
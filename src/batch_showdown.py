@@ -0,0 +1,76 @@
+"""Showdowns of many tables at once. Requires numpy.
+
+As in showdown, hands are compared by hand rank and then by their sorted card
+values, without computing scores, so every configuration is supported.
+"""
+
+from itertools import combinations
+from typing import Optional
+
+import numpy as np
+from .batch_evaluator import _evaluate_columns
+from .deck_config import DeckConfig
+
+
+def _strengths(hand_rank: np.ndarray, sorted_values: np.ndarray) -> np.ndarray:
+    """Position of every hand among the distinct (hand rank, card values) keys,
+    in lexicographic order. Stronger hands have greater positions.
+    """
+    keys = np.column_stack([hand_rank, sorted_values])
+    order = np.lexsort(keys.T[::-1])
+    ordered = keys[order]
+    new_key = np.ones(len(keys), dtype=bool)
+    new_key[1:] = (ordered[1:] != ordered[:-1]).any(axis=1)
+    strengths = np.empty(len(keys), dtype=np.int64)
+    strengths[order] = np.cumsum(new_key)
+    return strengths
+
+
+def showdown_batch(hands: np.ndarray,
+                   board: Optional[np.ndarray] = None,
+                   config: DeckConfig = DeckConfig(),
+                   ranking: Optional[dict[tuple, int]] = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Winners of many tables at once. Same results as showdown applied to each table.
+
+    Parameters
+    ----------
+    hands : np.ndarray
+        Card codes of the players, with shape (tables, players, cards per player).
+    board : np.ndarray, optional
+        Card codes of the boards, with shape (tables, board size).
+    config : DeckConfig, default DeckConfig()
+        Game configuration.
+    ranking : dict[tuple, int], optional
+        Ranking for the configuration. Computed when missing.
+
+    Returns
+    -------
+    winners : np.ndarray
+        Boolean array with shape (tables, players), True for the players splitting the pot.
+    hand_rank : np.ndarray
+        Hand rank of the best hand of every player, with shape (tables, players).
+    sorted_values : np.ndarray
+        Card values of the best hand of every player, sorted as in evaluate_hand,
+        with shape (tables, players, config.size).
+    """
+    hands = np.asarray(hands)
+    n_tables, n_players, _ = hands.shape
+    if ranking is None:
+        ranking, _ = config.ranking()
+    cards = hands
+    if board is not None:
+        board = np.broadcast_to(np.asarray(board)[:, None, :], (n_tables, n_players, np.shape(board)[1]))
+        cards = np.concatenate([hands, board], axis=2)
+    cards = cards.reshape(n_tables * n_players, -1)
+    subsets = np.array(list(combinations(range(cards.shape[1]), config.size)), dtype=np.intp)
+    columns = _evaluate_columns(cards[:, subsets].reshape(-1, config.size), config.values, config.suits,
+                                config.ace_value, config.royal_flush, config.dual_ace, config.replace_value,
+                                config.alt_ace_value, ranking, with_score=False)
+
+    # best subset of every player, then best players of every table
+    strengths = _strengths(columns['hand_rank'], columns['sorted_values']).reshape(-1, len(subsets))
+    best = np.arange(len(strengths)) * len(subsets) + strengths.argmax(axis=1)
+    strengths = strengths.max(axis=1).reshape(n_tables, n_players)
+    hand_rank = columns['hand_rank'][best].reshape(n_tables, n_players)
+    sorted_values = columns['sorted_values'][best].reshape(n_tables, n_players, config.size)
+    return strengths == strengths.max(axis=1, keepdims=True), hand_rank, sorted_values
@@ -0,0 +1,217 @@
+"""Best hand of a given size among a larger set of cards.
+
+Instead of evaluating every subset, hand types are tried from the strongest
+to the weakest, and the best hand of each type is built directly.
+"""
+
+from typing import Any, Optional
+from itertools import combinations
+from .hand_evaluator import evaluate_hand
+from .score_system import hand_score
+
+
+def is_straight_values(values: tuple[int, ...], main_ace_value: int,
+                       allow_dual_ace: bool = True, alt_ace_value: int = 1) -> bool:
+    """Check if distinct values, sorted in descending order, form a straight (or a wheel),
+    following the same rules as evaluate_hand.
+    """
+    if values[0] - values[-1] == len(values) - 1:
+        return True
+    return allow_dual_ace and values[0] == main_ace_value and \
+        values[1] - values[-1] == len(values) - 2 and values[-1] - alt_ace_value == 1
+
+
+def _straight_runs(size: int, main_ace_value: int, lowest_value: int,
+                   allow_dual_ace: bool, alt_ace_value: int) -> list[tuple[int, ...]]:
+    """Value sets of all straights, from the best one to the worst one.
+    """
+    runs = [tuple(range(top, top - size, -1)) for top in range(main_ace_value, lowest_value + size - 2, -1)]
+    if allow_dual_ace and size > 1:
+        runs.append((main_ace_value, ) + tuple(range(alt_ace_value + size - 1, alt_ace_value, -1)))
+    return runs
+
+
+def _mixed_suits(values: tuple[int, ...], by_value: dict[int, list]) -> Optional[list]:
+    """One card of each value, not all of them of the same suit.
+    """
+    hand = [by_value[v][0] for v in values]
+    suit = hand[0][1]
+    if all(card[1] == suit for card in hand):
+        for i, v in enumerate(values):
+            other = next((card for card in by_value[v] if card[1] != suit), None)
+            if other is not None:
+                hand[i] = other
+                return hand
+        return None
+    return hand
+
+
+def best_hand(cards: list[tuple[int, Any]],
+              size: int,
+              ranking: dict[tuple, int],
+              main_ace_value: int,
+              accept_royal_flush: bool = True,
+              allow_dual_ace: bool = True,
+              replace_value: bool = True,
+              alt_ace_value: int = 1,
+              with_score: bool = True) -> tuple[list[tuple[int, Any]], tuple[int, ...], bool, bool, bool, Optional[int]]:
+    """Strongest hand of size cards among the given cards.
+    Gives the same classification and score as the best evaluate_hand result
+    among all subsets of size cards.
+
+    Parameters
+    ----------
+    cards : list[tuple[int, Any]]
+        Cards as tuples. First element is the value, second the suit. At least size cards.
+    size : int
+        Hand size used.
+    ranking : dict[tuple, int]
+        Ranking from generate_ranking, for the same hand size and flags.
+    main_ace_value : int
+        Numerical value of the aces, the best valued cards in the deck.
+    accept_royal_flush : bool, default True
+        Recognize a royal flush as a proper category in the ranking or as
+        another straight flush.
+    allow_dual_ace : bool default True
+        Allow aces to be part of the lowest straight (wheel).
+    replace_value : bool default True
+        Change ace value in a wheel.
+    alt_ace_value : int default 1
+        Alternative ace value in wheels.
+    with_score : bool, default True
+        Compute the score of the best hand.
+
+    Returns
+    -------
+    sorted_hand : list[tuple[int, Any]]
+        Cards of the best hand, sorted as in evaluate_hand.
+    frequency_signature : tuple[int, ...]
+        Frequency of each value in the best hand. Sorted in descending order.
+    is_straight : bool
+        Best hand is a straight.
+    is_flush : bool
+        Best hand is a flush.
+    is_royal_flush : bool
+        Best hand is a royal flush.
+    score : int or None
+        hand_score of the best hand, None when with_score is False.
+    """
+    if len(cards) < size:
+        raise ValueError(f"{len(cards)} cards are not enough for a hand of size {size}")
+
+    by_value, by_suit = {}, {}
+    for card in sorted(cards, key=lambda c: c[0], reverse=True):
+        by_value.setdefault(card[0], []).append(card)
+        by_suit.setdefault(card[1], []).append(card)
+    flush_suits = [suit_cards for suit_cards in by_suit.values() if len(suit_cards) >= size]
+    return best_hand_from_groups(by_value, sorted(by_value, reverse=True), flush_suits, len(by_suit), size,
+                                 ranking, main_ace_value, accept_royal_flush, allow_dual_ace,
+                                 replace_value, alt_ace_value, with_score)
+
+
+def best_hand_from_groups(by_value: dict[int, list[tuple[int, Any]]],
+                          distinct_values: list[int],
+                          flush_suits: list[list[tuple[int, Any]]],
+                          n_suits: int,
+                          size: int,
+                          ranking: dict[tuple, int],
+                          main_ace_value: int,
+                          accept_royal_flush: bool = True,
+                          allow_dual_ace: bool = True,
+                          replace_value: bool = True,
+                          alt_ace_value: int = 1,
+                          with_score: bool = True) -> tuple[list[tuple[int, Any]], tuple[int, ...],
+                                                            bool, bool, bool, Optional[int]]:
+    """Same result as best_hand, from cards already grouped by value and by suit.
+
+    Parameters
+    ----------
+    by_value : dict[int, list[tuple[int, Any]]]
+        Cards of every value held.
+    distinct_values : list[int]
+        Values held, in descending order.
+    flush_suits : list[list[tuple[int, Any]]]
+        Cards of every suit with at least size cards, sorted by value in descending order.
+    n_suits : int
+        Number of suits held.
+    size, ranking, main_ace_value, accept_royal_flush, allow_dual_ace, replace_value, alt_ace_value, with_score
+        As in best_hand.
+    """
+    runs = _straight_runs(size, main_ace_value, distinct_values[-1], allow_dual_ace, alt_ace_value)
+    suit_values = [{card[0]: card for card in suit_cards} for suit_cards in flush_suits]
+
+    def repeated(frequencies):
+        hand, used = [], set()
+        for f in frequencies:
+            v = next((v for v in distinct_values if v not in used and len(by_value[v]) >= f), None)
+            if v is None:
+                return None
+            used.add(v)
+            hand.extend(by_value[v][:f])
+        return hand
+
+    def straight_flush(royal):
+        # the ace high straight flush is a royal flush only when royal flushes are accepted
+        for run in runs:
+            is_royal_run = run[0] == main_ace_value and run[-1] == main_ace_value - size + 1
+            if royal != (is_royal_run and accept_royal_flush):
+                continue
+            for cards_by_value in suit_values:
+                if all(v in cards_by_value for v in run):
+                    return [cards_by_value[v] for v in run]
+        return None
+
+    def straight():
+        if len(distinct_values) < size:
+            return None
+        for run in runs:
+            if all(v in by_value for v in run):
+                hand = _mixed_suits(run, by_value)
+                if hand is not None:
+                    return hand
+        return None
+
+    def flush():
+        best = None
+        for suit_cards in flush_suits:
+            for hand in combinations(suit_cards, size):
+                values = tuple(card[0] for card in hand)
+                if not is_straight_values(values, main_ace_value, allow_dual_ace, alt_ace_value):
+                    if best is None or values > tuple(card[0] for card in best):
+                        best = list(hand)
+                    break
+        return best
+
+    def high_card():
+        if size < 2 or n_suits < 2 or len(distinct_values) < size:
+            return None
+        for values in combinations(distinct_values, size):
+            if not is_straight_values(values, main_ace_value, allow_dual_ace, alt_ace_value):
+                hand = _mixed_suits(values, by_value)
+                if hand is not None:
+                    return hand
+        return None
+
+    for key in sorted(ranking, key=ranking.get, reverse=True):
+        frequencies, is_straight, is_flush, is_royal_flush = key
+        if frequencies[0] > 1:
+            hand = repeated(frequencies)
+        elif is_flush and not flush_suits:
+            hand = None
+        elif is_straight and is_flush:
+            hand = straight_flush(is_royal_flush)
+        elif is_straight:
+            hand = straight()
+        elif is_flush:
+            hand = flush()
+        else:
+            hand = high_card()
+        if hand is not None:
+            sorted_hand, frequencies, is_straight, is_flush, is_royal_flush = evaluate_hand(
+                hand, main_ace_value, accept_royal_flush, allow_dual_ace, replace_value, alt_ace_value)
+            score = None
+            if with_score:
+                hand_rank = ranking[(frequencies, is_straight, is_flush, is_royal_flush)]
+                score = hand_score([card[0] for card in sorted_hand], hand_rank, main_ace_value)
+            return sorted_hand, frequencies, is_straight, is_flush, is_royal_flush, score
+    raise ValueError("no hand of the ranking can be formed with the given cards")
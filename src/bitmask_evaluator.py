@@ -0,0 +1,196 @@
+"""Evaluator for n-card hands encoded as integers, using bit operations.
+
+Every card is a single integer: value * suits + suit, where suit is the
+position of the card suit in a sequence of suit labels.
+"""
+
+from typing import Any, Sequence
+
+
+def encode_card(value: int, suit: int, suits: int) -> int:
+    """Integer code of a card.
+
+    Parameters
+    ----------
+    value : int
+        Numerical value of the card.
+    suit : int
+        Suit index of the card, from 0 to suits - 1.
+    suits : int
+        Number of suits in the deck.
+
+    Returns
+    -------
+    int
+        Card code, value * suits + suit.
+    """
+    return value * suits + suit
+
+
+def decode_card(code: int, suits: int) -> tuple[int, int]:
+    """Value and suit index of an integer encoded card.
+    """
+    return divmod(code, suits)
+
+
+def encode_hand(cards: list[tuple[int, Any]], suit_labels: Sequence[Any]) -> list[int]:
+    """Integer codes of cards given as tuples.
+
+    Parameters
+    ----------
+    cards : list[tuple[int, Any]]
+        Cards as tuples. First element is the value, second the suit.
+    suit_labels : Sequence[Any]
+        Suits of the deck. The suit index of a card is the position of its suit here.
+
+    Returns
+    -------
+    list[int]
+        Card codes, in the same order as the cards.
+    """
+    suits = len(suit_labels)
+    index = {label: i for i, label in enumerate(suit_labels)}
+    return [card[0] * suits + index[card[1]] for card in cards]
+
+
+def decode_hand(codes: list[int], suit_labels: Sequence[Any]) -> list[tuple[int, Any]]:
+    """Cards as tuples from their integer codes. Inverse of encode_hand.
+    """
+    suits = len(suit_labels)
+    return [(code // suits, suit_labels[code % suits]) for code in codes]
+
+
+def popcount(mask: int) -> int:
+    """Number of bits set in a non negative integer.
+    """
+    return bin(mask).count("1")
+
+
+def mask_values(mask: int) -> list[int]:
+    """Values whose bits are set in a rank bitmask, in descending order.
+    """
+    values = []
+    while mask:
+        top = mask.bit_length() - 1
+        values.append(top)
+        mask ^= 1 << top
+    return values
+
+
+def hand_masks(codes: list[int], suits: int) -> tuple[int, int, list[int]]:
+    """Bitmasks describing an encoded hand.
+
+    Parameters
+    ----------
+    codes : list[int]
+        Card codes.
+    suits : int
+        Number of suits in the deck.
+
+    Returns
+    -------
+    rank_mask : int
+        Bit v is set when the hand contains a card of value v.
+    rank_counts : int
+        Number of cards of every value, packed in fields of suits.bit_length() bits.
+        The field of value v starts at bit v * suits.bit_length().
+    suit_masks : list[int]
+        Rank bitmask of the cards of every suit.
+    """
+    width = suits.bit_length()
+    rank_mask, rank_counts = 0, 0
+    suit_masks = suits * [0]
+    for code in codes:
+        value, suit = divmod(code, suits)
+        bit = 1 << value
+        rank_mask |= bit
+        rank_counts += 1 << (value * width)
+        suit_masks[suit] |= bit
+    return rank_mask, rank_counts, suit_masks
+
+
+def evaluate_encoded(codes: list[int],
+                     suits: int,
+                     main_ace_value: int,
+                     accept_royal_flush: bool = True,
+                     allow_dual_ace: bool = True,
+                     replace_value: bool = True,
+                     alt_ace_value: int = 1) -> tuple[list[int], tuple[int, ...], bool, bool, bool]:
+    """ Determines the type of a hand given its card codes.
+        Same classification as hand_evaluator.evaluate_hand, computed with
+        rank bitmasks instead of sorting cards and counting values.
+
+    Parameters
+    ----------
+    codes : list[int]
+        Card codes, value * suits + suit.
+    suits : int
+        Number of suits in the deck.
+    main_ace_value : int
+        Numerical value of the aces, the best valued cards in the deck.
+    accept_royal_flush : bool, default True
+        Recognize a royal flush as a proper category in the ranking or as
+        another straight flush.
+    allow_dual_ace : bool default True
+        Allow aces to be part of the lowest straight (wheel).
+    replace_value : bool default True
+        Change ace value in a wheel.
+    alt_ace_value : int default 1
+        Alternative ace value in wheels.
+
+    Returns
+    -------
+    sorted_values : list[int]
+        Card values sorted in descending order, by value frequency and then by value.
+    frequency_signature : tuple[int, ...]
+        Frequency of each value in the hand. Sorted in descending order.
+    is_straight : bool
+        Hand is a straight.
+    is_flush : bool
+        Hand is a flush.
+    is_royal_flush : bool
+        Hand is a royal flush.
+    """
+    size = len(codes)
+    width = suits.bit_length()
+    field = (1 << width) - 1
+    rank_mask, rank_counts, suit_masks = hand_masks(codes, suits)
+
+    is_flush, is_straight, is_royal_flush = False, False, False
+    sorted_values = mask_values(rank_mask)
+
+    # special hand
+    if len(sorted_values) == size:
+        frequency_signature = size * (1, )
+        high, low = sorted_values[0], sorted_values[-1]
+
+        is_flush = rank_mask in suit_masks
+        is_straight = high - low == size - 1
+
+        # wheel hand
+        if not is_straight and allow_dual_ace:
+            if high == main_ace_value and sorted_values[1] - low == size - 2:
+                is_straight = low - alt_ace_value == 1
+                if is_straight:
+                    sorted_values = sorted_values[1:] + [alt_ace_value if replace_value else high]
+
+        # royal flush
+        elif is_straight and high == main_ace_value:
+            is_royal_flush = is_flush and accept_royal_flush
+
+    # repeated value hand
+    else:
+        groups = (suits + 1) * [None]
+        for value in sorted_values:
+            count = (rank_counts >> (value * width)) & field
+            if groups[count] is None:
+                groups[count] = []
+            groups[count].append(value)
+        sorted_values, signature = [], []
+        for count in range(suits, 0, -1):
+            if groups[count] is not None:
+                for value in groups[count]:
+                    sorted_values.extend(count * [value])
+                signature.extend(len(groups[count]) * [count])
+        frequency_signature = tuple(signature)
+    return sorted_values, frequency_signature, is_straight, is_flush, is_royal_flush
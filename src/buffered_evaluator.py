@@ -0,0 +1,182 @@
+"""Evaluator object writing its results into reusable buffers.
+
+evaluate_hand builds several lists, a Counter, a set and tuples for every hand.
+HandEvaluator keeps preallocated buffers instead, and takes frequency signatures
+from a table of tuples built once. Evaluating a hand with evaluate_into does not
+create any container, so long running loops do not feed the garbage collector.
+"""
+
+from typing import Any, Optional, Sequence
+
+from .combinatorial_utils import iter_integer_partitions
+from .rank_generator import generate_ranking
+from .score_system import power_table
+
+
+class EvaluationResult:
+    """Reusable result of HandEvaluator.evaluate_into.
+
+    Parameters
+    ----------
+    size : int
+        Hand size.
+    values : Sequence[int], optional
+        Mutable buffer of length size for the card values, such as a row of a
+        preallocated array. A new list is used when missing.
+
+    Attributes
+    ----------
+    values : Sequence[int]
+        Card values sorted as in evaluate_hand, ready for hand_score.
+    frequency_signature : tuple[int, ...]
+        Frequency of each value in the hand. Sorted in descending order.
+    is_straight, is_flush, is_royal_flush : bool
+        Special hands, as in evaluate_hand.
+    hand_rank : int
+        Rank of the hand type.
+    score : int
+        hand_score of the hand.
+    """
+    __slots__ = ("values", "frequency_signature", "is_straight", "is_flush", "is_royal_flush",
+                 "hand_rank", "score")
+
+    def __init__(self, size: int, values: Optional[Sequence[int]] = None):
+        self.values = [0] * size if values is None else values
+        self.frequency_signature = ()
+        self.is_straight = self.is_flush = self.is_royal_flush = False
+        self.hand_rank = self.score = 0
+
+
+class HandEvaluator:
+    """Evaluator of hands of a fixed configuration, without per hand allocations.
+
+    Parameters
+    ----------
+    values : int
+        Number of cards per suit.
+    suits : int
+        Number of suits in the deck.
+    size : int
+        Hand size used.
+    main_ace_value : int, default values + 1
+        Numerical value of the aces, the best valued cards in the deck.
+    accept_royal_flush : bool, default True
+        Recognize a royal flush as a proper category in the ranking.
+    allow_dual_ace : bool, default True
+        Allow aces to be part of the lowest straight (wheel).
+    replace_value : bool, default True
+        Change ace value in a wheel.
+    alt_ace_value : int, default 1
+        Alternative ace value in wheels.
+    """
+    __slots__ = ("size", "main_ace_value", "accept_royal_flush", "allow_dual_ace", "replace_value",
+                 "alt_ace_value", "_sorted", "_signatures", "_ranks", "_powers", "_base", "_weights")
+
+    def __init__(self, values: int, suits: int, size: int,
+                 main_ace_value: Optional[int] = None,
+                 accept_royal_flush: bool = True,
+                 allow_dual_ace: bool = True,
+                 replace_value: bool = True,
+                 alt_ace_value: int = 1):
+        self.size = size
+        self.main_ace_value = values + 1 if main_ace_value is None else main_ace_value
+        self.accept_royal_flush = accept_royal_flush
+        self.allow_dual_ace = allow_dual_ace
+        self.replace_value = replace_value
+        self.alt_ace_value = alt_ace_value
+        self._sorted = [0] * size
+
+        # a signature is coded as the sum of weights[f] over its frequencies f
+        self._weights = [(size + 1) ** (f - 1) if f else 0 for f in range(size + 1)]
+        self._signatures = {sum(self._weights[f] for f in signature): signature
+                            for signature in iter_integer_partitions(size, max_part=suits, max_parts=values)}
+        ranking, _ = generate_ranking(values, suits, size, accept_royal_flush, allow_dual_ace)
+        self._ranks = {}
+        for (signature, is_straight, is_flush, is_royal_flush), rank in ranking.items():
+            code = sum(self._weights[f] for f in signature)
+            self._ranks[8 * code + 4 * is_straight + 2 * is_flush + is_royal_flush] = rank
+        self._base = self.main_ace_value + 1
+        self._powers = power_table(self.main_ace_value, size, max(ranking.values()))
+
+    def evaluate_into(self, cards: Sequence[tuple[int, Any]], out: EvaluationResult) -> EvaluationResult:
+        """Evaluates a hand of size cards, and writes the results into out.
+
+        Parameters
+        ----------
+        cards : Sequence[tuple[int, Any]]
+            Cards as tuples. First element is the value, second the suit.
+        out : EvaluationResult
+            Result object, overwritten.
+
+        Returns
+        -------
+        EvaluationResult
+            out itself.
+        """
+        size, ordered, values = self.size, self._sorted, out.values
+
+        # insertion sort of the values in descending order, and flush check
+        suit = cards[0][1]
+        is_flush = True
+        for i in range(size):
+            card = cards[i]
+            if card[1] != suit:
+                is_flush = False
+            value = card[0]
+            j = i
+            while j and ordered[j - 1] < value:
+                ordered[j] = ordered[j - 1]
+                j -= 1
+            ordered[j] = value
+
+        # frequencies are the lengths of the runs of equal values
+        weights = self._weights
+        code, top, run = 0, 1, 1
+        for i in range(1, size + 1):
+            if i < size and ordered[i] == ordered[i - 1]:
+                run += 1
+            else:
+                code += weights[run]
+                if run > top:
+                    top = run
+                run = 1
+
+        is_straight = is_royal_flush = False
+        if top == 1:
+            for i in range(size):
+                values[i] = ordered[i]
+            is_straight = ordered[0] - ordered[size - 1] == size - 1
+            ace = self.main_ace_value
+            if not is_straight and self.allow_dual_ace:
+                if ordered[0] == ace and ordered[1] - ordered[size - 1] == size - 2 and \
+                        ordered[size - 1] - self.alt_ace_value == 1:
+                    is_straight = True
+                    for i in range(size - 1):
+                        values[i] = ordered[i + 1]
+                    values[size - 1] = self.alt_ace_value if self.replace_value else ace
+            elif is_straight and ordered[0] == ace:
+                is_royal_flush = is_flush and self.accept_royal_flush
+        else:
+            is_flush = False
+            # runs written from the most to the least frequent, higher values first
+            position = 0
+            for frequency in range(top, 0, -1):
+                start = 0
+                for i in range(1, size + 1):
+                    if i == size or ordered[i] != ordered[start]:
+                        if i - start == frequency:
+                            for k in range(start, i):
+                                values[position] = ordered[k]
+                                position += 1
+                        start = i
+
+        hand_rank = self._ranks[8 * code + 4 * is_straight + 2 * is_flush + is_royal_flush]
+        # built from Python ints, a NumPy buffer would overflow silently in int64
+        kicker, base = 0, self._base
+        for i in range(size):
+            kicker = kicker * base + int(values[i])
+        out.frequency_signature = self._signatures[code]
+        out.is_straight, out.is_flush, out.is_royal_flush = is_straight, is_flush, is_royal_flush
+        out.hand_rank = hand_rank
+        out.score = kicker * self._powers[hand_rank]
+        return out
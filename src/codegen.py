@@ -0,0 +1,206 @@
+"""Evaluators generated as Python source for a single configuration.
+
+evaluate_hand checks the configuration flags on every call, and its callers look
+the hand type up in the ranking and compute hand_score afterwards. make_evaluator
+writes a function for one configuration instead, with the flags resolved at
+generation time and the hand size unrolled. Once the card values are sorted, the
+hand type and the order of the values only depend on which neighbouring values
+are equal, so the function is a tree of comparisons whose leaves return the score
+directly, with the ranks and the powers of the base folded into constants.
+
+The tree has up to 2 ** (size - 1) leaves, fewer when suits is small. Sources are
+kept in memory and, when a cache directory is set, in files versioned by the
+generator and by the ranking (rank_generator.CACHE_VERSION), whose ranks are
+folded into the sources. Cached files whose header does not match the
+configuration or the versions are regenerated, and the cache is skipped when it
+cannot be written.
+
+Cached files are executed when loaded, so the cache directory must be trusted:
+only the current user should be able to write to it.
+"""
+
+import os
+from typing import Any, Callable, Optional, Sequence
+
+from .file_utils import atomic_write
+from .rank_generator import CACHE_VERSION, generate_ranking
+
+GENERATOR_VERSION = 1
+MAX_SIZE = 12
+
+_evaluators = {}
+_cache_dir = os.environ.get("POKER_EVALUATOR_CACHE_DIR")
+
+
+def set_cache_dir(path: Optional[str]) -> None:
+    """Directory for the on-disk cache of generated sources. None disables it.
+    Defaults to the POKER_EVALUATOR_CACHE_DIR environment variable.
+    """
+    global _cache_dir
+    _cache_dir = path
+
+
+def _header(values: int, suits: int, size: int, main_ace_value: int, accept_royal_flush: bool,
+            allow_dual_ace: bool, replace_value: bool, alt_ace_value: int) -> list[str]:
+    """First lines of a generated source, naming its configuration, generator version and ranking version.
+    """
+    return [
+        f"# values={values} suits={suits} size={size} main_ace_value={main_ace_value} "
+        f"accept_royal_flush={accept_royal_flush}",
+        f"# allow_dual_ace={allow_dual_ace} replace_value={replace_value} alt_ace_value={alt_ace_value}",
+        f"# generator version {GENERATOR_VERSION} ranking version {CACHE_VERSION}",
+    ]
+
+
+def evaluator_source(values: int, suits: int, size: int,
+                     main_ace_value: Optional[int] = None,
+                     accept_royal_flush: bool = True,
+                     allow_dual_ace: bool = True,
+                     replace_value: bool = True,
+                     alt_ace_value: int = 1) -> str:
+    """Source of a function score_hand(cards) for one configuration.
+    score_hand gives the same result as evaluate_hand, generate_ranking and hand_score.
+    Parameters are those of make_evaluator.
+    """
+    if not 1 <= size <= MAX_SIZE:
+        raise ValueError(f"hand size must be between 1 and {MAX_SIZE}")
+    ace = values + 1 if main_ace_value is None else main_ace_value
+    base = ace + 1
+    ranking, _ = generate_ranking(values, suits, size, accept_royal_flush, allow_dual_ace)
+    names = [f"a{i}" for i in range(size)]
+    high_card = size * (1, )
+    lines = _header(values, suits, size, ace, accept_royal_flush, allow_dual_ace, replace_value, alt_ace_value) + [
+        "def score_hand(cards):",
+        f"    {', '.join(f'(v{i}, s{i})' for i in range(size))}, = cards",
+        f"    {', '.join(names)}, = sorted(({', '.join(f'v{i}' for i in range(size))}, ), reverse=True)",
+    ]
+
+    def score(terms, key, indent):
+        rank = ranking.get(key)
+        if rank is None:
+            lines.append(f'{indent}raise ValueError("hand cannot be dealt from the deck")')
+        else:
+            power = base ** rank
+            lines.append(indent + "return " + " + ".join(
+                f"{term} * {base ** (size - 1 - i) * power}" for i, term in enumerate(terms)))
+
+    def distinct_values(indent):
+        last = names[-1]
+        lines.append(f"{indent}flush = {' == '.join(f's{i}' for i in range(size)) if size > 1 else True}")
+        lines.append(f"{indent}if a0 - {last} == {size - 1}:")
+        lines.append(f"{indent}    if flush:")
+        if accept_royal_flush:
+            lines.append(f"{indent}        if a0 == {ace}:")
+            score(names, (high_card, True, True, True), indent + "            ")
+        score(names, (high_card, True, True, False), indent + "        ")
+        score(names, (high_card, True, False, False), indent + "    ")
+        if allow_dual_ace and size > 1:
+            wheel = names[1:] + [str(alt_ace_value if replace_value else ace)]
+            lines.append(f"{indent}if a0 == {ace} and a1 - {last} == {size - 2} and {last} == {alt_ace_value + 1}:")
+            lines.append(f"{indent}    if flush:")
+            score(wheel, (high_card, True, True, False), indent + "        ")
+            score(wheel, (high_card, True, False, False), indent + "    ")
+        lines.append(f"{indent}if flush:")
+        score(names, (high_card, False, True, False), indent + "    ")
+        score(names, (high_card, False, False, False), indent + "")
+
+    def repeated_values(runs, indent):
+        # stable sort by frequency, as evaluate_hand: higher values first among equal frequencies
+        ordered = sorted(runs, key=len, reverse=True)
+        signature = tuple(len(run) for run in ordered)
+        score([name for run in ordered for name in run], (signature, False, False, False), indent)
+
+    def branch(runs, indent):
+        i = sum(len(run) for run in runs)
+        if i == size:
+            if all(len(run) == 1 for run in runs):
+                distinct_values(indent)
+            else:
+                repeated_values(runs, indent)
+            return
+        # equal to the previous value, extending its run, when there are suits left
+        if len(runs[-1]) < suits:
+            lines.append(f"{indent}if a{i - 1} == a{i}:")
+            branch(runs[:-1] + [runs[-1] + [names[i]]], indent + "    ")
+            lines.append(f"{indent}else:")
+            branch(runs + [[names[i]]], indent + "    ")
+        else:
+            branch(runs + [[names[i]]], indent)
+
+    branch([[names[0]]], "    ")
+    return "\n".join(lines) + "\n"
+
+
+def _cache_path(key: tuple) -> str:
+    name = "-".join(str(int(field)) for field in key)
+    return os.path.join(_cache_dir, f"evaluator-v{GENERATOR_VERSION}-r{CACHE_VERSION}-{name}.py")
+
+
+def _store(path: str, source: str) -> None:
+    """Writes a source to the cache directory. Failures leave the source uncached.
+    """
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        atomic_write(path, source)
+    except OSError:
+        pass
+
+
+def make_evaluator(values: int, suits: int, size: int,
+                   main_ace_value: Optional[int] = None,
+                   accept_royal_flush: bool = True,
+                   allow_dual_ace: bool = True,
+                   replace_value: bool = True,
+                   alt_ace_value: int = 1) -> Callable[[Sequence[tuple[int, Any]]], int]:
+    """Function scoring hands of one configuration, generated and compiled on the first call.
+
+    Parameters
+    ----------
+    values : int
+        Number of cards per suit.
+    suits : int
+        Number of suits in the deck.
+    size : int
+        Hand size used, at most MAX_SIZE.
+    main_ace_value : int, default values + 1
+        Numerical value of the aces, the best valued cards in the deck.
+    accept_royal_flush : bool, default True
+        Recognize a royal flush as a proper category in the ranking.
+    allow_dual_ace : bool, default True
+        Allow aces to be part of the lowest straight (wheel).
+    replace_value : bool, default True
+        Change ace value in a wheel.
+    alt_ace_value : int, default 1
+        Alternative ace value in wheels.
+
+    Returns
+    -------
+    Callable[[Sequence[tuple[int, Any]]], int]
+        Function taking size cards as (value, suit) tuples and returning their hand_score.
+    """
+    ace = values + 1 if main_ace_value is None else main_ace_value
+    key = (values, suits, size, ace, accept_royal_flush, allow_dual_ace, replace_value, alt_ace_value)
+    if key in _evaluators:
+        return _evaluators[key]
+
+    path = _cache_path(key) if _cache_dir is not None else "<generated evaluator>"
+    source = None
+    if _cache_dir is not None:
+        try:
+            with open(path) as file:
+                source = file.read()
+        except (OSError, UnicodeDecodeError):
+            pass
+        # a file written for another configuration or by another generator is regenerated
+        if source is not None and source.split("\n", 3)[:3] != _header(*key):
+            source = None
+    if source is None:
+        source = evaluator_source(values, suits, size, ace, accept_royal_flush, allow_dual_ace,
+                                  replace_value, alt_ace_value)
+        if _cache_dir is not None:
+            _store(path, source)
+
+    namespace = {}
+    exec(compile(source, path, "exec"), namespace)
+    _evaluators[key] = namespace["score_hand"]
+    return _evaluators[key]
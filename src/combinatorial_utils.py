@@ -1,7 +1,61 @@
 """Utilities for hand evaluation, using combinatorics.
 """
 
-from math import factorial
+from functools import lru_cache
+from itertools import combinations
+from math import exp, factorial as _math_factorial, lgamma, perm
+from typing import Iterator, Optional
+
+FACTORIAL_TABLE_SIZE = 1024
+FALLING_FACTORIAL_CACHE_SIZE = 4096
+
+# growable table of the factorials of 0, 1, 2, ..., up to FACTORIAL_TABLE_SIZE - 1
+# it is replaced by a longer list, never modified in place, so threads can share it
+_factorials = [1]
+
+
+def factorial(n: int) -> int:
+    """n!, read from a table which grows incrementally as larger factorials are requested.
+    Factorials past FACTORIAL_TABLE_SIZE are computed without being stored.
+    Raises ValueError for negative n.
+    """
+    global _factorials
+    if n < 0:
+        raise ValueError("factorial is not defined for negative numbers")
+    if n >= FACTORIAL_TABLE_SIZE:
+        return _math_factorial(n)
+    table = _factorials
+    if n >= len(table):
+        table = table[:]
+        for i in range(len(table), n + 1):
+            table.append(table[-1] * i)
+        _factorials = table
+    return table[n]
+
+
+def falling_factorial(n: int, k: int) -> int:
+    """n (n - 1) ... (n - k + 1), the number of ordered selections of k elements out of n.
+    The last FALLING_FACTORIAL_CACHE_SIZE products computed are kept.
+    Raises ValueError for negative n or k.
+    """
+    if n < 0 or k < 0:
+        raise ValueError("falling factorial is not defined for negative numbers")
+    if k > n:
+        return 0
+    return _falling_factorial(n, k)
+
+
+@lru_cache(maxsize=FALLING_FACTORIAL_CACHE_SIZE)
+def _falling_factorial(n: int, k: int) -> int:
+    return perm(n, k)
+
+
+def clear_tables() -> None:
+    """Empties the factorial table and the falling factorial cache.
+    """
+    global _factorials
+    _factorials = [1]
+    _falling_factorial.cache_clear()
 
 
 def n_choose_k(n: int, k: int) -> int:
@@ -10,11 +64,86 @@ def n_choose_k(n: int, k: int) -> int:
     if k <= 0 or k >= n:
         return 1
     else:
-        r = 1
         d = min(k, n-k)
-        for i in range(d):
-            r *= n - i
-        return r // factorial(d)
+        return falling_factorial(n, d) // factorial(d)
+
+
+def log_factorial(n: float) -> float:
+    """Natural logarithm of n!, in floating point.
+    """
+    return lgamma(n + 1)
+
+
+def log_falling_factorial(n: float, k: float) -> float:
+    """Natural logarithm of n (n - 1) ... (n - k + 1), in floating point. Requires k <= n.
+    """
+    return lgamma(n + 1) - lgamma(n - k + 1)
+
+
+def log_n_choose_k(n: float, k: float) -> float:
+    """Natural logarithm of C(n, k), in floating point. Requires 0 <= k <= n.
+    """
+    return lgamma(n + 1) - lgamma(k + 1) - lgamma(n - k + 1)
+
+
+def approximate_n_choose_k(n: float, k: float) -> float:
+    """C(n, k) as a float, computed in log space without big integers. Requires 0 <= k <= n.
+    """
+    return exp(log_n_choose_k(n, k))
+
+
+def nth_k_subset(n: int, k: int, index: int) -> tuple[int, ...]:
+    """Subset of size k from {0, 1, ..., n-1} at a position of the lexicographic order.
+
+    Parameters
+    ----------
+    n : int
+        Size of the original set.
+    k : int
+        Size of the subset.
+    index : int
+        Position of the subset, from 0 to C(n, k) - 1.
+
+    Returns
+    -------
+    tuple[int, ...]
+        Sorted subset.
+    """
+    subset, x = [], 0
+    for i in range(k, 0, -1):
+        # subsets whose next element is x
+        count = n_choose_k(n - x - 1, i - 1) if n - x - 1 >= i - 1 else 0
+        while index >= count:
+            index -= count
+            x += 1
+            count = n_choose_k(n - x - 1, i - 1) if n - x - 1 >= i - 1 else 0
+        subset.append(x)
+        x += 1
+    return tuple(subset)
+
+
+def iter_k_subsets(n: int, k: int, start: int = 0) -> Iterator[tuple[int, ...]]:
+    """Subsets of size k from the set {0, 1, ..., n-1}, generated lazily.
+    Subsets are sorted tuples, produced in lexicographic order using O(k) extra memory.
+    Generation begins at position start, so the order can be split in shards.
+    """
+    if start == 0:
+        yield from combinations(range(n), k)
+        return
+    if start >= n_choose_k(n, k) or k > n:
+        return
+    subset = list(nth_k_subset(n, k, start))
+    while True:
+        yield tuple(subset)
+        # rightmost element that can still grow
+        i = k - 1
+        while i >= 0 and subset[i] == n - k + i:
+            i -= 1
+        if i < 0:
+            return
+        subset[i] += 1
+        for j in range(i + 1, k):
+            subset[j] = subset[j - 1] + 1
 
 
 def k_subsets(n: int, k: int) -> set[frozenset]:
@@ -38,18 +167,106 @@ def k_subsets(n: int, k: int) -> set[frozenset]:
     if k >= n:
         return {frozenset(range(n))}
     else:
-        sets_with_n = [subset.union([n-1]) for subset in k_subsets(n-1, k-1)]
-        return k_subsets(n-1, k).union(sets_with_n)
+        return {frozenset(subset) for subset in iter_k_subsets(n, k)}
+
+
+def _ascending_compositions(n: int) -> Iterator[list[int]]:
+    """Partitions of n as non decreasing lists (accelerated ascending composition algorithm).
+    """
+    a = (n + 1) * [0]
+    k, y = 1, n - 1
+    while k != 0:
+        x = a[k - 1] + 1
+        k -= 1
+        while 2 * x <= y:
+            a[k] = x
+            y -= x
+            k += 1
+        m = k + 1
+        while x <= y:
+            a[k], a[m] = x, y
+            yield a[:k + 2]
+            x += 1
+            y -= 1
+        a[k] = x + y
+        y = x + y - 1
+        yield a[:k + 1]
+
+
+def _bounded_partitions(n: int, max_part: int) -> Iterator[list[int]]:
+    """Partitions of n with parts not greater than max_part, as non increasing lists,
+    in reverse lexicographic order.
+    """
+    max_part = min(max_part, n)
+    q, r = divmod(n, max_part)
+    a = q * [max_part] + ([r] if r else [])
+    while True:
+        yield a
+        # rightmost part greater than 1
+        i = len(a) - 1
+        while i >= 0 and a[i] == 1:
+            i -= 1
+        if i < 0:
+            return
+        v = a[i] - 1
+        remainder = len(a) - i
+        q, r = divmod(remainder, v)
+        a = a[:i] + (q + 1) * [v] + ([r] if r else [])
+
+
+def iter_integer_partitions(n: int, max_part: Optional[int] = None,
+                            max_parts: Optional[int] = None) -> Iterator[tuple[int, ...]]:
+    """Ways of writing n as a sum of positive integers, generated lazily.
+    Every partition is a tuple sorted in descending order.
+
+    Parameters
+    ----------
+    n : int
+        Sum of integers in any partition.
+    max_part : int, optional
+        Largest integer allowed in a partition.
+    max_parts : int, optional
+        Largest number of integers allowed in a partition.
+
+    Returns
+    -------
+    Iterator[tuple[int, ...]]
+        Partitions satisfying the bounds, each one produced once.
+    """
+    if n <= 0:
+        return
+    if max_part is None:
+        for partition in _ascending_compositions(n):
+            if max_parts is None or len(partition) <= max_parts:
+                yield tuple(reversed(partition))
+    elif max_part > 0:
+        for partition in _bounded_partitions(n, max_part):
+            if max_parts is None or len(partition) <= max_parts:
+                yield tuple(partition)
+
+
+def iter_k_integer_partitions(n: int, k: int) -> Iterator[tuple[int, ...]]:
+    """Ways of writing n as a sum of exactly k positive integers, generated lazily.
+    Every partition is a tuple sorted in descending order.
+
+    Partitions of n with k parts are obtained adding 1 to every part of
+    the partitions of n - k with at most k parts, which are in turn the
+    conjugates of the partitions of n - k with parts not greater than k.
+    """
+    if k <= 0 or k > n:
+        return
+    if k == n:
+        yield n * (1, )
+        return
+    for partition in _bounded_partitions(n - k, k):
+        conjugate = [sum(1 for part in partition if part > i) for i in range(partition[0])]
+        yield tuple(part + 1 for part in conjugate) + (k - len(conjugate)) * (1, )
 
 
 def k_integer_partitions(n: int, k: int) -> set[tuple]:
     """Ways of writing n as a sum of k positive integers.
     Order doesn't matter, although every partition is sorted in descending order.
 
-    Based on the combinations with replacement problem:
-    Given n and k, n-k 1's are separated into k groups to solve
-    x1, ..., xk = n - k where x1, ..., xk are non negative integers.
-
     Parameters
     ----------
     n : int
@@ -67,12 +284,7 @@ def k_integer_partitions(n: int, k: int) -> set[tuple]:
     if k <= 1:
         return {(n, )}
     else:
-        partitions = set()
-        for subset in k_subsets(n-1, k-1):
-            separators = [-1] + sorted(subset) + [n-k+len(subset)]
-            solution = [separators[i+1] - separators[i] for i in range(len(separators) - 1)]
-            partitions.add(tuple(sorted(solution, reverse=True)))
-    return partitions
+        return set(iter_k_integer_partitions(n, k))
 
 
 def integer_partitions(n: int) -> set[tuple]:
@@ -89,7 +301,4 @@ def integer_partitions(n: int) -> set[tuple]:
     partitions : set[tuple]
         Partitions from size 1 to size n.
     """
-    partitions = set()
-    for k in range(1, n + 1):
-        partitions.update(k_integer_partitions(n, k))
-    return partitions
+    return set(iter_integer_partitions(n))
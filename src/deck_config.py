@@ -0,0 +1,69 @@
+"""Deck and hand configuration shared by the game level tools.
+"""
+
+from typing import Any, NamedTuple, Optional
+from .rank_generator import generate_ranking
+
+
+class DeckConfig(NamedTuple):
+    """Parameters of a card game variant.
+
+    Parameters
+    ----------
+    values : int, default 13
+        Number of cards per suit.
+    suits : int, default 4
+        Number of suits in the deck.
+    size : int, default 5
+        Hand size used.
+    royal_flush : bool, default True
+        Treats royal flush separately from straight flush.
+    dual_ace : bool, default True
+        Allow aces to form wheel straights.
+    main_ace_value : int, optional
+        Numerical value of the aces. Defaults to values + 1, so card values
+        go from 2 to values + 1.
+    alt_ace_value : int, default 1
+        Alternative ace value in wheels.
+    replace_value : bool, default True
+        Change ace value in a wheel.
+    suit_labels : tuple, optional
+        Suits used in (value, suit) card tuples. Defaults to 0, ..., suits - 1.
+    """
+    values: int = 13
+    suits: int = 4
+    size: int = 5
+    royal_flush: bool = True
+    dual_ace: bool = True
+    main_ace_value: Optional[int] = None
+    alt_ace_value: int = 1
+    replace_value: bool = True
+    suit_labels: Optional[tuple] = None
+
+    @property
+    def ace_value(self) -> int:
+        """Numerical value of the aces.
+        """
+        return self.values + 1 if self.main_ace_value is None else self.main_ace_value
+
+    @property
+    def lowest_value(self) -> int:
+        """Numerical value of the lowest cards.
+        """
+        return self.ace_value - self.values + 1
+
+    @property
+    def labels(self) -> tuple:
+        """Suit labels of the deck.
+        """
+        return tuple(range(self.suits)) if self.suit_labels is None else tuple(self.suit_labels)
+
+    def deck(self) -> list[tuple[int, Any]]:
+        """All the cards of the deck as (value, suit) tuples, sorted by value and then by suit.
+        """
+        return [(value, suit) for value in range(self.lowest_value, self.ace_value + 1) for suit in self.labels]
+
+    def ranking(self) -> tuple[dict[tuple, int], dict[tuple, int]]:
+        """Ranking and counts of hand types from generate_ranking.
+        """
+        return generate_ranking(self.values, self.suits, self.size, self.royal_flush, self.dual_ace)
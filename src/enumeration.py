@@ -0,0 +1,209 @@
+"""Streaming enumeration of every hand of a deck, with exact category and score counts.
+Requires numpy.
+
+Hands are numbered with the combinatorial number system: the hand with deck
+positions c_1 < ... < c_k has index C(c_1, 1) + ... + C(c_k, k). Any range of
+indices can be unranked directly, so the enumeration can be split in shards,
+stopped and resumed from any index, without ever listing the hands.
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+from .batch_evaluator import evaluate_batch
+from .combinatorial_utils import n_choose_k
+from .deck_config import DeckConfig
+from .file_utils import atomic_write
+
+
+def binomial_columns(n: int, k: int) -> np.ndarray:
+    """Binomial coefficients C(c, i) for c < n and i <= k, as table[i, c], in int64.
+    """
+    if n_choose_k(n, k) >= 2 ** 63:
+        raise ValueError(f"C({n}, {k}) does not fit in 64 bits")
+    return np.array([[n_choose_k(c, i) if i <= c else 0 for c in range(n)] for i in range(k + 1)],
+                    dtype=np.int64)
+
+
+def combinations_at(indices: np.ndarray, n: int, k: int) -> np.ndarray:
+    """k-subsets of range(n) at the given positions of the combinatorial number system.
+
+    Parameters
+    ----------
+    indices : np.ndarray
+        Positions, from 0 to C(n, k) - 1.
+    n : int
+        Number of elements.
+    k : int
+        Subset size.
+
+    Returns
+    -------
+    np.ndarray
+        Subsets with shape (len(indices), k), every row sorted in ascending order.
+    """
+    table = binomial_columns(n, k)
+    remainder = np.array(indices, dtype=np.int64)
+    subsets = np.empty((len(remainder), k), dtype=np.int64)
+    for i in range(k, 0, -1):
+        # largest c with C(c, i) <= remainder; columns are non decreasing in c
+        c = np.searchsorted(table[i], remainder, side="right") - 1
+        subsets[:, i - 1] = c
+        remainder -= table[i, c]
+    return subsets
+
+
+def shard_bounds(total: int, shards: int) -> list[tuple[int, int]]:
+    """Splits range(total) in shards consecutive (start, stop) ranges of almost equal length.
+    """
+    return [(total * s // shards, total * (s + 1) // shards) for s in range(shards)]
+
+
+def new_state(start: int = 0, stop: Optional[int] = None) -> dict:
+    """Empty enumeration state covering hand indices from start to stop.
+    """
+    return {"next": start, "stop": stop, "ranks": {}, "scores": {}}
+
+
+def enumerate_hands(config: DeckConfig = DeckConfig(),
+                    start: int = 0,
+                    stop: Optional[int] = None,
+                    chunk_size: int = 1 << 16,
+                    state: Optional[dict] = None,
+                    checkpoint: Optional[str] = None,
+                    ranking: Optional[dict[tuple, int]] = None) -> dict:
+    """Counts hand ranks and scores of the hands with indices from start to stop.
+
+    Parameters
+    ----------
+    config : DeckConfig, default DeckConfig()
+        Game configuration. Deck positions follow config.deck().
+    start : int, default 0
+        First hand index.
+    stop : int, optional
+        Index after the last hand. Defaults to C(deck size, config.size).
+    chunk_size : int, default 65536
+        Number of hands evaluated at once.
+    state : dict, optional
+        State returned by an interrupted call, or loaded with load_state.
+        The enumeration resumes from it, and start and stop are ignored.
+    checkpoint : str, optional
+        File where the state is saved after every chunk.
+    ranking : dict[tuple, int], optional
+        Ranking for the configuration. Computed when missing.
+
+    Returns
+    -------
+    dict
+        State with keys next (index after the last counted hand, equal to stop when
+        done), stop, ranks (number of hands of every hand rank) and scores (number of
+        hands with every score).
+    """
+    n = config.values * config.suits
+    total = n_choose_k(n, config.size)
+    if state is None:
+        state = new_state(start, total if stop is None else stop)
+    if state["stop"] is None:
+        state["stop"] = total
+    if not 0 <= state["next"] <= state["stop"] <= total:
+        raise ValueError(f"hand indices must be between 0 and {total}")
+    if ranking is None:
+        ranking, _ = config.ranking()
+    ranks, scores = state["ranks"], state["scores"]
+    offset = config.lowest_value * config.suits
+
+    while state["next"] < state["stop"]:
+        first = state["next"]
+        last = min(first + chunk_size, state["stop"])
+        hands = combinations_at(np.arange(first, last, dtype=np.int64), n, config.size) + offset
+        result = evaluate_batch(hands, config.values, config.suits, config.ace_value, config.royal_flush,
+                                config.dual_ace, config.replace_value, config.alt_ace_value, ranking)
+        for values, counts in ((result['hand_rank'], ranks), (result['score'], scores)):
+            unique, frequency = np.unique(values, return_counts=True)
+            for value, count in zip(unique.tolist(), frequency.tolist()):
+                counts[value] = counts.get(value, 0) + count
+        state["next"] = last
+        if checkpoint is not None:
+            save_state(checkpoint, state)
+    return state
+
+
+def merge_states(states: list[dict]) -> dict:
+    """Adds up the counts of several finished states, such as the shards of one enumeration.
+    """
+    end = max(state["stop"] for state in states)
+    merged = new_state(end, end)
+    for state in states:
+        for key in ("ranks", "scores"):
+            for value, count in state[key].items():
+                merged[key][value] = merged[key].get(value, 0) + count
+    return merged
+
+
+def save_state(path: str, state: dict) -> None:
+    """Writes a state as JSON, atomically.
+    """
+    data = {"next": state["next"], "stop": state["stop"],
+            "ranks": {str(key): value for key, value in state["ranks"].items()},
+            "scores": {str(key): value for key, value in state["scores"].items()}}
+    atomic_write(path, json.dumps(data))
+
+
+def load_state(path: str) -> dict:
+    """Reads a state written by save_state.
+    """
+    with open(path) as file:
+        data = json.load(file)
+    number = float if any("." in key or "e" in key for key in data["scores"]) else int
+    return {"next": data["next"], "stop": data["stop"],
+            "ranks": {int(key): value for key, value in data["ranks"].items()},
+            "scores": {number(key): value for key, value in data["scores"].items()}}
+
+
+def _shard(task: tuple) -> dict:
+    config, start, stop, chunk_size, ranking = task
+    return enumerate_hands(config, start, stop, chunk_size, ranking=ranking)
+
+
+def validate_ranking(config: DeckConfig = DeckConfig(),
+                     workers: Optional[int] = None,
+                     chunk_size: int = 1 << 16) -> tuple[bool, dict[int, tuple[int, int]]]:
+    """Compares the hand counts of generate_ranking with a full enumeration of the deck.
+
+    Parameters
+    ----------
+    config : DeckConfig, default DeckConfig()
+        Game configuration.
+    workers : int, optional
+        Number of worker processes, one shard each. Defaults to the number of CPUs.
+    chunk_size : int, default 65536
+        Number of hands evaluated at once.
+
+    Returns
+    -------
+    valid : bool
+        Every count matches.
+    mismatches : dict[int, tuple[int, int]]
+        Enumerated and computed numbers of hands of the hand ranks which do not match.
+    """
+    ranking, counts = config.ranking()
+    total = n_choose_k(config.values * config.suits, config.size)
+    workers = workers or os.cpu_count() or 1
+    tasks = [(config, start, stop, chunk_size, ranking) for start, stop in shard_bounds(total, workers)]
+    if workers == 1:
+        states = list(map(_shard, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            states = list(pool.map(_shard, tasks))
+    enumerated = merge_states(states)["ranks"]
+
+    # enumeration counts hands by rank, so counts of the hand types are summed per rank
+    expected = {}
+    for key, rank in ranking.items():
+        expected[rank] = expected.get(rank, 0) + counts[key]
+    mismatches = {rank: (enumerated.get(rank, 0), count) for rank, count in expected.items()
+                  if enumerated.get(rank, 0) != count}
+    return not mismatches, mismatches
@@ -0,0 +1,158 @@
+"""Exact win and tie equity of several players, enumerating every possible board.
+Requires numpy.
+
+Boards are enumerated in lexicographic order of the remaining cards and split
+in chunks of consecutive boards, which are evaluated in parallel processes.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from itertools import islice
+from typing import Any, Optional
+
+import numpy as np
+from .batch_evaluator import best_scores_batch
+from .bitmask_evaluator import encode_hand
+from .combinatorial_utils import iter_k_subsets, n_choose_k
+from .deck_config import DeckConfig
+
+
+def split_counts(scores: np.ndarray) -> np.ndarray:
+    """Number of boards won by every player, by number of winners.
+
+    Parameters
+    ----------
+    scores : np.ndarray
+        Best score of every player on every board, with shape (boards, players).
+
+    Returns
+    -------
+    np.ndarray
+        Array with shape (players, players + 1). Entry [i, k] counts the boards where
+        player i is one of exactly k winners, so column 1 counts outright wins.
+    """
+    n_players = scores.shape[1]
+    winners = scores == scores.max(axis=1, keepdims=True)
+    n_winners = winners.sum(axis=1)
+    counts = np.zeros((n_players, n_players + 1), dtype=np.int64)
+    for k in range(1, n_players + 1):
+        counts[:, k] = winners[n_winners == k].sum(axis=0)
+    return counts
+
+
+def board_scores(players: list[list[int]], boards: np.ndarray, config: DeckConfig,
+                 ranking: dict[tuple, int]) -> np.ndarray:
+    """Best score of every player on every board.
+
+    Parameters
+    ----------
+    players : list[list[int]]
+        Card codes of the hole cards of every player.
+    boards : np.ndarray
+        Card codes of the boards, with shape (boards, board size).
+    config : DeckConfig
+        Game configuration.
+    ranking : dict[tuple, int]
+        Ranking from generate_ranking for the configuration.
+
+    Returns
+    -------
+    np.ndarray
+        Scores with shape (boards, players).
+    """
+    scores = []
+    for hole in players:
+        hole_cards = np.broadcast_to(np.array(hole, dtype=np.int64), (len(boards), len(hole)))
+        scores.append(best_scores_batch(np.hstack([hole_cards, boards]), config.size, config.values, config.suits,
+                                        config.ace_value, config.royal_flush, config.dual_ace,
+                                        config.replace_value, config.alt_ace_value, ranking))
+    return np.column_stack(scores)
+
+
+def _equity_chunk(task: tuple) -> np.ndarray:
+    """split_counts of a chunk of consecutive boards.
+    """
+    players, board, remaining, missing, start, count, config, ranking = task
+    completions = list(islice(iter_k_subsets(len(remaining), missing, start), count))
+    completions = np.array(remaining, dtype=np.int64)[np.array(completions, dtype=np.intp).reshape(-1, missing)]
+    boards = np.hstack([np.broadcast_to(np.array(board, dtype=np.int64), (len(completions), len(board))),
+                        completions])
+    return split_counts(board_scores(players, boards, config, ranking))
+
+
+def equity(players: list[list[tuple[int, Any]]],
+           board: list[tuple[int, Any]] = (),
+           dead_cards: list[tuple[int, Any]] = (),
+           config: DeckConfig = DeckConfig(),
+           board_size: int = 5,
+           workers: Optional[int] = None,
+           chunk_size: int = 20000) -> tuple[list[float], list[int], list[int], int]:
+    """Exact equity of every player, enumerating all the ways of completing the board.
+    Every player makes the best hand of config.size cards from their hole cards and the board.
+    A pot split between k winners gives 1/k to each of them.
+
+    Parameters
+    ----------
+    players : list[list[tuple[int, Any]]]
+        Hole cards of every player, as (value, suit) tuples.
+    board : list[tuple[int, Any]], optional
+        Board cards already dealt.
+    dead_cards : list[tuple[int, Any]], optional
+        Cards out of the deck, which cannot be dealt to the board.
+    config : DeckConfig, default DeckConfig()
+        Game configuration. Suits of the cards must be in config.labels.
+    board_size : int, default 5
+        Number of board cards once the board is complete.
+    workers : int, optional
+        Number of worker processes. Defaults to the number of CPUs. With 1 worker,
+        everything runs in the calling process.
+    chunk_size : int, default 20000
+        Number of boards in every work unit.
+
+    Returns
+    -------
+    equities : list[float]
+        Expected share of the pot of every player.
+    wins : list[int]
+        Number of boards won outright by every player.
+    ties : list[int]
+        For every player, number of boards where it splits the pot with at least one other player.
+    boards : int
+        Number of boards enumerated.
+    """
+    labels = config.labels
+    player_codes = [encode_hand(hole, labels) for hole in players]
+    board_codes = encode_hand(list(board), labels)
+    used = [code for hole in player_codes for code in hole] + board_codes + encode_hand(list(dead_cards), labels)
+    used_codes = set(used)
+    if len(used_codes) != len(used):
+        raise ValueError("the same card is given more than once")
+    missing = board_size - len(board_codes)
+    if missing < 0:
+        raise ValueError(f"the board has more than {board_size} cards")
+
+    deck = encode_hand(config.deck(), labels)
+    remaining = [code for code in deck if code not in used_codes]
+    total = n_choose_k(len(remaining), missing) if missing <= len(remaining) else 0
+    if total == 0:
+        raise ValueError("not enough cards left to complete the board")
+    ranking, _ = config.ranking()
+
+    tasks = [(player_codes, board_codes, remaining, missing, start, min(chunk_size, total - start), config, ranking)
+             for start in range(0, total, chunk_size)]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers == 1 or len(tasks) == 1:
+        results = map(_equity_chunk, tasks)
+        counts = sum(results)
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            # map keeps the order of the tasks, so the merge is deterministic
+            counts = sum(pool.map(_equity_chunk, tasks))
+
+    equities = [float(sum(Fraction(int(counts[i, k]), k) for k in range(1, len(players) + 1)) / total)
+                for i in range(len(players))]
+    wins = [int(counts[i, 1]) for i in range(len(players))]
+    ties = [int(counts[i, 2:].sum()) for i in range(len(players))]
+    return equities, wins, ties, total
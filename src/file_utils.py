@@ -0,0 +1,30 @@
+"""Utilities for writing files.
+"""
+
+import os
+from typing import Union
+
+
+def atomic_write(path: str, data: Union[str, bytes]) -> None:
+    """Writes data to a file atomically: readers see either the previous file or the new one.
+    The data goes to a temporary file next to path, which replaces path once complete.
+    The temporary file is removed when writing fails, and the error is raised.
+
+    Parameters
+    ----------
+    path : str
+        Destination file.
+    data : str or bytes
+        Content of the file. Strings are written in text mode.
+    """
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, "wb" if isinstance(data, bytes) else "w") as file:
+            file.write(data)
+        os.replace(temporary, path)
+    except BaseException:
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,161 @@
+"""Compact integer indices of hands, using the combinatorial number system.
+
+A hand of a deck with n cards is a size-subset of the deck positions of config.deck(),
+c_1 < ... < c_size. Its index is C(c_1, 1) + ... + C(c_size, size), a number below
+C(n, size), so every hand is stored as one integer.
+
+Hands that only differ by a permutation of suits have the same canonical index.
+A hand is described, up to suits, by the multiset of the rank sets of its suits.
+Rank sets of the same size are indexed with the combinatorial number system, and
+the multisets of those indices with the multiset number system, so canonical
+indices are also dense: they go from 0 to canonical_count(config) - 1.
+"""
+
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Any
+
+from .combinatorial_utils import iter_integer_partitions, n_choose_k
+from .deck_config import DeckConfig
+
+
+def binomial(n: int, k: int) -> int:
+    """C(n, k), with C(n, k) = 0 when k > n.
+    """
+    return n_choose_k(n, k) if 0 <= k <= n else 0
+
+
+def subset_index(subset: list[int]) -> int:
+    """Position of a set of non negative integers, sorted in ascending order,
+    among all sets of the same size.
+    """
+    return sum(binomial(c, i + 1) for i, c in enumerate(subset))
+
+
+def subset_at(index: int, k: int) -> list[int]:
+    """Set of k non negative integers at a position. Inverse of subset_index.
+    """
+    subset = []
+    for i in range(k, 0, -1):
+        # largest c with C(c, i) <= index
+        c = i - 1
+        while binomial(c + 1, i) <= index:
+            c += 1
+        subset.append(c)
+        index -= binomial(c, i)
+    return subset[::-1]
+
+
+def _positions(cards: list[tuple[int, Any]], config: DeckConfig) -> list[int]:
+    suit_index = {suit: s for s, suit in enumerate(config.labels)}
+    return sorted((value - config.lowest_value) * config.suits + suit_index[suit] for value, suit in cards)
+
+
+def hand_to_index(cards: list[tuple[int, Any]], config: DeckConfig = DeckConfig()) -> int:
+    """Index of a hand, from 0 to C(values * suits, size) - 1.
+
+    Parameters
+    ----------
+    cards : list[tuple[int, Any]]
+        Distinct cards as (value, suit) tuples, in any order.
+    config : DeckConfig, default DeckConfig()
+        Game configuration. Suits of the cards must be in config.labels.
+
+    Returns
+    -------
+    int
+        Index of the hand.
+    """
+    return subset_index(_positions(cards, config))
+
+
+def index_to_hand(index: int, config: DeckConfig = DeckConfig()) -> list[tuple[int, Any]]:
+    """Hand at an index, with cards sorted as in config.deck(). Inverse of hand_to_index.
+    """
+    labels = config.labels
+    return [(config.lowest_value + p // config.suits, labels[p % config.suits])
+            for p in subset_at(index, config.size)]
+
+
+@lru_cache(maxsize=None)
+def _shapes(values: int, suits: int, size: int) -> tuple[tuple, tuple]:
+    """Numbers of cards per suit of the hands, in descending order,
+    with the first canonical index of every shape and the total count.
+    """
+    shapes, offsets, total = [], [], 0
+    for shape in iter_integer_partitions(size, max_part=values, max_parts=suits):
+        shapes.append(shape)
+        offsets.append(total)
+        total += _shape_count(values, shape)
+    return tuple(shapes), tuple(offsets) + (total, )
+
+
+def _groups(shape: tuple) -> list[tuple[int, int]]:
+    """(suit size, number of suits) of the groups of suits with the same size, largest first.
+    """
+    return [(s, shape.count(s)) for s in sorted(set(shape), reverse=True)]
+
+
+def _shape_count(values: int, shape: tuple) -> int:
+    count = 1
+    for s, m in _groups(shape):
+        count *= binomial(binomial(values, s) + m - 1, m)
+    return count
+
+
+def canonical_count(config: DeckConfig = DeckConfig()) -> int:
+    """Number of hands which are different up to a permutation of suits.
+    """
+    return _shapes(config.values, config.suits, config.size)[1][-1]
+
+
+def canonical_index(cards: list[tuple[int, Any]], config: DeckConfig = DeckConfig()) -> int:
+    """Index of a hand up to a permutation of suits, from 0 to canonical_count(config) - 1.
+
+    Parameters
+    ----------
+    cards : list[tuple[int, Any]]
+        Distinct cards as (value, suit) tuples, in any order.
+    config : DeckConfig, default DeckConfig()
+        Game configuration. Suits of the cards must be in config.labels.
+
+    Returns
+    -------
+    int
+        Canonical index, shared by every hand obtained by permuting suits.
+    """
+    if len(cards) != config.size:
+        raise ValueError(f"hands must have {config.size} cards")
+    rank_sets = [[] for _ in range(config.suits)]
+    for p in _positions(cards, config):
+        rank_sets[p % config.suits].append(p // config.suits)
+    suit_keys = sorted(((len(ranks), subset_index(ranks)) for ranks in rank_sets if ranks), reverse=True)
+
+    shapes, offsets = _shapes(config.values, config.suits, config.size)
+    shape = tuple(size for size, _ in suit_keys)
+    index = 0
+    for s, m in _groups(shape):
+        group = sorted(key for size, key in suit_keys if size == s)
+        index = index * binomial(binomial(config.values, s) + m - 1, m) + \
+            subset_index([key + i for i, key in enumerate(group)])
+    return offsets[shapes.index(shape)] + index
+
+
+def canonical_hand(index: int, config: DeckConfig = DeckConfig()) -> list[tuple[int, Any]]:
+    """Representative hand of a canonical index. Inverse of canonical_index.
+    The suits with most cards, and then with the highest ranks, come first in config.labels.
+    """
+    shapes, offsets = _shapes(config.values, config.suits, config.size)
+    if not 0 <= index < offsets[-1]:
+        raise ValueError(f"canonical index must be between 0 and {offsets[-1] - 1}")
+    position = bisect_right(offsets, index) - 1
+    shape, index = shapes[position], index - offsets[position]
+
+    rank_sets = []
+    for s, m in reversed(_groups(shape)):
+        index, group = divmod(index, binomial(binomial(config.values, s) + m - 1, m))
+        keys = [key - i for i, key in enumerate(subset_at(group, m))]
+        rank_sets = [subset_at(key, s) for key in reversed(keys)] + rank_sets
+    labels = config.labels
+    return sorted(((config.lowest_value + rank, labels[s]) for s, ranks in enumerate(rank_sets) for rank in ranks),
+                  key=lambda card: (card[0], labels.index(card[1])))
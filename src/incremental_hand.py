@@ -0,0 +1,167 @@
+"""Hand that is updated one card at a time, for streets and rollouts.
+"""
+
+from typing import Any
+from .best_hand_evaluator import best_hand_from_groups
+from .bitmask_evaluator import mask_values, popcount
+from .score_system import hand_score
+
+
+class IncrementalHand:
+    """Cards held by a player, with the state needed to classify them kept up to date.
+    Adding or removing a card updates the value counts, the rank bitmasks
+    of every suit and the frequency signature without rebuilding them.
+
+    Parameters
+    ----------
+    size : int
+        Hand size used.
+    ranking : dict[tuple, int]
+        Ranking from generate_ranking, for the same hand size and flags.
+    main_ace_value : int
+        Numerical value of the aces, the best valued cards in the deck.
+    accept_royal_flush : bool, default True
+        Recognize a royal flush as a proper category in the ranking or as
+        another straight flush.
+    allow_dual_ace : bool default True
+        Allow aces to be part of the lowest straight (wheel).
+    replace_value : bool default True
+        Change ace value in a wheel.
+    alt_ace_value : int default 1
+        Alternative ace value in wheels.
+    """
+
+    __slots__ = ('size', 'ranking', 'main_ace_value', 'accept_royal_flush', 'allow_dual_ace',
+                 'replace_value', 'alt_ace_value', 'by_value', 'suit_masks', 'rank_mask',
+                 'count_frequencies', 'n_cards')
+
+    def __init__(self, size: int, ranking: dict[tuple, int], main_ace_value: int,
+                 accept_royal_flush: bool = True, allow_dual_ace: bool = True,
+                 replace_value: bool = True, alt_ace_value: int = 1):
+        self.size = size
+        self.ranking = ranking
+        self.main_ace_value = main_ace_value
+        self.accept_royal_flush = accept_royal_flush
+        self.allow_dual_ace = allow_dual_ace
+        self.replace_value = replace_value
+        self.alt_ace_value = alt_ace_value
+        # cards of every value, rank bitmask of every suit and values with some card
+        self.by_value = {}
+        self.suit_masks = {}
+        self.rank_mask = 0
+        # count_frequencies[c] is the number of values with exactly c cards
+        self.count_frequencies = [0]
+        self.n_cards = 0
+
+    def __len__(self) -> int:
+        return self.n_cards
+
+    def add(self, card: tuple[int, Any]) -> None:
+        """Adds a card, given as a (value, suit) tuple. Raises ValueError for cards already held.
+        """
+        value, suit = card
+        if self.suit_masks.get(suit, 0) >> value & 1:
+            raise ValueError(f"card {card} is already in the hand")
+        cards = self.by_value.setdefault(value, [])
+        count = len(cards)
+        if count:
+            self.count_frequencies[count] -= 1
+        else:
+            self.rank_mask |= 1 << value
+        if count + 1 == len(self.count_frequencies):
+            self.count_frequencies.append(0)
+        self.count_frequencies[count + 1] += 1
+        cards.append(card)
+        self.suit_masks[suit] = self.suit_masks.get(suit, 0) | (1 << value)
+        self.n_cards += 1
+
+    def remove(self, card: tuple[int, Any]) -> None:
+        """Removes a card previously added. Raises ValueError for missing cards.
+        """
+        value, suit = card
+        cards = self.by_value.get(value)
+        if not cards or card not in cards:
+            raise ValueError(f"card {card} is not in the hand")
+        count = len(cards)
+        cards.remove(card)
+        self.count_frequencies[count] -= 1
+        if count > 1:
+            self.count_frequencies[count - 1] += 1
+        else:
+            del self.by_value[value]
+            self.rank_mask ^= 1 << value
+        mask = self.suit_masks[suit] ^ (1 << value)
+        if mask:
+            self.suit_masks[suit] = mask
+        else:
+            del self.suit_masks[suit]
+        self.n_cards -= 1
+
+    def cards(self) -> list[tuple[int, Any]]:
+        """Cards in the hand, sorted by value in descending order.
+        """
+        return [card for value in mask_values(self.rank_mask) for card in self.by_value[value]]
+
+    @property
+    def frequency_signature(self) -> tuple[int, ...]:
+        """Frequency of each value among all the cards. Sorted in descending order.
+        """
+        signature = []
+        for count in range(len(self.count_frequencies) - 1, 0, -1):
+            signature.extend(self.count_frequencies[count] * [count])
+        return tuple(signature)
+
+    def classify(self) -> tuple[list[tuple[int, Any]], tuple[int, ...], bool, bool, bool]:
+        """Classification of the best hand of size cards, as returned by evaluate_hand.
+        Raises ValueError when there are fewer than size cards.
+        """
+        if self.n_cards < self.size:
+            raise ValueError(f"{self.n_cards} cards are not enough for a hand of size {self.size}")
+        if self.n_cards > self.size:
+            # suits with enough cards for a flush, read from their rank bitmasks
+            flush_suits = [[(value, suit) for value in mask_values(mask)]
+                           for suit, mask in self.suit_masks.items() if popcount(mask) >= self.size]
+            return best_hand_from_groups(self.by_value, mask_values(self.rank_mask), flush_suits,
+                                         len(self.suit_masks), self.size, self.ranking, self.main_ace_value,
+                                         self.accept_royal_flush, self.allow_dual_ace,
+                                         self.replace_value, self.alt_ace_value)[:5]
+
+        values = mask_values(self.rank_mask)
+        frequency_signature = self.frequency_signature
+        is_flush, is_straight, is_royal_flush = False, False, False
+
+        # special hand
+        if frequency_signature[0] == 1:
+            sorted_hand = [self.by_value[value][0] for value in values]
+            is_flush = len(self.suit_masks) == 1
+            is_straight = values[0] - values[-1] == self.size - 1
+
+            # wheel hand
+            if not is_straight and self.allow_dual_ace:
+                if values[0] == self.main_ace_value and values[1] - values[-1] == self.size - 2:
+                    is_straight = values[-1] - self.alt_ace_value == 1
+                    if is_straight:
+                        if self.replace_value:
+                            sorted_hand = sorted_hand[1:] + [(self.alt_ace_value, sorted_hand[0][1])]
+                        else:
+                            sorted_hand = sorted_hand[1:] + sorted_hand[:1]
+
+            # royal flush
+            elif is_straight and values[0] == self.main_ace_value:
+                is_royal_flush = is_flush and self.accept_royal_flush
+
+        # repeated value hand
+        else:
+            sorted_hand = []
+            for count in range(len(self.count_frequencies) - 1, 0, -1):
+                if self.count_frequencies[count]:
+                    sorted_hand.extend(card for value in values if len(self.by_value[value]) == count
+                                       for card in self.by_value[value])
+        return sorted_hand, frequency_signature, is_straight, is_flush, is_royal_flush
+
+    def score(self) -> int:
+        """hand_score of the best hand of size cards.
+        """
+        sorted_hand, frequencies, is_straight, is_flush, is_royal_flush = self.classify()
+        hand_rank = self.ranking[(frequencies, is_straight, is_flush, is_royal_flush)]
+        return hand_score([card[0] for card in sorted_hand], hand_rank, self.main_ace_value)
@@ -0,0 +1,248 @@
+"""Opt-in instrumentation of the evaluation pipeline.
+
+enable() replaces evaluate_hand, generate_ranking, hand_score and log_score with
+instrumented versions, in every loaded module of the package that refers to them,
+and disable() puts the originals back. While disabled, nothing is wrapped,
+so evaluation runs without any overhead.
+
+The instrumented evaluate_hand follows the same steps as evaluate_hand, with a
+timer between them. Steps are: sort, signature, flush_straight, wheel and
+frequency_sort. generate_ranking, the ranking lookup, and hand_score, the score
+exponentiation, are timed as a whole, as is log_score. Calls made from inside
+another instrumented function, such as hand_score inside log_score, are not
+counted, so no time is counted twice. Nesting is tracked per thread and per
+asyncio task.
+"""
+
+import json
+import sys
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter_ns
+from typing import Any
+
+from . import hand_evaluator, rank_generator, score_system
+
+_originals = {
+    "evaluate_hand": hand_evaluator.evaluate_hand,
+    "generate_ranking": rank_generator.generate_ranking,
+    "hand_score": score_system.hand_score,
+    "log_score": score_system.log_score,
+}
+_enabled = False
+_depth = ContextVar("instrumentation_depth", default=0)
+_calls = Counter()
+_stage_calls = Counter()
+_stage_ns = Counter()
+_signatures = Counter()
+_branches = Counter()
+
+
+def _evaluate_hand(cards: list[tuple[int, Any]],
+                   main_ace_value: int,
+                   accept_royal_flush: bool = True,
+                   allow_dual_ace: bool = True,
+                   replace_value: bool = True,
+                   alt_ace_value: int = 1) -> tuple[list[tuple[int, Any]], tuple[int, ...], bool, bool, bool]:
+    """evaluate_hand recording step timings, frequency signatures and special hands.
+    Same steps and results as evaluate_hand, which tests check.
+    """
+    if _depth.get():
+        return _originals["evaluate_hand"](cards, main_ace_value, accept_royal_flush, allow_dual_ace,
+                                           replace_value, alt_ace_value)
+    _calls["evaluate_hand"] += 1
+    start = perf_counter_ns()
+    sorted_hand = sorted(cards, key=lambda card: card[0], reverse=True)
+    values = [card[0] for card in sorted_hand]
+    step = perf_counter_ns()
+    _stage_ns["sort"] += step - start
+    _stage_calls["sort"] += 1
+
+    start = step
+    value_frequencies = Counter(values)
+    is_flush, is_straight, is_royal_flush = False, False, False
+    frequency_signature = tuple(sorted(value_frequencies.values(), reverse=True))
+    step = perf_counter_ns()
+    _stage_ns["signature"] += step - start
+    _stage_calls["signature"] += 1
+    _signatures[frequency_signature] += 1
+
+    start = step
+    if frequency_signature[0] == 1:
+        is_flush = len(set(card[1] for card in sorted_hand)) == 1
+        is_straight = values[0] - values[-1] == len(cards) - 1
+        step = perf_counter_ns()
+        _stage_ns["flush_straight"] += step - start
+        _stage_calls["flush_straight"] += 1
+
+        start = step
+        if not is_straight and allow_dual_ace:
+            if values[0] == main_ace_value and values[1] - values[-1] == len(cards) - 2:
+                is_straight = values[-1] - alt_ace_value == 1
+                if is_straight:
+                    _branches["wheel"] += 1
+                    if replace_value:
+                        sorted_hand = sorted_hand[1:] + [(alt_ace_value, sorted_hand[0][1])]
+                    else:
+                        sorted_hand = sorted_hand[1:] + sorted_hand[:1]
+            step = perf_counter_ns()
+            _stage_ns["wheel"] += step - start
+            _stage_calls["wheel"] += 1
+        elif is_straight and values[0] == main_ace_value:
+            is_royal_flush = is_flush and accept_royal_flush
+        if is_royal_flush:
+            _branches["royal_flush"] += 1
+        elif is_straight:
+            _branches["straight_flush" if is_flush else "straight"] += 1
+        elif is_flush:
+            _branches["flush"] += 1
+    else:
+        sorted_hand.sort(key=lambda card: value_frequencies[card[0]], reverse=True)
+        step = perf_counter_ns()
+        _stage_ns["frequency_sort"] += step - start
+        _stage_calls["frequency_sort"] += 1
+    return sorted_hand, frequency_signature, is_straight, is_flush, is_royal_flush
+
+
+def _timed(name: str):
+    original = _originals[name]
+
+    def wrapper(*args, **kwargs):
+        if _depth.get():
+            return original(*args, **kwargs)
+        _calls[name] += 1
+        token = _depth.set(1)
+        start = perf_counter_ns()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            _stage_ns[name] += perf_counter_ns() - start
+            _stage_calls[name] += 1
+            _depth.reset(token)
+
+    wrapper.__name__, wrapper.__doc__, wrapper.__wrapped__ = name, original.__doc__, original
+    return wrapper
+
+
+def _replace(old: dict, new: dict) -> None:
+    """Rebinds every function of old to its counterpart in new, in all loaded modules of the package.
+    """
+    package = __name__.rpartition(".")[0]
+    for name, module in list(sys.modules.items()):
+        if module is None or (name != package and not name.startswith(package + ".")):
+            continue
+        for attribute, function in old.items():
+            if getattr(module, attribute, None) is function:
+                setattr(module, attribute, new[attribute])
+
+
+_instrumented = {
+    "evaluate_hand": _evaluate_hand,
+    "generate_ranking": _timed("generate_ranking"),
+    "hand_score": _timed("hand_score"),
+    "log_score": _timed("log_score"),
+}
+
+
+def enable() -> None:
+    """Starts collecting statistics. Collected statistics are kept.
+    """
+    global _enabled
+    if not _enabled:
+        _replace(_originals, _instrumented)
+        _enabled = True
+
+
+def disable() -> None:
+    """Stops collecting statistics and restores the original functions.
+    """
+    global _enabled
+    if _enabled:
+        _replace(_instrumented, _originals)
+        _enabled = False
+
+
+def is_enabled() -> bool:
+    """Check if statistics are being collected.
+    """
+    return _enabled
+
+
+def reset() -> None:
+    """Clears the collected statistics.
+    """
+    for counter in (_calls, _stage_calls, _stage_ns, _signatures, _branches):
+        counter.clear()
+
+
+@contextmanager
+def instrumented(clear: bool = True):
+    """Collects statistics inside a with block, emptying them first when clear is True.
+    Statistics stay available after the block.
+    """
+    was_enabled = _enabled
+    if clear:
+        reset()
+    enable()
+    try:
+        yield
+    finally:
+        if not was_enabled:
+            disable()
+
+
+def stats() -> dict:
+    """Collected statistics.
+
+    Returns
+    -------
+    dict
+        calls: number of calls of every instrumented function.
+        stages: for every step of evaluate_hand and every other function, number of
+        times it ran, total time in seconds and mean time in nanoseconds.
+        signatures: number of evaluated hands with every frequency signature.
+        branches: number of wheels, royal flushes, straight flushes, straights and flushes.
+        Royal flushes are not counted as straight flushes, and wheels are also counted
+        as straights or straight flushes.
+    """
+    stages = {stage: {"count": _stage_calls[stage], "seconds": _stage_ns[stage] / 1e9,
+                      "mean_ns": _stage_ns[stage] / _stage_calls[stage]}
+              for stage in _stage_calls}
+    return {
+        "calls": dict(_calls),
+        "stages": stages,
+        "signatures": {signature: count for signature, count in _signatures.most_common()},
+        "branches": dict(_branches),
+    }
+
+
+def to_json(**kwargs) -> str:
+    """Collected statistics as JSON. Signatures become strings like "2,1,1,1".
+    """
+    data = stats()
+    data["signatures"] = {",".join(map(str, signature)): count for signature, count in data["signatures"].items()}
+    return json.dumps(data, **kwargs)
+
+
+def to_prometheus(prefix: str = "poker") -> str:
+    """Collected statistics in the Prometheus text exposition format.
+    """
+    data = stats()
+    metrics = [
+        ("calls_total", "Calls of instrumented functions.", "function",
+         data["calls"].items()),
+        ("stage_runs_total", "Runs of every evaluation stage.", "stage",
+         ((stage, values["count"]) for stage, values in data["stages"].items())),
+        ("stage_seconds_total", "Time spent in every evaluation stage.", "stage",
+         ((stage, values["seconds"]) for stage, values in data["stages"].items())),
+        ("signatures_total", "Evaluated hands by frequency signature.", "signature",
+         ((",".join(map(str, signature)), count) for signature, count in data["signatures"].items())),
+        ("branches_total", "Evaluated special hands.", "branch",
+         data["branches"].items()),
+    ]
+    lines = []
+    for name, description, label, samples in metrics:
+        lines += [f"# HELP {prefix}_{name} {description}", f"# TYPE {prefix}_{name} counter"]
+        lines += [f'{prefix}_{name}{{{label}="{key}"}} {value}' for key, value in samples]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,206 @@
+"""Precomputed score tables for a fixed deck configuration.
+
+Hands are hashed through the combinatorial number system: the sorted ranks of
+a hand are mapped to their position among all rank multisets of the same size.
+This is a minimal perfect hash, so every table is a flat list of scores.
+"""
+
+from typing import Any, Sequence
+from collections import Counter
+from .combinatorial_utils import iter_k_subsets, n_choose_k
+from .hand_evaluator import evaluate_hand
+from .rank_generator import generate_ranking
+from .score_system import hand_score
+
+
+def binomial_table(n: int, k: int) -> list[list[int]]:
+    """Binomial coefficients C(i, j) for i <= n and j <= k, as table[i][j].
+    """
+    return [[n_choose_k(i, j) if j <= i else 0 for j in range(k + 1)] for i in range(n + 1)]
+
+
+def combination_index(ranks: list[int], binomials: list[list[int]]) -> int:
+    """Position of a set of distinct ranks among all sets of the same size.
+
+    Parameters
+    ----------
+    ranks : list[int]
+        Distinct ranks, from 0 to values - 1, sorted in ascending order.
+    binomials : list[list[int]]
+        Binomial table covering C(values, len(ranks)).
+
+    Returns
+    -------
+    int
+        Index from 0 to C(values, len(ranks)) - 1.
+    """
+    return sum(binomials[r][i + 1] for i, r in enumerate(ranks))
+
+
+def multiset_index(ranks: list[int], binomials: list[list[int]]) -> int:
+    """Position of a multiset of ranks among all multisets of the same size.
+
+    Parameters
+    ----------
+    ranks : list[int]
+        Ranks, from 0 to values - 1, sorted in ascending order. Repetitions are allowed.
+    binomials : list[list[int]]
+        Binomial table covering C(values + len(ranks) - 1, len(ranks)).
+
+    Returns
+    -------
+    int
+        Index from 0 to C(values + len(ranks) - 1, len(ranks)) - 1.
+    """
+    return sum(binomials[r + i][i + 1] for i, r in enumerate(ranks))
+
+
+def build_lookup_tables(values: int, suits: int, size: int,
+                        royal_flush: bool = True, dual_ace: bool = True,
+                        main_ace_value: int = None, alt_ace_value: int = 1,
+                        replace_value: bool = True,
+                        ranking: dict[tuple, int] = None) -> tuple[list[int], list[int]]:
+    """Score of every rank pattern of a deck configuration.
+    Scores are computed with evaluate_hand, generate_ranking and hand_score
+    on a representative hand of each pattern.
+
+    Parameters
+    ----------
+    values : int
+        Number of cards per suit.
+    suits : int
+        Number of suits in the deck.
+    size : int
+        Hand size used.
+    royal_flush : bool, default True
+        Treats royal flush separately from straight flush.
+    dual_ace : bool, default True
+        Allow aces to form wheel straights.
+    main_ace_value : int, default values + 1
+        Numerical value of the aces. Card values go from main_ace_value - values + 1
+        to main_ace_value.
+    alt_ace_value : int default 1
+        Alternative ace value in wheels.
+    replace_value : bool default True
+        Change ace value in a wheel.
+    ranking : dict[tuple, int], optional
+        Ranking from generate_ranking. Computed when missing.
+
+    Returns
+    -------
+    flush_table : list[int]
+        Scores of flush hands, indexed by combination_index of their ranks.
+    non_flush_table : list[int]
+        Scores of the remaining hands, indexed by multiset_index of their ranks.
+        Rank multisets that cannot be dealt from the deck score 0.
+    """
+    if main_ace_value is None:
+        main_ace_value = values + 1
+    lowest_value = main_ace_value - values + 1
+    if ranking is None:
+        ranking, _ = generate_ranking(values, suits, size, royal_flush, dual_ace)
+
+    def score(cards):
+        sorted_hand, frequencies, is_straight, is_flush, is_royal_flush = \
+            evaluate_hand(cards, main_ace_value, royal_flush, dual_ace, replace_value, alt_ace_value)
+        hand_rank = ranking[(frequencies, is_straight, is_flush, is_royal_flush)]
+        return hand_score([card[0] for card in sorted_hand], hand_rank, main_ace_value)
+
+    binomials = _binomials(values, size)
+    flush_table = n_choose_k(values, size) * [0] if values >= size else []
+    non_flush_table = n_choose_k(values + size - 1, size) * [0]
+
+    if values >= size:
+        for subset in iter_k_subsets(values, size):
+            ranks = list(subset)
+            flush_table[combination_index(ranks, binomials)] = score([(lowest_value + r, 0) for r in ranks])
+
+    for subset in iter_k_subsets(values + size - 1, size):
+        # stars and bars: subset c_0 < ... < c_k-1 is the multiset c_i - i
+        ranks = [c - i for i, c in enumerate(subset)]
+        copies = Counter(ranks)
+        if max(copies.values()) > suits or (len(copies) == size and (suits == 1 or size == 1)):
+            continue
+        # copies of a rank are consecutive, so they get different suits
+        cards = [(lowest_value + r, i % suits) for i, r in enumerate(ranks)]
+        non_flush_table[multiset_index(ranks, binomials)] = score(cards)
+    return flush_table, non_flush_table
+
+
+def _binomials(values: int, size: int) -> list[list[int]]:
+    return binomial_table(values + size - 1, size)
+
+
+class LookupEvaluator:
+    """Scores hands of a fixed deck configuration with one table read.
+
+    Parameters
+    ----------
+    values : int
+        Number of cards per suit.
+    suits : int
+        Number of suits in the deck.
+    size : int
+        Hand size used.
+    royal_flush : bool, default True
+        Treats royal flush separately from straight flush.
+    dual_ace : bool, default True
+        Allow aces to form wheel straights.
+    main_ace_value : int, default values + 1
+        Numerical value of the aces.
+    alt_ace_value : int default 1
+        Alternative ace value in wheels.
+    replace_value : bool default True
+        Change ace value in a wheel.
+    """
+
+    def __init__(self, values: int, suits: int, size: int,
+                 royal_flush: bool = True, dual_ace: bool = True,
+                 main_ace_value: int = None, alt_ace_value: int = 1,
+                 replace_value: bool = True):
+        if main_ace_value is None:
+            main_ace_value = values + 1
+        self._set_deck(values, suits, size, main_ace_value)
+        self.flush_table, self.non_flush_table = build_lookup_tables(
+            values, suits, size, royal_flush, dual_ace, main_ace_value, alt_ace_value, replace_value)
+
+    @classmethod
+    def from_tables(cls, values: int, suits: int, size: int,
+                    flush_table: Sequence[int], non_flush_table: Sequence[int],
+                    main_ace_value: int = None) -> "LookupEvaluator":
+        """LookupEvaluator scoring hands with tables built beforehand, as those of
+        build_lookup_tables for the same configuration, instead of building them.
+        """
+        if main_ace_value is None:
+            main_ace_value = values + 1
+        evaluator = cls.__new__(cls)
+        evaluator._set_deck(values, suits, size, main_ace_value)
+        evaluator.flush_table, evaluator.non_flush_table = flush_table, non_flush_table
+        return evaluator
+
+    def _set_deck(self, values: int, suits: int, size: int, main_ace_value: int) -> None:
+        self.values, self.suits, self.size = values, suits, size
+        self.main_ace_value = main_ace_value
+        self.lowest_value = main_ace_value - values + 1
+        self.binomials = _binomials(values, size)
+
+    def score(self, cards: list[tuple[int, Any]]) -> int:
+        """hand_score of a hand given as (value, suit) tuples.
+        """
+        low, binomials = self.lowest_value, self.binomials
+        ranks = sorted(card[0] - low for card in cards)
+        suit = cards[0][1]
+        if all(card[1] == suit for card in cards):
+            return self.flush_table[sum(binomials[r][i + 1] for i, r in enumerate(ranks))]
+        return self.non_flush_table[sum(binomials[r + i][i + 1] for i, r in enumerate(ranks))]
+
+    def score_encoded(self, codes: list[int]) -> int:
+        """hand_score of a hand given as integer card codes, value * suits + suit.
+        """
+        suits, binomials = self.suits, self.binomials
+        offset = self.lowest_value * suits
+        ranks = sorted(code - offset for code in codes)
+        suit = ranks[0] % suits
+        if all(r % suits == suit for r in ranks):
+            return self.flush_table[sum(binomials[r // suits][i + 1] for i, r in enumerate(ranks))]
+        return self.non_flush_table[sum(binomials[r // suits + i][i + 1] for i, r in enumerate(ranks))]
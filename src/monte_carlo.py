@@ -0,0 +1,174 @@
+"""Monte Carlo equity of several players, for configurations too large for exact enumeration.
+Requires numpy.
+
+Boards are dealt in vectorized batches. Batch t draws from its own random stream,
+derived from the seed and t, so results only depend on the seed and the batch size,
+whether batches run in one process or in several.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from typing import Any, Iterator, Optional
+
+import numpy as np
+from .bitmask_evaluator import encode_hand
+from .deck_config import DeckConfig
+from .equity import board_scores
+
+
+def deal_boards(remaining: np.ndarray, missing: int, n: int, rng: np.random.Generator) -> np.ndarray:
+    """Deals n random completions of a board from the remaining cards.
+
+    Parameters
+    ----------
+    remaining : np.ndarray
+        Card codes left in the deck.
+    missing : int
+        Number of cards to deal in every completion.
+    n : int
+        Number of completions.
+    rng : np.random.Generator
+        Source of randomness.
+
+    Returns
+    -------
+    np.ndarray
+        Card codes with shape (n, missing), without repeated cards in a row.
+    """
+    if missing == 0:
+        return np.zeros((n, 0), dtype=np.int64)
+    keys = rng.random((n, len(remaining)))
+    return remaining[np.argpartition(keys, missing - 1, axis=1)[:, :missing]]
+
+
+def _sample_batch(task: tuple) -> tuple[np.ndarray, np.ndarray, int]:
+    """Sums of pot shares and of squared pot shares of every player over one batch of boards.
+    """
+    players, board, remaining, missing, batch_size, seed, index, config, ranking = task
+    rng = np.random.Generator(np.random.PCG64(np.random.SeedSequence(seed, spawn_key=(index, ))))
+    completions = deal_boards(np.array(remaining, dtype=np.int64), missing, batch_size, rng)
+    boards = np.hstack([np.broadcast_to(np.array(board, dtype=np.int64), (batch_size, len(board))), completions])
+    scores = board_scores(players, boards, config, ranking)
+    winners = scores == scores.max(axis=1, keepdims=True)
+    shares = winners / winners.sum(axis=1, keepdims=True)
+    return shares.sum(axis=0), (shares ** 2).sum(axis=0), batch_size
+
+
+def iter_equity_estimates(players: list[list[tuple[int, Any]]],
+                          board: list[tuple[int, Any]] = (),
+                          dead_cards: list[tuple[int, Any]] = (),
+                          config: DeckConfig = DeckConfig(),
+                          board_size: int = 5,
+                          batch_size: int = 10000,
+                          seed: Optional[int] = None,
+                          workers: int = 1,
+                          confidence: float = 0.95) -> Iterator[tuple[list[float], list[float], int]]:
+    """Running Monte Carlo estimates of the equity of every player.
+    A pot split between k winners gives 1/k to each of them.
+
+    Parameters
+    ----------
+    players : list[list[tuple[int, Any]]]
+        Hole cards of every player, as (value, suit) tuples.
+    board : list[tuple[int, Any]], optional
+        Board cards already dealt.
+    dead_cards : list[tuple[int, Any]], optional
+        Cards out of the deck, which cannot be dealt to the board.
+    config : DeckConfig, default DeckConfig()
+        Game configuration. Suits of the cards must be in config.labels.
+    board_size : int, default 5
+        Number of board cards once the board is complete.
+    batch_size : int, default 10000
+        Number of boards dealt in every batch.
+    seed : int, optional
+        Seed of the random streams. A random seed is drawn when missing.
+    workers : int, default 1
+        Number of worker processes. Every round evaluates one batch per worker.
+    confidence : float, default 0.95
+        Confidence level of the reported intervals.
+
+    Returns
+    -------
+    Iterator[tuple[list[float], list[float], int]]
+        After every round: equity estimates, half widths of their confidence
+        intervals and number of boards dealt so far. The iterator never ends.
+    """
+    labels = config.labels
+    player_codes = [encode_hand(hole, labels) for hole in players]
+    board_codes = encode_hand(list(board), labels)
+    used = [code for hole in player_codes for code in hole] + board_codes + encode_hand(list(dead_cards), labels)
+    if len(set(used)) != len(used):
+        raise ValueError("the same card is given more than once")
+    remaining = [code for code in encode_hand(config.deck(), labels) if code not in set(used)]
+    missing = board_size - len(board_codes)
+    if missing < 0 or missing > len(remaining):
+        raise ValueError("the board cannot be completed with the remaining cards")
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    ranking, _ = config.ranking()
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    def tasks(first):
+        return [(player_codes, board_codes, remaining, missing, batch_size, seed, index, config, ranking)
+                for index in range(first, first + workers)]
+
+    sums, squares, samples = np.zeros(len(players)), np.zeros(len(players)), 0
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        index = 0
+        while True:
+            results = pool.map(_sample_batch, tasks(index)) if pool else map(_sample_batch, tasks(index))
+            for batch_sums, batch_squares, batch_samples in results:
+                sums += batch_sums
+                squares += batch_squares
+                samples += batch_samples
+            index += workers
+            means = sums / samples
+            variances = np.maximum(squares / samples - means ** 2, 0) * samples / max(samples - 1, 1)
+            half_widths = z * np.sqrt(variances / samples)
+            yield means.tolist(), half_widths.tolist(), samples
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+
+
+def monte_carlo_equity(players: list[list[tuple[int, Any]]],
+                       board: list[tuple[int, Any]] = (),
+                       dead_cards: list[tuple[int, Any]] = (),
+                       config: DeckConfig = DeckConfig(),
+                       board_size: int = 5,
+                       target_error: float = 0.001,
+                       max_samples: int = 10 ** 7,
+                       batch_size: int = 10000,
+                       seed: Optional[int] = None,
+                       workers: int = 1,
+                       confidence: float = 0.95) -> tuple[list[float], list[float], int]:
+    """Monte Carlo equity of every player, stopping once the estimates are precise enough.
+
+    Parameters
+    ----------
+    players, board, dead_cards, config, board_size, batch_size, seed, workers, confidence
+        Same as in iter_equity_estimates.
+    target_error : float, default 0.001
+        Sampling stops when the standard error of every estimate is at most target_error.
+    max_samples : int, default 10 ** 7
+        Sampling stops after this number of boards, even if the target was not reached.
+
+    Returns
+    -------
+    equities : list[float]
+        Equity estimates.
+    half_widths : list[float]
+        Half widths of the confidence intervals of the estimates.
+    samples : int
+        Number of boards dealt.
+    """
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    estimates = iter_equity_estimates(players, board, dead_cards, config, board_size,
+                                      batch_size, seed, workers, confidence)
+    try:
+        for equities, half_widths, samples in estimates:
+            if samples >= max_samples or max(half_widths) / z <= target_error:
+                return equities, half_widths, samples
+    finally:
+        estimates.close()
@@ -0,0 +1,186 @@
+"""Hand type counts and ranks over many deck configurations at once. Requires numpy.
+
+The closed formulas of rank_generator are evaluated on whole grids of values and
+suits, with exact integers in object arrays. The frequency signatures that fit
+in the largest deck of the grid are enumerated once and shared by all its
+configurations. Every hand
+size and combination of flags is an independent task, run in a process pool.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from math import factorial
+from typing import Iterable, Optional
+
+import numpy as np
+from .combinatorial_utils import iter_integer_partitions
+
+COLUMNS = ("values", "suits", "size", "royal_flush", "dual_ace",
+           "frequency_signature", "is_straight", "is_flush", "is_royal_flush", "count", "rank")
+
+
+def _falling(x: np.ndarray, k: int) -> np.ndarray:
+    """x (x - 1) ... (x - k + 1), elementwise. Zero when 0 <= x < k.
+    """
+    result = np.ones(x.shape, dtype=object)
+    for i in range(k):
+        result = result * (x - i)
+    return result
+
+
+def _choose(x: np.ndarray, k: int) -> np.ndarray:
+    return _falling(x, k) // factorial(k)
+
+
+def category_counts(values: np.ndarray, suits: np.ndarray, size: int,
+                    royal_flush: bool = True, dual_ace: bool = True) -> tuple[list[tuple], np.ndarray, np.ndarray]:
+    """Number of hands of every hand type, for many configurations with the same hand size.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Number of cards per suit of every configuration, with shape (N, ).
+    suits : np.ndarray
+        Number of suits of every configuration, with shape (N, ).
+    size : int
+        Hand size used.
+    royal_flush : bool, default True
+        Treats royal flush separately from straight flush.
+    dual_ace : bool, default True
+        Allow aces to form wheel straights.
+
+    Returns
+    -------
+    categories : list[tuple]
+        Hand types: the partitions that fit in the largest deck, in the order of
+        rank_generator.partition_order, then the special hands.
+    counts : np.ndarray
+        Exact counts as Python integers, with shape (N, len(categories)).
+    present : np.ndarray
+        Boolean array with shape (N, len(categories)), True for the hand types
+        that generate_ranking reports for the configuration.
+    """
+    v = np.asarray(values).astype(object)
+    s = np.asarray(suits).astype(object)
+    # ascending lexicographic order, as partition_order
+    partitions = sorted(iter_integer_partitions(size, max_part=int(np.max(suits, initial=0)),
+                                                max_parts=int(np.max(values, initial=0))))
+    high_card = tuple(size * [1])
+
+    categories, counts, present = [], [], []
+    for partition in partitions:
+        multiplicities = np.ones(v.shape, dtype=object)
+        number = _falling(v, len(partition))
+        for f in set(partition):
+            number = number // factorial(partition.count(f))
+        for f in partition:
+            multiplicities = multiplicities * _choose(s, f)
+        categories.append((partition, False, False, False))
+        counts.append(number * multiplicities)
+        present.append((np.asarray(suits) >= partition[0]) & (np.asarray(values) >= len(partition)))
+
+    zero = np.zeros(v.shape, dtype=object)
+    longer = np.asarray(values) > size
+    rf = np.where(np.asarray(values) >= size, s, zero) if royal_flush else zero
+    sf = np.where(longer, s * (v - size + dual_ace + (not royal_flush)),
+                  np.where(np.asarray(values) == size, s * (not royal_flush), zero))
+    fh = np.where(longer, s * _choose(v, size) - sf - rf, zero)
+    sh = np.where(longer, s ** size * (v - size + dual_ace + 1) - sf - rf, zero)
+    if (high_card, False, False, False) in categories:
+        h = categories.index((high_card, False, False, False))
+        counts[h] = np.where(longer, counts[h] - sf - fh - sh - rf, counts[h])
+
+    specials = [((high_card, True, True, False), sf), ((high_card, False, True, False), fh),
+                ((high_card, True, False, False), sh)]
+    if royal_flush:
+        specials.append(((high_card, True, True, True), rf))
+    for category, count in specials:
+        categories.append(category)
+        counts.append(count)
+        present.append(np.ones(v.shape, dtype=bool))
+    return categories, np.stack(counts, axis=1), np.stack(present, axis=1)
+
+
+def category_ranks(counts: np.ndarray, present: np.ndarray) -> np.ndarray:
+    """Ranks of the hand types from their counts, as in generate_ranking: the most common
+    type has rank 0, and ties keep the order of the columns. Absent types get rank -1.
+    """
+    n, k = counts.shape
+    # counts are not negative, so absent types sort after every present one
+    keys = np.where(present, -counts, 1)
+    order = np.argsort(keys, axis=1, kind="stable")
+    ranks = np.empty((n, k), dtype=np.int64)
+    ranks[np.arange(n)[:, None], order] = np.arange(k)
+    ranks[~present] = -1
+    return ranks
+
+
+def _sweep_task(task: tuple) -> dict[str, np.ndarray]:
+    values, suits, size, royal_flush, dual_ace = task
+    v, s = (grid.ravel() for grid in np.meshgrid(values, suits, indexing="ij"))
+    categories, counts, present = category_counts(v, s, size, royal_flush, dual_ace)
+    ranks = category_ranks(counts, present)
+
+    cells, types = np.nonzero(present)
+    signatures = np.empty(len(types), dtype=object)
+    signatures[:] = [categories[j][0] for j in types]
+    flags = np.array([categories[j][1:] for j in types], dtype=bool).reshape(-1, 3)
+    return {
+        "values": v[cells].astype(np.int64),
+        "suits": s[cells].astype(np.int64),
+        "size": np.full(len(cells), size, dtype=np.int64),
+        "royal_flush": np.full(len(cells), royal_flush),
+        "dual_ace": np.full(len(cells), dual_ace),
+        "frequency_signature": signatures,
+        "is_straight": flags[:, 0],
+        "is_flush": flags[:, 1],
+        "is_royal_flush": flags[:, 2],
+        "count": counts[cells, types],
+        "rank": ranks[cells, types],
+    }
+
+
+def sweep(values: Iterable[int],
+          suits: Iterable[int],
+          sizes: Iterable[int],
+          royal_flush: Iterable[bool] = (True, ),
+          dual_ace: Iterable[bool] = (True, ),
+          workers: Optional[int] = None) -> dict[str, np.ndarray]:
+    """Count and rank of every hand type of every configuration of a grid.
+    Gives the same results as generate_ranking on every configuration.
+
+    Parameters
+    ----------
+    values : Iterable[int]
+        Numbers of cards per suit.
+    suits : Iterable[int]
+        Numbers of suits.
+    sizes : Iterable[int]
+        Hand sizes.
+    royal_flush : Iterable[bool], default (True, )
+        Values of the royal_flush flag.
+    dual_ace : Iterable[bool], default (True, )
+        Values of the dual_ace flag.
+    workers : int, optional
+        Number of worker processes. Defaults to the number of CPUs. With 1 worker,
+        everything runs in the calling process.
+
+    Returns
+    -------
+    dict[str, np.ndarray]
+        Columns of COLUMNS, with one row per hand type and configuration.
+        frequency_signature holds tuples and count holds exact Python integers.
+    """
+    values, suits = list(values), list(suits)
+    tasks = [(values, suits, size, bool(rf), bool(da)) for size, rf, da in product(sizes, royal_flush, dual_ace)]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        results = list(map(_sweep_task, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            results = list(pool.map(_sweep_task, tasks))
+    if not results:
+        return {column: np.empty(0) for column in COLUMNS}
+    return {column: np.concatenate([result[column] for result in results]) for column in COLUMNS}
@@ -0,0 +1,230 @@
+"""Scores hands from files or pipes, in chunks. Requires numpy.
+
+Run it with python -m src.pipeline, or the poker-pipeline script. Hands are read
+in chunks of a fixed number of hands, evaluated with evaluate_batch in a pool of
+worker processes and written in their input order. Only a bounded number of
+chunks is in flight at any time, so reading waits for writing and memory use
+does not grow with the input size.
+
+Hands are given as card codes, value * suits + suit, in one of three formats:
+
+csv
+    One hand per line, with its codes separated by commas. Output lines are
+    score, category and the sorted card values, separated by commas.
+    Scores are exact integers, also when they do not fit in 64 bits.
+ndjson
+    One hand per line, as a JSON array of codes or an object {"hand": [...]}.
+    Output lines are {"score": ..., "category": ..., "sorted_values": [...]}.
+binary
+    Consecutive hands, with size little-endian uint16 codes each. Output records
+    are one little-endian int64 score, one little-endian int32 category and size
+    little-endian int16 sorted card values.
+
+The category of a hand is its hand rank.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, Iterator, Optional
+
+import numpy as np
+from .batch_evaluator import evaluate_batch
+from .batch_scores import exact_score_batch, fits_int64
+from .deck_config import DeckConfig
+
+FORMATS = ("csv", "ndjson", "binary")
+
+
+def _record_dtype(size: int) -> np.dtype:
+    return np.dtype([("score", "<i8"), ("category", "<i4"), ("sorted_values", "<i2", (size, ))])
+
+
+def read_chunks(stream: IO, input_format: str, size: int, chunk_size: int = 65536) -> Iterator[np.ndarray]:
+    """Hands of a stream, in arrays of card codes with shape (chunk_size, size).
+    The last chunk may be shorter. Binary streams must be opened in binary mode.
+    """
+    if input_format == "binary":
+        record = 2 * size
+        while data := stream.read(record * chunk_size):
+            if len(data) % record:
+                raise ValueError("binary input ends with an incomplete hand")
+            yield np.frombuffer(data, dtype="<u2").astype(np.int64).reshape(-1, size)
+        return
+
+    rows = []
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        if input_format == "csv":
+            row = [int(code) for code in line.split(",")]
+        else:
+            row = json.loads(line)
+            if isinstance(row, dict):
+                row = row["hand"]
+        if len(row) != size:
+            raise ValueError(f"line {number}: expected {size} cards, got {len(row)}")
+        rows.append(row)
+        if len(rows) == chunk_size:
+            yield np.array(rows, dtype=np.int64)
+            rows = []
+    if rows:
+        yield np.array(rows, dtype=np.int64)
+
+
+def write_chunk(stream: IO, output_format: str, scores: np.ndarray, categories: np.ndarray,
+                sorted_values: np.ndarray) -> None:
+    """Writes the results of a chunk of hands. Binary streams must be opened in binary mode.
+    """
+    if output_format == "binary":
+        records = np.empty(len(scores), dtype=_record_dtype(sorted_values.shape[1]))
+        records["score"], records["category"], records["sorted_values"] = scores, categories, sorted_values
+        stream.write(records.tobytes())
+    elif output_format == "csv":
+        stream.write("".join(f"{score},{category},{','.join(map(str, values))}\n" for score, category, values
+                             in zip(scores.tolist(), categories.tolist(), sorted_values.tolist())))
+    else:
+        stream.write("".join(json.dumps({"score": score, "category": category, "sorted_values": values}) + "\n"
+                             for score, category, values
+                             in zip(scores.tolist(), categories.tolist(), sorted_values.tolist())))
+
+
+def _evaluate_chunk(task: tuple) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    hands, config, ranking, exact = task
+    result = evaluate_batch(hands, config.values, config.suits, config.ace_value, config.royal_flush,
+                            config.dual_ace, config.replace_value, config.alt_ace_value, ranking)
+    scores = result["score"] if exact else exact_score_batch(result["sorted_values"], result["hand_rank"],
+                                                             config.ace_value)
+    return scores, result["hand_rank"], result["sorted_values"]
+
+
+def run_pipeline(source: IO, sink: IO,
+                 config: DeckConfig = DeckConfig(),
+                 input_format: str = "csv",
+                 output_format: str = "csv",
+                 chunk_size: int = 65536,
+                 workers: int = 1) -> dict:
+    """Scores every hand of a stream and writes the results to another stream.
+
+    Parameters
+    ----------
+    source : IO
+        Input stream, in binary mode for the binary format and in text mode otherwise.
+    sink : IO
+        Output stream, in binary mode for the binary format and in text mode otherwise.
+    config : DeckConfig, default DeckConfig()
+        Game configuration.
+    input_format : str, default "csv"
+        One of FORMATS.
+    output_format : str, default "csv"
+        One of FORMATS. The binary format requires scores that fit in 64 bits.
+    chunk_size : int, default 65536
+        Number of hands evaluated at once.
+    workers : int, default 1
+        Number of worker processes. With 1 worker, everything runs in the calling process.
+
+    Returns
+    -------
+    dict
+        Number of hands and chunks, seconds elapsed and hands per second.
+
+    Raises
+    ------
+    ValueError
+        On malformed input, and on card codes outside the deck or repeated in a hand.
+    """
+    ranking, _ = config.ranking()
+    exact = fits_int64(config.ace_value, config.size, max(ranking.values()))
+    if output_format == "binary" and not exact:
+        raise ValueError("scores of this configuration do not fit in 64 bits")
+    lowest_code = config.lowest_value * config.suits
+    highest_code = (config.ace_value + 1) * config.suits
+
+    def tasks():
+        for hands in read_chunks(source, input_format, config.size, chunk_size):
+            if hands.size and (hands.min() < lowest_code or hands.max() >= highest_code):
+                raise ValueError("card codes outside the deck")
+            ordered = np.sort(hands, axis=1)
+            if (ordered[:, 1:] == ordered[:, :-1]).any():
+                raise ValueError("repeated cards in a hand")
+            yield hands, config, ranking, exact
+
+    stats = {"hands": 0, "chunks": 0}
+    start = time.perf_counter()
+
+    def write(result):
+        scores, categories, sorted_values = result
+        write_chunk(sink, output_format, scores, categories, sorted_values)
+        stats["hands"] += len(scores)
+        stats["chunks"] += 1
+
+    if workers == 1:
+        for task in tasks():
+            write(_evaluate_chunk(task))
+    else:
+        # at most two chunks per worker wait for writing, so a slow sink stops the reading
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for task in tasks():
+                if len(pending) == 2 * workers:
+                    write(pending.popleft().result())
+                pending.append(pool.submit(_evaluate_chunk, task))
+            while pending:
+                write(pending.popleft().result())
+    sink.flush()
+
+    stats["seconds"] = time.perf_counter() - start
+    stats["per_second"] = stats["hands"] / stats["seconds"] if stats["seconds"] else 0.0
+    return stats
+
+
+def _open(path: str, mode: str, binary: bool) -> IO:
+    if path == "-":
+        stream = sys.stdin if mode == "r" else sys.stdout
+        return stream.buffer if binary else stream
+    return open(path, mode + "b" if binary else mode)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Scores hands from a file or a pipe.")
+    parser.add_argument("input", nargs="?", default="-", help="input file, - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="output file, - for stdout")
+    parser.add_argument("--values", type=int, default=13, help="number of cards per suit")
+    parser.add_argument("--suits", type=int, default=4, help="number of suits in the deck")
+    parser.add_argument("--size", type=int, default=5, help="hand size")
+    parser.add_argument("--ace-value", type=int, default=None, help="value of the aces, values + 1 by default")
+    parser.add_argument("--alt-ace-value", type=int, default=1, help="value of the aces in wheels")
+    parser.add_argument("--no-royal-flush", action="store_true", help="royal flushes are straight flushes")
+    parser.add_argument("--no-dual-ace", action="store_true", help="wheels are not straights")
+    parser.add_argument("--input-format", choices=FORMATS, default="csv")
+    parser.add_argument("--output-format", choices=FORMATS, default=None, help="input format by default")
+    parser.add_argument("--chunk-size", type=int, default=65536, help="number of hands per chunk")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="number of worker processes")
+    parser.add_argument("--quiet", action="store_true", help="do not report the throughput")
+    args = parser.parse_args(argv)
+
+    config = DeckConfig(args.values, args.suits, args.size, not args.no_royal_flush, not args.no_dual_ace,
+                        args.ace_value, args.alt_ace_value)
+    output_format = args.output_format or args.input_format
+    source = _open(args.input, "r", args.input_format == "binary")
+    sink = _open(args.output, "w", output_format == "binary")
+    try:
+        stats = run_pipeline(source, sink, config, args.input_format, output_format, args.chunk_size, args.workers)
+    except ValueError as error:
+        parser.exit(1, f"error: {error}\n")
+    finally:
+        for stream in (source, sink):
+            if stream not in (sys.stdin, sys.stdout, sys.stdin.buffer, sys.stdout.buffer):
+                stream.close()
+    if not args.quiet:
+        print(f"{stats['hands']} hands in {stats['chunks']} chunks, {stats['seconds']:.3f} s, "
+              f"{stats['per_second']:.0f} hands/s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
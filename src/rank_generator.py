@@ -1,8 +1,22 @@
 """Rankings for classifying hand types in a card game.
 """
 
-from .combinatorial_utils import integer_partitions, n_choose_k, factorial
-from collections import Counter
+import json
+import os
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from typing import Optional
+from math import exp, log
+from .combinatorial_utils import iter_integer_partitions, n_choose_k, factorial, falling_factorial, \
+    log_falling_factorial, log_factorial, log_n_choose_k
+from .file_utils import atomic_write
+
+CACHE_VERSION = 3
+CACHE_SIZE = 128
+
+_memory_cache = OrderedDict()
+_cache_dir = os.environ.get("POKER_RANKING_CACHE_DIR")
+_cache_stats = {"hits": 0, "misses": 0, "disk_hits": 0, "disk_writes": 0}
 
 
 def royal_flushes(values: int, suits: int, size: int, royal_flush: bool = True) -> int:
@@ -156,18 +170,36 @@ def repeated_value_hands(values: int, suits: int, frequency_signature: tuple) ->
         Total number of possible straight hands.
     """
     frequencies = Counter(frequency_signature)
-    num = 1
-    for f in frequency_signature:
-        num *= n_choose_k(suits, f)
-    den = factorial(values - len(frequency_signature))
+    num = falling_factorial(values, len(frequency_signature))
+    for f, ff in frequencies.items():
+        num *= n_choose_k(suits, f) ** ff
+    den = 1
     for ff in frequencies.values():
         den *= factorial(ff)
-    return factorial(values) * num // den
+    return num // den
 
 
-def generate_ranking(values: int, suits: int, size: int,
-                     royal_flush: bool = True, dual_ace: bool = True) -> tuple[dict[tuple, int], dict[tuple, int]]:
-    """.
+def log_repeated_value_hands(values: int, suits: int, frequency_signature: tuple) -> float:
+    """Natural logarithm of repeated_value_hands, computed in floating point without big integers.
+    """
+    frequencies = Counter(frequency_signature)
+    result = log_falling_factorial(values, len(frequency_signature))
+    for f, ff in frequencies.items():
+        result += ff * log_n_choose_k(suits, f) - log_factorial(ff)
+    return result
+
+
+@lru_cache(maxsize=32)
+def partition_order(size: int) -> tuple[tuple[int, ...], ...]:
+    """Partitions of size in the order used to rank hand types with equal counts:
+    ascending lexicographic order, so the type with the larger groups of values gets the higher rank.
+    """
+    return tuple(sorted(iter_integer_partitions(size)))
+
+
+def compute_ranking(values: int, suits: int, size: int,
+                    royal_flush: bool = True, dual_ace: bool = True) -> tuple[dict[tuple, int], dict[tuple, int]]:
+    """Ranking of hand types from their counts, without caching.
 
     Parameters
     ----------
@@ -189,13 +221,15 @@ def generate_ranking(values: int, suits: int, size: int,
     Returns
     -------
     ranking dict[tuple, int]
-        Total number of possible straight hands.
+        Rank of every hand type, from 0 for the most common one.
+        Keys are (frequency_signature, is_straight, is_flush, is_royal_flush).
     counts dict[tuple, int]
+        Total number of possible hands of every hand type.
     """
 
     # Valid hands
     counts = {(hand, False, False, False): repeated_value_hands(values, suits, hand)
-              for hand in integer_partitions(size) if max(hand) <= suits and len(hand) <= values}
+              for hand in iter_integer_partitions(size, max_part=suits, max_parts=values)}
 
     rf = royal_flushes(values, suits, size, royal_flush)
     sf = straight_flushes(values, suits, size, royal_flush, dual_ace)
@@ -209,8 +243,176 @@ def generate_ranking(values: int, suits: int, size: int,
         counts[tup, False, False, False] -= sf + fh + sh + rf
     if royal_flush:
         counts[tup, True, True, True] = rf
-    # Ordering from the most common to the rarest
-    hands = sorted(counts.keys(), key=lambda k: counts[k], reverse=True)
+    # Ordering from the most common to the rarest. Among equal counts, hand types
+    # follow partition_order, and special hands come last in the order above
+    hands = sorted(counts.keys(), key=lambda k: (-counts[k], any(k[1:]), k[0]))
     ranking = {hands[i]: i for i in range(len(counts)) if not hands[i] == 0}
     # Return rank dictionary and counts
     return ranking, counts
+
+
+def hand_probabilities(values: int, suits: int, size: int,
+                       royal_flush: bool = True, dual_ace: bool = True) -> dict[tuple, float]:
+    """Approximate probability of every hand type, in floating point. Counts of repeated
+    values are computed in log space, avoiding the big integers of compute_ranking.
+
+    Parameters
+    ----------
+    values : int
+        Number of cards per suit.
+
+    suits : int
+        Number of suits in the deck.
+
+    size : int
+        Hand size used.
+
+    royal_flush : bool, default True
+        Treats royal flush separately from straight flush.
+
+    dual_ace : bool, default True
+        Allow aces to form wheel straights.
+
+    Returns
+    -------
+    dict[tuple, float]
+        Probability of every hand type, with the keys of compute_ranking.
+    """
+    log_total = log_n_choose_k(values * suits, size)
+    probabilities = {(hand, False, False, False): exp(log_repeated_value_hands(values, suits, hand) - log_total)
+                     for hand in iter_integer_partitions(size, max_part=suits, max_parts=values)}
+
+    def probability(count: int) -> float:
+        return exp(log(count) - log_total) if count > 0 else 0.0
+
+    rf = royal_flushes(values, suits, size, royal_flush)
+    sf = straight_flushes(values, suits, size, royal_flush, dual_ace)
+    fh = flush_hands(values, suits, size, royal_flush, dual_ace)
+    sh = straight_hands(values, suits, size, royal_flush, dual_ace)
+    tup = tuple(size * [1])
+    probabilities[tup, True, True, False] = probability(sf)
+    probabilities[tup, False, True, False] = probability(fh)
+    probabilities[tup, True, False, False] = probability(sh)
+    if values > size:
+        probabilities[tup, False, False, False] -= probability(sf + fh + sh + rf)
+    if royal_flush:
+        probabilities[tup, True, True, True] = probability(rf)
+    return probabilities
+
+
+def set_cache_dir(path: Optional[str]) -> None:
+    """Directory for the on-disk ranking cache. None disables it.
+    Defaults to the POKER_RANKING_CACHE_DIR environment variable.
+    """
+    global _cache_dir
+    _cache_dir = path
+
+
+def cache_info() -> dict[str, int]:
+    """Counters of the ranking cache.
+
+    Returns
+    -------
+    dict[str, int]
+        hits and misses of the in-memory cache, rankings loaded from disk (disk_hits),
+        rankings written to disk (disk_writes) and current in-memory size (size).
+    """
+    return dict(_cache_stats, size=len(_memory_cache))
+
+
+def clear_cache() -> None:
+    """Empties the in-memory ranking cache and resets its counters.
+    Files in the cache directory are kept.
+    """
+    _memory_cache.clear()
+    for key in _cache_stats:
+        _cache_stats[key] = 0
+
+
+def _cache_path(key: tuple) -> str:
+    values, suits, size, royal_flush, dual_ace = key
+    name = f"ranking-v{CACHE_VERSION}-{values}-{suits}-{size}-{int(royal_flush)}{int(dual_ace)}.json"
+    return os.path.join(_cache_dir, name)
+
+
+def _load(path: str) -> Optional[tuple[dict[tuple, int], dict[tuple, int]]]:
+    """Ranking and counts of a cache file. None when the file is missing, unreadable,
+    malformed or from another CACHE_VERSION.
+    """
+    try:
+        with open(path) as file:
+            data = json.load(file)
+        if data.get("version") != CACHE_VERSION:
+            return None
+        ranking, counts = {}, {}
+        for frequencies, is_straight, is_flush, is_royal_flush, rank, count in data["hands"]:
+            hand = (tuple(frequencies), is_straight, is_flush, is_royal_flush)
+            ranking[hand], counts[hand] = rank, count
+    except (OSError, ValueError, AttributeError, KeyError, TypeError):
+        return None
+    return ranking, counts
+
+
+def _store(path: str, ranking: dict[tuple, int], counts: dict[tuple, int]) -> bool:
+    """Writes a cache file, atomically. Returns False when it cannot be written.
+    """
+    hands = [[list(hand[0]), *hand[1:], ranking[hand], count] for hand, count in counts.items()]
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        atomic_write(path, json.dumps({"version": CACHE_VERSION, "hands": hands}))
+    except OSError:
+        return False
+    return True
+
+
+def generate_ranking(values: int, suits: int, size: int,
+                     royal_flush: bool = True, dual_ace: bool = True) -> tuple[dict[tuple, int], dict[tuple, int]]:
+    """Ranking of hand types from their counts.
+    Results are kept in an LRU cache of CACHE_SIZE configurations and,
+    when a cache directory is set, in versioned JSON files.
+
+    Parameters
+    ----------
+    values : int
+        Number of cards per suit.
+
+    suits : int
+        Number of suits in the deck.
+
+    size : int
+        Hand size used.
+
+    royal_flush : bool, default True
+        Treats royal flush separately from straight flush.
+
+    dual_ace : bool, default True
+        Allow aces to form wheel straights.
+
+    Returns
+    -------
+    ranking dict[tuple, int]
+        Rank of every hand type, from 0 for the most common one.
+        Keys are (frequency_signature, is_straight, is_flush, is_royal_flush).
+    counts dict[tuple, int]
+        Total number of possible hands of every hand type.
+    """
+    key = (values, suits, size, bool(royal_flush), bool(dual_ace))
+    if key in _memory_cache:
+        _cache_stats["hits"] += 1
+        _memory_cache.move_to_end(key)
+    else:
+        _cache_stats["misses"] += 1
+        result = None
+        if _cache_dir is not None:
+            result = _load(_cache_path(key))
+            if result is not None:
+                _cache_stats["disk_hits"] += 1
+        if result is None:
+            result = compute_ranking(*key)
+            if _cache_dir is not None and _store(_cache_path(key), *result):
+                _cache_stats["disk_writes"] += 1
+        _memory_cache[key] = result
+        if len(_memory_cache) > CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+    ranking, counts = _memory_cache[key]
+    return dict(ranking), dict(counts)
@@ -0,0 +1,128 @@
+"""Percentile of every hand score: the fraction of all the hands of a configuration
+with a lower score.
+
+Hands with the same card values and the same flush status share their score, so
+the number of hands of every score is counted from the value multisets, as the
+product of the ways of picking suits for every value, without dealing the hands.
+Scores of the value multisets are those of the tables of build_lookup_tables.
+"""
+
+import json
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from itertools import accumulate, combinations_with_replacement
+from math import comb
+from typing import Optional
+
+from .deck_config import DeckConfig
+from .file_utils import atomic_write
+from .lookup_tables import _binomials, build_lookup_tables, multiset_index
+
+
+def score_counts(config: DeckConfig = DeckConfig(),
+                 ranking: Optional[dict[tuple, int]] = None) -> dict[int, int]:
+    """Number of hands of every score of a configuration.
+
+    Parameters
+    ----------
+    config : DeckConfig, default DeckConfig()
+        Game configuration.
+    ranking : dict[tuple, int], optional
+        Ranking for the configuration. Computed when missing.
+
+    Returns
+    -------
+    dict[int, int]
+        Number of hands with every possible score.
+    """
+    if ranking is None:
+        ranking, _ = config.ranking()
+    flush_table, non_flush_table = build_lookup_tables(
+        config.values, config.suits, config.size, config.royal_flush, config.dual_ace,
+        config.ace_value, config.alt_ace_value, config.replace_value, ranking)
+
+    # distinct values: every suit gives a flush, any other choice of suits does not
+    counts = Counter()
+    for score in flush_table:
+        counts[score] += config.suits
+    binomials = _binomials(config.values, config.size)
+    for ranks in combinations_with_replacement(range(config.values), config.size):
+        score = non_flush_table[multiset_index(list(ranks), binomials)]
+        if not score:
+            continue
+        copies = Counter(ranks)
+        if len(copies) == config.size:
+            counts[score] += config.suits ** config.size - config.suits
+        else:
+            number = 1
+            for copy in copies.values():
+                number *= comb(config.suits, copy)
+            counts[score] += number
+    return dict(counts)
+
+
+class PercentileTable:
+    """Sorted scores of a configuration with the cumulative number of hands below each one.
+    Lookups take O(log n) time, by binary search.
+
+    Parameters
+    ----------
+    scores : list[int]
+        Distinct scores, in ascending order.
+    counts : list[int]
+        Number of hands with each score.
+    """
+
+    __slots__ = ('scores', 'counts', 'below', 'total')
+
+    def __init__(self, scores: list[int], counts: list[int]):
+        self.scores = list(scores)
+        self.counts = list(counts)
+        self.below = [0] + list(accumulate(self.counts))
+        self.total = self.below[-1]
+
+    def hands_below(self, score: int) -> tuple[int, int]:
+        """Number of hands with a lower score and number of hands with the same score.
+        """
+        lo, hi = bisect_left(self.scores, score), bisect_right(self.scores, score)
+        return self.below[lo], self.below[hi] - self.below[lo]
+
+    def percentile(self, score: int) -> float:
+        """Fraction of all the hands beaten by a hand with the given score.
+        """
+        return self.below[bisect_left(self.scores, score)] / self.total
+
+    def percentiles(self, scores):
+        """Fractions of all the hands beaten by many scores at once, as a float64 array
+        with the shape of scores. Requires numpy.
+        """
+        import numpy as np
+        scores = np.asarray(scores)
+        if self.scores[-1] < 2 ** 63 and np.issubdtype(scores.dtype, np.integer):
+            table = np.array(self.scores, dtype=np.int64)
+        else:
+            table = np.array(self.scores, dtype=object)
+        fractions = np.array(self.below, dtype=object) / self.total
+        return fractions.astype(np.float64)[np.searchsorted(table, scores, side="left")]
+
+    def save(self, path: str) -> None:
+        """Writes the table as JSON, atomically.
+        """
+        atomic_write(path, json.dumps({"scores": self.scores, "counts": self.counts}))
+
+
+def load_percentile_table(path: str) -> PercentileTable:
+    """Reads a table written by PercentileTable.save.
+    """
+    with open(path) as file:
+        data = json.load(file)
+    return PercentileTable(data["scores"], data["counts"])
+
+
+def build_percentile_table(config: DeckConfig = DeckConfig(),
+                           ranking: Optional[dict[tuple, int]] = None) -> PercentileTable:
+    """Percentile table of every score of a configuration, from score_counts.
+    """
+    counts = score_counts(config, ranking)
+    scores = sorted(counts)
+    return PercentileTable(scores, [counts[score] for score in scores])
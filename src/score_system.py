@@ -2,6 +2,7 @@
 designed for flexible and consistent hand rankings.
 """
 
+from functools import lru_cache
 from math import log
 
 
@@ -29,12 +30,11 @@ def hand_score(card_values: list[int], hand_rank: int, ace_value: int) -> int:
     score : int
         The computed score of the hand.
     """
-    score = 0
     base = ace_value + 1
-    exponent = len(card_values) + hand_rank - 1
-    for k in range(len(card_values)):
-        score += card_values[k] * (base ** (exponent - k))
-    return score
+    kicker = 0
+    for value in card_values:
+        kicker = kicker * base + value
+    return kicker * base ** hand_rank
 
 
 def log_score(card_values: list[int], hand_rank: int, ace_value: int) -> float:
@@ -61,9 +61,100 @@ def log_score(card_values: list[int], hand_rank: int, ace_value: int) -> float:
     score : float
         The computed positive alternative score of the hand.
     """
-    score = 0
+    return log(hand_score(card_values, hand_rank, ace_value), ace_value + 1)
+
+
+@lru_cache(maxsize=None)
+def power_table(ace_value: int, size: int, max_rank: int) -> tuple[int, ...]:
+    """Powers of the base (ace_value + 1) used by the scores of a configuration.
+
+    Parameters
+    ----------
+    ace_value : int
+        Numerical value of aces: the most valuated cards in the game.
+
+    size : int
+        Hand size used.
+
+    max_rank : int
+        Highest hand rank of the configuration.
+
+    Returns
+    -------
+    tuple[int, ...]
+        base ** e for e from 0 to size + max_rank - 1.
+    """
     base = ace_value + 1
-    exponent = len(card_values) + hand_rank - 1
-    for k in range(len(card_values)):
-        score += card_values[k] * (base ** (exponent - k))
-    return log(score, base)
+    return tuple(base ** e for e in range(size + max_rank))
+
+
+class ScoreEngine:
+    """Scores of a fixed configuration, with precomputed powers.
+
+    Besides hand_score, hands get a packed score: the hand rank in the high bits and
+    the card values, as a number in base (ace_value + 1), in the low bits.
+    Packed scores order hands exactly as hand_score does, and when packable is True
+    they fit in 64 bits, so they can be stored in numpy uint64 arrays.
+
+    Parameters
+    ----------
+    ace_value : int
+        Numerical value of aces: the most valuated cards in the game.
+
+    size : int
+        Hand size used.
+
+    max_rank : int
+        Highest hand rank of the configuration.
+    """
+
+    __slots__ = ('ace_value', 'size', 'max_rank', 'base', 'rank_powers', 'kicker_bits', 'packable')
+
+    def __init__(self, ace_value: int, size: int, max_rank: int):
+        self.ace_value = ace_value
+        self.size = size
+        self.max_rank = max_rank
+        self.base = ace_value + 1
+        self.rank_powers = power_table(ace_value, size, max_rank)[:max_rank + 1]
+        self.kicker_bits = (self.base ** size - 1).bit_length()
+        self.packable = self.kicker_bits + max_rank.bit_length() <= 64
+
+    def kicker(self, card_values: list[int]) -> int:
+        """Card values as a number in base (ace_value + 1), using Horner's rule.
+        """
+        base, kicker = self.base, 0
+        for value in card_values:
+            kicker = kicker * base + value
+        return kicker
+
+    def score(self, card_values: list[int], hand_rank: int) -> int:
+        """Same result as hand_score(card_values, hand_rank, ace_value).
+        """
+        return self.kicker(card_values) * self.rank_powers[hand_rank]
+
+    def packed_score(self, card_values: list[int], hand_rank: int) -> int:
+        """Hand rank and card values packed in a single integer.
+        """
+        return (hand_rank << self.kicker_bits) | self.kicker(card_values)
+
+    def unpack(self, packed: int) -> tuple[int, int]:
+        """Hand rank and kicker value of a packed score.
+        """
+        return packed >> self.kicker_bits, packed & ((1 << self.kicker_bits) - 1)
+
+    def to_hand_score(self, packed: int) -> int:
+        """hand_score of a packed score.
+        """
+        hand_rank, kicker = self.unpack(packed)
+        return kicker * self.rank_powers[hand_rank]
+
+    def pack_hand_score(self, score: int) -> int:
+        """Packed score of a hand_score result. Inverse of to_hand_score, and 0 for a zero score.
+        """
+        if not score:
+            return 0
+        hand_rank, base = 0, self.base
+        while score % base == 0:
+            score //= base
+            hand_rank += 1
+        return (hand_rank << self.kicker_bits) | score
@@ -0,0 +1,279 @@
+"""Long-lived hand evaluation server. Requires numpy.
+
+Run it with python -m src.serve. The ranking of the configuration is loaded once,
+and concurrent requests are coalesced into a single evaluate_batch call.
+
+Two protocols are available, over TCP or Unix sockets:
+
+ndjson
+    Every request is a line with a JSON object {"hands": [[code, ...], ...]}, where
+    codes are value * suits + suit. The response is a line
+    {"scores": [...], "categories": [...]}, with the exact integer score and the hand
+    rank of every hand as its category. The request {"stats": true} returns the batch
+    latency percentiles. Lines longer than the server limit get an error response,
+    and close the connection.
+binary
+    Every request is a little-endian uint32 with the number of hands, at most
+    max_batch, followed by the codes as little-endian uint16, size codes per hand.
+    The response is the little-endian uint32 number of hands, followed by one
+    int64 score and one little-endian int32 category per hand.
+"""
+
+import argparse
+import asyncio
+import json
+import struct
+import time
+from collections import deque
+from typing import Optional
+
+import numpy as np
+from .batch_evaluator import evaluate_batch
+from .batch_scores import exact_score_batch, fits_int64
+from .deck_config import DeckConfig
+
+
+class HandService:
+    """Evaluates hands for many concurrent clients, in coalesced batches.
+
+    Parameters
+    ----------
+    config : DeckConfig
+        Game configuration.
+    max_batch : int, default 65536
+        Largest number of hands in a batch, and in a binary request.
+    max_delay : float, default 0.002
+        Seconds a request waits for other requests to join its batch.
+    """
+
+    def __init__(self, config: DeckConfig, max_batch: int = 65536, max_delay: float = 0.002):
+        self.config = config
+        self.ranking, _ = config.ranking()
+        self.exact = fits_int64(config.ace_value, config.size, max(self.ranking.values()))
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.latencies = deque(maxlen=10000)
+        self.batches, self.hands = 0, 0
+        self.queue = None
+
+    def check(self, hands: np.ndarray) -> None:
+        """Raises ValueError unless hands is a valid (N, size) array of card codes.
+        """
+        config = self.config
+        if hands.ndim != 2 or hands.shape[1] != config.size:
+            raise ValueError(f"hands must have {config.size} cards")
+        if hands.size and (hands.min() < config.lowest_value * config.suits or
+                           hands.max() >= (config.ace_value + 1) * config.suits):
+            raise ValueError("card code out of the deck")
+        if config.size > 1 and (np.diff(np.sort(hands, axis=1), axis=1) == 0).any():
+            raise ValueError("repeated card in a hand")
+
+    async def evaluate(self, hands: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Scores and categories of the hands, evaluated together with other pending requests.
+        Scores are int64 when they fit in 64 bits, and Python integers in an object array otherwise.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((hands, future, time.perf_counter()))
+        return await future
+
+    async def run(self, ready: Optional[asyncio.Event] = None) -> None:
+        """Batching loop. Runs until cancelled. Sets ready, when given, once requests can be queued.
+        """
+        loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+        if ready is not None:
+            ready.set()
+        while True:
+            pending = [await self.queue.get()]
+            count = len(pending[0][0])
+            deadline = loop.time() + self.max_delay
+            while count < self.max_batch:
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), max(deadline - loop.time(), 0))
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                count += len(item[0])
+
+            hands = np.concatenate([item[0] for item in pending])
+            try:
+                scores, categories = await loop.run_in_executor(None, self._evaluate, hands)
+            except Exception as error:
+                for _, future, _ in pending:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+            done = time.perf_counter()
+            self.latencies.append(done - min(item[2] for item in pending))
+            self.batches += 1
+            self.hands += count
+            start = 0
+            for item_hands, future, _ in pending:
+                stop = start + len(item_hands)
+                if not future.done():
+                    future.set_result((scores[start:stop], categories[start:stop]))
+                start = stop
+
+    def _evaluate(self, hands: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        config = self.config
+        result = evaluate_batch(hands, config.values, config.suits, config.ace_value, config.royal_flush,
+                                config.dual_ace, config.replace_value, config.alt_ace_value, self.ranking)
+        if self.exact:
+            return result['score'], result['hand_rank']
+        return exact_score_batch(result['sorted_values'], result['hand_rank'], config.ace_value), result['hand_rank']
+
+    def stats(self) -> dict:
+        """Number of batches and hands evaluated, and percentiles of the batch latencies in seconds.
+        Latency goes from the arrival of the oldest request of a batch to the end of its evaluation.
+        """
+        stats = {"batches": self.batches, "hands": self.hands}
+        if self.latencies:
+            latencies = np.array(self.latencies)
+            for q in (50, 90, 99):
+                stats[f"p{q}"] = float(np.percentile(latencies, q))
+            stats["max"] = float(latencies.max())
+        return stats
+
+    async def handle_ndjson(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serves a newline-delimited JSON connection. A line over the stream limit
+        gets an error response and closes it.
+        """
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    writer.write(json.dumps({"error": "request line too long"}).encode() + b"\n")
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if request.get("stats"):
+                        response = self.stats()
+                    else:
+                        hands = np.array(request["hands"], dtype=np.int64).reshape(-1, self.config.size)
+                        self.check(hands)
+                        scores, categories = await self.evaluate(hands)
+                        response = {"scores": scores.tolist(), "categories": categories.tolist()}
+                except (ValueError, KeyError, TypeError, AttributeError) as error:
+                    response = {"error": str(error)}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def handle_binary(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serves a length-prefixed binary connection. Invalid, truncated and
+        larger than max_batch requests close it.
+        """
+        size = self.config.size
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(4)
+                except asyncio.IncompleteReadError:
+                    break
+                n, = struct.unpack("<I", header)
+                if n > self.max_batch:
+                    break
+                try:
+                    body = await reader.readexactly(2 * n * size)
+                except asyncio.IncompleteReadError:
+                    break
+                hands = np.frombuffer(body, dtype="<u2").astype(np.int64).reshape(n, size)
+                try:
+                    self.check(hands)
+                except ValueError:
+                    break
+                scores, categories = await self.evaluate(hands)
+                records = np.empty(n, dtype=[("score", "<i8"), ("category", "<i4")])
+                records["score"], records["category"] = scores, categories
+                writer.write(struct.pack("<I", n) + records.tobytes())
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+async def start_server(service: HandService, protocol: str = "ndjson", host: Optional[str] = None,
+                       port: Optional[int] = None, path: Optional[str] = None,
+                       limit: int = 2 ** 24) -> tuple[asyncio.AbstractServer, asyncio.Future]:
+    """Starts the batching loop of the service and a socket server for it.
+    Listens on the Unix socket path when given, and on host and port otherwise.
+    limit is the longest ndjson request line, in bytes.
+    Returns the server and the batching loop task, to be cancelled after closing the server.
+    """
+    config = service.config
+    if protocol == "binary" and not fits_int64(config.ace_value, config.size, max(service.ranking.values())):
+        raise ValueError("scores of this configuration do not fit in 64 bits, use the ndjson protocol")
+    handler = service.handle_binary if protocol == "binary" else service.handle_ndjson
+    ready = asyncio.Event()
+    batching = asyncio.ensure_future(service.run(ready))
+    await ready.wait()
+    if path is not None:
+        server = await asyncio.start_unix_server(handler, path=path, limit=limit)
+    else:
+        server = await asyncio.start_server(handler, host=host, port=port, limit=limit)
+    return server, batching
+
+
+async def request_ndjson(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, request: dict) -> dict:
+    """Sends one request to an ndjson server and returns its response.
+    """
+    writer.write(json.dumps(request).encode() + b"\n")
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+async def request_binary(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                         hands: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Sends one batch of hands to a binary server and returns scores and categories.
+    """
+    hands = np.asarray(hands)
+    writer.write(struct.pack("<I", len(hands)) + hands.astype("<u2").tobytes())
+    await writer.drain()
+    n, = struct.unpack("<I", await reader.readexactly(4))
+    records = np.frombuffer(await reader.readexactly(12 * n), dtype=[("score", "<i8"), ("category", "<i4")])
+    return records["score"].astype(np.int64), records["category"].astype(np.int64)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Hand evaluation server.")
+    parser.add_argument("--values", type=int, default=13, help="number of cards per suit")
+    parser.add_argument("--suits", type=int, default=4, help="number of suits in the deck")
+    parser.add_argument("--size", type=int, default=5, help="hand size")
+    parser.add_argument("--ace-value", type=int, default=None, help="value of the aces, values + 1 by default")
+    parser.add_argument("--alt-ace-value", type=int, default=1, help="value of the aces in wheels")
+    parser.add_argument("--no-royal-flush", action="store_true", help="royal flushes are straight flushes")
+    parser.add_argument("--no-dual-ace", action="store_true", help="wheels are not straights")
+    parser.add_argument("--protocol", choices=("ndjson", "binary"), default="ndjson")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="Unix socket path, instead of TCP")
+    parser.add_argument("--max-batch", type=int, default=65536, help="largest number of hands per batch")
+    parser.add_argument("--max-delay", type=float, default=0.002, help="seconds to wait for a batch to fill")
+    parser.add_argument("--limit", type=int, default=2 ** 24, help="longest ndjson request line, in bytes")
+    args = parser.parse_args(argv)
+
+    config = DeckConfig(args.values, args.suits, args.size, not args.no_royal_flush, not args.no_dual_ace,
+                        args.ace_value, args.alt_ace_value)
+    service = HandService(config, args.max_batch, args.max_delay)
+
+    async def serve():
+        server, batching = await start_server(service, args.protocol, args.host, args.port, args.unix,
+                                              args.limit)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batching.cancel()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Comparison of hands and showdown resolution, without computing scores.
+
+Hands are compared by hand rank first, and then by their card values, sorted as
+in evaluate_hand, in lexicographic order. This is the same order as hand_score,
+which weights the card values by the power of the base given by the hand rank.
+"""
+
+from typing import Any, Optional
+
+from .best_hand_evaluator import best_hand
+from .deck_config import DeckConfig
+from .hand_evaluator import evaluate_hand
+
+
+def hand_strength(cards: list[tuple[int, Any]],
+                  config: DeckConfig = DeckConfig(),
+                  ranking: Optional[dict[tuple, int]] = None) -> tuple[tuple[int, tuple[int, ...]], tuple]:
+    """Comparison key and hand type of the best hand of config.size cards among the given cards.
+
+    Parameters
+    ----------
+    cards : list[tuple[int, Any]]
+        At least config.size cards, as (value, suit) tuples.
+    config : DeckConfig, default DeckConfig()
+        Game configuration.
+    ranking : dict[tuple, int], optional
+        Ranking for the configuration. Computed when missing.
+
+    Returns
+    -------
+    strength : tuple[int, tuple[int, ...]]
+        Hand rank and card values. Stronger hands have greater strengths.
+    category : tuple
+        Hand type: (frequency_signature, is_straight, is_flush, is_royal_flush).
+    """
+    if ranking is None:
+        ranking, _ = config.ranking()
+    if len(cards) == config.size:
+        sorted_hand, *category = evaluate_hand(cards, config.ace_value, config.royal_flush, config.dual_ace,
+                                               config.replace_value, config.alt_ace_value)
+    else:
+        sorted_hand, *category, _ = best_hand(cards, config.size, ranking, config.ace_value, config.royal_flush,
+                                              config.dual_ace, config.replace_value, config.alt_ace_value,
+                                              with_score=False)
+    category = tuple(category)
+    return (ranking[category], tuple(card[0] for card in sorted_hand)), category
+
+
+def compare(a: list[tuple[int, Any]],
+            b: list[tuple[int, Any]],
+            board: list[tuple[int, Any]] = (),
+            config: DeckConfig = DeckConfig(),
+            ranking: Optional[dict[tuple, int]] = None) -> int:
+    """Compares two hands, each one completed with the board when given.
+    Returns 1 when a wins, -1 when b wins and 0 on a tie.
+    """
+    if ranking is None:
+        ranking, _ = config.ranking()
+    strength_a, _ = hand_strength(list(a) + list(board), config, ranking)
+    strength_b, _ = hand_strength(list(b) + list(board), config, ranking)
+    return (strength_a > strength_b) - (strength_a < strength_b)
+
+
+def showdown(hands: list[list[tuple[int, Any]]],
+             board: list[tuple[int, Any]] = (),
+             config: DeckConfig = DeckConfig(),
+             ranking: Optional[dict[tuple, int]] = None) -> tuple[list[int], list[list[int]], tuple]:
+    """Winners among several hands, each one completed with the board when given.
+
+    Parameters
+    ----------
+    hands : list[list[tuple[int, Any]]]
+        Cards of every player, as (value, suit) tuples.
+    board : list[tuple[int, Any]], optional
+        Cards shared by every player.
+    config : DeckConfig, default DeckConfig()
+        Game configuration.
+    ranking : dict[tuple, int], optional
+        Ranking for the configuration. Computed when missing.
+
+    Returns
+    -------
+    winners : list[int]
+        Positions of the players splitting the pot, in ascending order.
+    groups : list[list[int]]
+        Positions of all the players, grouped by equal hands, from the strongest group
+        to the weakest one. The first group is winners, and the next ones settle side pots.
+    category : tuple
+        Hand type of the winners: (frequency_signature, is_straight, is_flush, is_royal_flush).
+    """
+    if not hands:
+        raise ValueError("a showdown needs at least one hand")
+    if ranking is None:
+        ranking, _ = config.ranking()
+    results = [hand_strength(list(cards) + list(board), config, ranking) for cards in hands]
+    order = sorted(range(len(hands)), key=lambda i: results[i][0], reverse=True)
+    groups = []
+    for i in order:
+        if groups and results[groups[-1][0]][0] == results[i][0]:
+            groups[-1].append(i)
+        else:
+            groups.append([i])
+    groups = [sorted(group) for group in groups]
+    return groups[0], groups, results[groups[0][0]][1]
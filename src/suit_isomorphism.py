@@ -0,0 +1,100 @@
+"""Canonical forms of hands under permutations of suits.
+
+Hand evaluation only compares suits with each other, so hands that differ by a
+relabelling of suits have the same type and score. The canonical form relabels
+suits in a fixed order: suits are sorted by their cards, in descending order,
+and receive config.labels in that order. It works for any number of suits.
+"""
+
+from collections import Counter
+from math import factorial
+from typing import Any, Iterator
+
+from .deck_config import DeckConfig
+from .hand_index import canonical_count, canonical_hand, subset_index
+
+
+def _suit_keys(groups: list[list[tuple[int, Any]]], config: DeckConfig) -> dict[Any, tuple]:
+    """Cards of every suit of the deck, group by group, as (number of cards, rank set index) pairs.
+    """
+    ranks = {suit: [[] for _ in groups] for suit in config.labels}
+    for g, cards in enumerate(groups):
+        for value, suit in cards:
+            ranks[suit][g].append(value - config.lowest_value)
+    return {suit: tuple((len(group), subset_index(sorted(group))) for group in rank_sets)
+            for suit, rank_sets in ranks.items()}
+
+
+def suit_permutation(groups: list[list[tuple[int, Any]]], config: DeckConfig = DeckConfig()) -> dict[Any, Any]:
+    """Relabelling of suits giving the canonical form of some groups of cards.
+
+    Parameters
+    ----------
+    groups : list[list[tuple[int, Any]]]
+        Groups of (value, suit) cards, such as hole cards and board. Groups are
+        compared in order, so the first group decides first.
+    config : DeckConfig, default DeckConfig()
+        Game configuration. Suits of the cards must be in config.labels.
+
+    Returns
+    -------
+    dict[Any, Any]
+        New label of every suit of config.labels.
+    """
+    keys = _suit_keys(groups, config)
+    order = sorted(config.labels, key=lambda suit: keys[suit], reverse=True)
+    return dict(zip(order, config.labels))
+
+
+def isomorphic_variants(groups: list[list[tuple[int, Any]]], config: DeckConfig = DeckConfig()) -> int:
+    """Number of distinct groups of cards obtained by permuting the suits of groups, groups included.
+    Suits with the same cards, empty suits among them, can be exchanged without any change.
+    """
+    variants = factorial(config.suits)
+    for multiplicity in Counter(_suit_keys(groups, config).values()).values():
+        variants //= factorial(multiplicity)
+    return variants
+
+
+def canonicalize_groups(groups: list[list[tuple[int, Any]]],
+                        config: DeckConfig = DeckConfig()) -> tuple[list[list[tuple[int, Any]]], int]:
+    """Canonical form of some groups of cards, with a common relabelling of suits.
+
+    Parameters
+    ----------
+    groups : list[list[tuple[int, Any]]]
+        Groups of (value, suit) cards, such as hole cards and board.
+    config : DeckConfig, default DeckConfig()
+        Game configuration. Suits of the cards must be in config.labels.
+
+    Returns
+    -------
+    canonical_groups : list[list[tuple[int, Any]]]
+        Relabelled groups, with cards sorted by value and then by suit as in config.labels.
+        Equal for all the groups of cards that differ by a permutation of suits.
+    variants : int
+        Number of distinct groups of cards with this canonical form.
+    """
+    permutation = suit_permutation(groups, config)
+    position = {suit: s for s, suit in enumerate(config.labels)}
+    canonical = [sorted(((value, permutation[suit]) for value, suit in cards),
+                        key=lambda card: (card[0], position[card[1]])) for cards in groups]
+    return canonical, isomorphic_variants(groups, config)
+
+
+def canonicalize(cards: list[tuple[int, Any]], config: DeckConfig = DeckConfig()) -> tuple[list[tuple[int, Any]], int]:
+    """Canonical form of a hand and its number of isomorphic variants.
+    Same as canonicalize_groups with a single group.
+    """
+    canonical, variants = canonicalize_groups([cards], config)
+    return canonical[0], variants
+
+
+def iter_canonical_hands(config: DeckConfig = DeckConfig()) -> Iterator[tuple[list[tuple[int, Any]], int]]:
+    """Every canonical hand of a configuration, with its number of isomorphic variants.
+    Variants add up to C(values * suits, size), so counts over all hands can be
+    computed from the canonical hands alone, weighting every one by its variants.
+    """
+    for index in range(canonical_count(config)):
+        cards = canonical_hand(index, config)
+        yield cards, isomorphic_variants([cards], config)
@@ -0,0 +1,223 @@
+"""Score tables of build_lookup_tables stored in a flat binary file, for memory mapping.
+
+The file is a 128 byte header followed by the flush table and the non flush table,
+as the packed scores of ScoreEngine in unsigned 64 bit fields. Packed scores fit in
+64 bits for common configurations such as 7 card hands, where hand_score does not.
+Tables are read through mmap, so opening a file takes the same time whatever its size,
+and every process mapping the same file shares its physical pages.
+
+Header fields, little-endian: magic, format version, header size, the numpy type
+string of the table fields ("<u8"), the deck configuration, the highest hand rank,
+offset and length of both tables, CRC-32 of the tables and CRC-32 of the previous
+header bytes. The header is checked every time a file is opened. The tables are
+checked against their CRC-32 on demand, since that reads them in full.
+"""
+
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from typing import Optional, Sequence
+
+from .deck_config import DeckConfig
+from .file_utils import atomic_write
+from .lookup_tables import LookupEvaluator, build_lookup_tables
+from .score_system import ScoreEngine
+
+MAGIC = b"PKRTABLE"
+FORMAT_VERSION = 2
+TABLE_TYPE = b"<u8"
+_HEADER = struct.Struct("<8sII4s8iiQQQQI")
+_HEADER_SIZE = 128
+_BYTE_ORDERS = {b"<u8": "little", b">u8": "big"}
+
+
+def _config_fields(config: DeckConfig) -> tuple:
+    return (config.values, config.suits, config.size, int(config.royal_flush), int(config.dual_ace),
+            config.ace_value, config.alt_ace_value, int(config.replace_value))
+
+
+def write_tables(path: str, config: DeckConfig = DeckConfig()) -> None:
+    """Builds the score tables of a configuration and writes them to a file, atomically.
+
+    Parameters
+    ----------
+    path : str
+        Destination file.
+    config : DeckConfig, default DeckConfig()
+        Game configuration. Suit labels are not stored.
+
+    Raises
+    ------
+    ValueError
+        When packed scores do not fit in 64 bits.
+    """
+    ranking, _ = config.ranking()
+    max_rank = max(ranking.values())
+    engine = ScoreEngine(config.ace_value, config.size, max_rank)
+    if not engine.packable:
+        raise ValueError("packed scores of this configuration do not fit in 64 bits")
+    flush_table, non_flush_table = build_lookup_tables(
+        config.values, config.suits, config.size, config.royal_flush, config.dual_ace,
+        config.ace_value, config.alt_ace_value, config.replace_value, ranking)
+    payload = struct.pack(f"<{len(flush_table)}Q", *map(engine.pack_hand_score, flush_table)) + \
+        struct.pack(f"<{len(non_flush_table)}Q", *map(engine.pack_hand_score, non_flush_table))
+    flush_offset = _HEADER_SIZE
+    non_flush_offset = flush_offset + 8 * len(flush_table)
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, _HEADER_SIZE, TABLE_TYPE, *_config_fields(config), max_rank,
+                          flush_offset, len(flush_table), non_flush_offset, len(non_flush_table),
+                          zlib.crc32(payload))
+    header += struct.pack("<I", zlib.crc32(header))
+    header = header.ljust(_HEADER_SIZE, b"\0")
+
+    atomic_write(path, header + payload)
+
+
+class HandScores:
+    """Read only sequence of the hand_score values of a table of packed scores.
+
+    Parameters
+    ----------
+    packed : Sequence[int]
+        Packed scores.
+    engine : ScoreEngine
+        Engine of the configuration of the scores.
+    """
+    __slots__ = ("packed", "_kicker_mask", "_kicker_bits", "_rank_powers")
+
+    def __init__(self, packed: Sequence[int], engine: ScoreEngine):
+        self.packed = packed
+        self._kicker_bits = engine.kicker_bits
+        self._kicker_mask = (1 << engine.kicker_bits) - 1
+        self._rank_powers = engine.rank_powers
+
+    def __len__(self) -> int:
+        return len(self.packed)
+
+    def __getitem__(self, index: int) -> int:
+        packed = self.packed[index]
+        return (packed & self._kicker_mask) * self._rank_powers[packed >> self._kicker_bits]
+
+    def tolist(self) -> list[int]:
+        """All the scores, as a list.
+        """
+        return [self[i] for i in range(len(self))]
+
+
+class MappedTables:
+    """Score tables mapped from a file written by write_tables.
+
+    Parameters
+    ----------
+    path : str
+        File to open.
+    config : DeckConfig, optional
+        Expected configuration. A ValueError is raised when the file holds another one.
+    verify : bool, default False
+        Check the CRC-32 of the tables, reading them in full.
+
+    Attributes
+    ----------
+    config : DeckConfig
+        Configuration of the tables, with default suit labels.
+    engine : ScoreEngine
+        Engine of the packed scores.
+    flush_table, non_flush_table : memoryview or array
+        Packed scores, as read only uint64 views of the mapped file. On hosts whose
+        byte order differs from the file, they are byte swapped copies instead.
+    flush_scores, non_flush_scores : HandScores
+        hand_score values of both tables.
+    """
+
+    def __init__(self, path: str, config: Optional[DeckConfig] = None, verify: bool = False):
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._open(config, verify)
+        except Exception:
+            self._map.close()
+            raise
+
+    def _open(self, config: Optional[DeckConfig], verify: bool) -> None:
+        data = self._map
+        if len(data) < _HEADER_SIZE or data[:8] != MAGIC:
+            raise ValueError("not a score table file")
+        fields = _HEADER.unpack_from(data)
+        version, header_size = fields[1], fields[2]
+        if version != FORMAT_VERSION:
+            raise ValueError(f"unsupported table format version {version}")
+        checksum, = struct.unpack_from("<I", data, _HEADER.size)
+        if zlib.crc32(data[:_HEADER.size]) != checksum:
+            raise ValueError("corrupted table header")
+        table_type = fields[3].rstrip(b"\0")
+        if table_type not in _BYTE_ORDERS:
+            raise ValueError(f"unsupported table type {table_type!r}")
+        values, suits, size, royal_flush, dual_ace, ace_value, alt_ace_value, replace_value = fields[4:12]
+        max_rank = fields[12]
+        flush_offset, flush_length, non_flush_offset, non_flush_length, self.checksum = fields[13:]
+        if header_size != flush_offset or non_flush_offset != flush_offset + 8 * flush_length or \
+                len(data) != non_flush_offset + 8 * non_flush_length:
+            raise ValueError("truncated or inconsistent table file")
+
+        self.config = DeckConfig(values, suits, size, bool(royal_flush), bool(dual_ace),
+                                 ace_value, alt_ace_value, bool(replace_value))
+        if config is not None and _config_fields(config) != _config_fields(self.config):
+            raise ValueError(f"the file holds the tables of {self.config}")
+        if verify and not self.verify():
+            raise ValueError("corrupted tables")
+
+        self.engine = ScoreEngine(ace_value, size, max_rank)
+        self.table_type = table_type.decode()
+        view = memoryview(data)
+        if _BYTE_ORDERS[table_type] == sys.byteorder:
+            self.flush_table = view[flush_offset:non_flush_offset].cast("Q")
+            self.non_flush_table = view[non_flush_offset:].cast("Q")
+        else:
+            self.flush_table, self.non_flush_table = array("Q"), array("Q")
+            self.flush_table.frombytes(view[flush_offset:non_flush_offset])
+            self.non_flush_table.frombytes(view[non_flush_offset:])
+            self.flush_table.byteswap()
+            self.non_flush_table.byteswap()
+        view.release()
+        self.flush_scores = HandScores(self.flush_table, self.engine)
+        self.non_flush_scores = HandScores(self.non_flush_table, self.engine)
+
+    def verify(self) -> bool:
+        """Check the tables against the CRC-32 stored in the header.
+        """
+        return zlib.crc32(memoryview(self._map)[_HEADER_SIZE:]) == self.checksum
+
+    def arrays(self) -> tuple:
+        """Packed score tables as read only numpy arrays sharing the mapped memory. Requires numpy.
+        """
+        import numpy as np
+        return (np.frombuffer(self._map, dtype=self.table_type, count=len(self.flush_table), offset=_HEADER_SIZE),
+                np.frombuffer(self._map, dtype=self.table_type, offset=_HEADER_SIZE + 8 * len(self.flush_table)))
+
+    def close(self) -> None:
+        """Releases the mapping. Arrays and views of the tables must be released first.
+        """
+        for table in (self.flush_table, self.non_flush_table):
+            if isinstance(table, memoryview):
+                table.release()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def load_evaluator(path: str, config: Optional[DeckConfig] = None,
+                   verify: bool = False) -> tuple[LookupEvaluator, MappedTables]:
+    """LookupEvaluator reading its scores from a mapped table file, without building any table.
+    Parameters are the same as in MappedTables. Returns the evaluator and its tables, which
+    must stay open while the evaluator is used.
+    """
+    tables = MappedTables(path, config, verify)
+    config = tables.config
+    evaluator = LookupEvaluator.from_tables(config.values, config.suits, config.size,
+                                            tables.flush_scores, tables.non_flush_scores, config.ace_value)
+    return evaluator, tables
@@ -0,0 +1,62 @@
+import pytest
+from itertools import combinations
+from src.hand_evaluator import evaluate_hand
+from src.rank_generator import generate_ranking
+from src.score_system import hand_score, log_score
+
+np = pytest.importorskip("numpy")
+from src.batch_evaluator import random_hands, evaluate_batch  # noqa: E402
+
+
+def check_batch(codes, values, suits, royal_flush=True, dual_ace=True, replace_value=True):
+    ace = values + 1
+    size = codes.shape[1]
+    ranking, _ = generate_ranking(values, suits, size, royal_flush, dual_ace)
+    result = evaluate_batch(codes, values, suits, royal_flush=royal_flush,
+                            dual_ace=dual_ace, replace_value=replace_value)
+    for row, hand in zip(result, codes.tolist()):
+        cards = [divmod(code, suits) for code in hand]
+        sorted_hand, frequencies, is_straight, is_flush, is_royal_flush = \
+            evaluate_hand(cards, ace, royal_flush, dual_ace, replace_value)
+        sorted_values = [card[0] for card in sorted_hand]
+        hand_rank = ranking[(frequencies, is_straight, is_flush, is_royal_flush)]
+        assert row['sorted_values'].tolist() == sorted_values
+        assert tuple(f for f in row['frequency_signature'].tolist() if f) == frequencies
+        assert (row['is_straight'], row['is_flush'], row['is_royal_flush']) == \
+               (is_straight, is_flush, is_royal_flush)
+        assert row['hand_rank'] == hand_rank
+        assert row['score'] == hand_score(sorted_values, hand_rank, ace)
+        assert row['log_score'] == pytest.approx(log_score(sorted_values, hand_rank, ace))
+
+
+def test_random_hands_shape_and_uniqueness():
+    codes = random_hands(1000, 13, 4, 7, rng=np.random.default_rng(0))
+    assert codes.shape == (1000, 7)
+    assert codes.min() >= 2 * 4 and codes.max() < 15 * 4
+    assert all(len(set(hand)) == 7 for hand in codes.tolist())
+
+
+@pytest.mark.parametrize("values, suits, size", [(5, 2, 3), (6, 3, 4), (7, 2, 5), (5, 4, 5)])
+@pytest.mark.parametrize("royal_flush, dual_ace, replace_value", [(True, True, True), (False, True, False),
+                                                                  (True, False, True)])
+def test_evaluate_batch_exhaustive(values, suits, size, royal_flush, dual_ace, replace_value):
+    deck = range(2 * suits, (values + 2) * suits)
+    codes = np.array(list(combinations(deck, size)))
+    check_batch(codes, values, suits, royal_flush, dual_ace, replace_value)
+
+
+def test_evaluate_batch_standard_deck():
+    codes = random_hands(5000, 13, 4, 5, rng=np.random.default_rng(1))
+    check_batch(codes, 13, 4)
+
+
+def test_evaluate_batch_seven_cards():
+    codes = random_hands(500, 13, 4, 7, rng=np.random.default_rng(3))
+    check_batch(codes, 13, 4)
+
+
+def test_evaluate_batch_float_scores_for_large_decks():
+    codes = random_hands(10, 40, 4, 9, rng=np.random.default_rng(2))
+    result = evaluate_batch(codes, 40, 4)
+    assert result.dtype['score'] == np.float64
+    assert np.all(result['score'] > 0)
@@ -0,0 +1,33 @@
+from itertools import combinations
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.batch_evaluator import random_hands  # noqa: E402
+from src.batch_hand_index import canonical_indices, hands_to_indices, indices_to_hands  # noqa: E402
+from src.deck_config import DeckConfig  # noqa: E402
+from src.hand_index import canonical_count, canonical_index, hand_to_index  # noqa: E402
+
+
+def to_cards(row, config):
+    return [(code // config.suits, config.labels[code % config.suits]) for code in row]
+
+
+@pytest.mark.parametrize("config", [DeckConfig(13, 4, 5), DeckConfig(13, 4, 7), DeckConfig(9, 6, 6)])
+def test_batch_indices_match_single_hands(config):
+    hands = random_hands(300, config.values, config.suits, config.size, rng=np.random.default_rng(3))
+    indices = hands_to_indices(hands, config)
+    canonical = canonical_indices(hands, config)
+    for row, index, canonical_row in zip(hands.tolist(), indices.tolist(), canonical.tolist()):
+        cards = to_cards(row, config)
+        assert index == hand_to_index(cards, config)
+        assert canonical_row == canonical_index(cards, config)
+    assert (indices_to_hands(indices, config) == np.sort(hands, axis=1)).all()
+
+
+def test_canonical_indices_full_deck():
+    config = DeckConfig(5, 3, 4)
+    hands = np.array(list(combinations(range(2 * 3, 7 * 3), 4)))
+    assert sorted(hands_to_indices(hands, config).tolist()) == list(range(len(hands)))
+    assert set(canonical_indices(hands, config).tolist()) == set(range(canonical_count(config)))
@@ -0,0 +1,94 @@
+import pytest
+import random
+from src.score_system import ScoreEngine, hand_score, log_score
+
+np = pytest.importorskip("numpy")
+from src.batch_scores import exact_score_batch, fits_int64, hand_score_batch, log_score_batch, decode_score  # noqa: E402
+
+
+def random_scored_hands(n, size, ace_value, max_rank, seed):
+    rng = random.Random(seed)
+    card_values = [sorted(rng.sample(range(2, ace_value + 1), size), reverse=True) for _ in range(n)]
+    hand_ranks = [rng.randrange(max_rank + 1) for _ in range(n)]
+    return card_values, hand_ranks
+
+
+def test_hand_score_batch_matches_hand_score():
+    card_values, hand_ranks = random_scored_hands(500, 5, 14, 9, 0)
+    scores = hand_score_batch(np.array(card_values), np.array(hand_ranks), 14)
+    assert scores.dtype == np.int64
+    assert scores.tolist() == [hand_score(v, r, 14) for v, r in zip(card_values, hand_ranks)]
+
+
+def test_hand_score_batch_float_for_large_scores():
+    assert not fits_int64(60, 20, 30)
+    card_values, hand_ranks = random_scored_hands(50, 20, 60, 30, 1)
+    scores = hand_score_batch(np.array(card_values), np.array(hand_ranks), 60)
+    assert scores.dtype == np.float64
+    expected = [float(hand_score(v, r, 60)) for v, r in zip(card_values, hand_ranks)]
+    assert scores.tolist() == pytest.approx(expected)
+
+
+def test_exact_score_batch_for_large_scores():
+    card_values, hand_ranks = random_scored_hands(50, 20, 60, 30, 1)
+    scores = exact_score_batch(np.array(card_values, dtype=np.int16), np.array(hand_ranks), 60)
+    assert all(type(score) is int for score in scores)
+    assert scores.tolist() == [hand_score(v, r, 60) for v, r in zip(card_values, hand_ranks)]
+
+
+def test_log_score_batch_matches_log_score():
+    card_values, hand_ranks = random_scored_hands(500, 7, 14, 12, 2)
+    scores = log_score_batch(np.array(card_values), np.array(hand_ranks), 14)
+    assert scores.tolist() == pytest.approx([log_score(v, r, 14) for v, r in zip(card_values, hand_ranks)])
+
+
+def test_decode_score_scalar():
+    assert decode_score(29043958007812500, 5, 14) == (9, [14, 13, 12, 11, 10])
+    assert decode_score(267344, 5, 14) == (0, [5, 4, 3, 2, 14])
+    with pytest.raises(ValueError):
+        decode_score(0, 5, 14)
+    with pytest.raises(ValueError):
+        decode_score(-15, 5, 14)
+
+
+def test_decode_score_array():
+    card_values, hand_ranks = random_scored_hands(1000, 5, 14, 9, 3)
+    scores = hand_score_batch(np.array(card_values), np.array(hand_ranks), 14).reshape(10, 100)
+    decoded_ranks, decoded_values = decode_score(scores, 5, 14)
+    assert decoded_ranks.shape == (10, 100)
+    assert decoded_values.shape == (10, 100, 5)
+    assert decoded_ranks.ravel().tolist() == hand_ranks
+    assert decoded_values.reshape(-1, 5).tolist() == card_values
+
+
+def test_decode_score_array_zeros():
+    hand_rank, card_values = decode_score(np.array([0, 267344]), 5, 14)
+    assert hand_rank.tolist() == [0, 0]
+    assert card_values.tolist() == [[0, 0, 0, 0, 0], [5, 4, 3, 2, 14]]
+
+
+def test_decode_score_rejects_float_scores():
+    with pytest.raises(TypeError):
+        decode_score(np.array([1.5]), 5, 14)
+
+
+def test_decode_score_object_and_packed_arrays():
+    card_values, hand_ranks = random_scored_hands(300, 7, 14, 12, 4)
+    scores = exact_score_batch(np.array(card_values), np.array(hand_ranks), 14)
+    decoded_ranks, decoded_values = decode_score(scores, 7, 14)
+    assert decoded_ranks.tolist() == hand_ranks
+    assert decoded_values.tolist() == card_values
+
+    engine = ScoreEngine(14, 7, 12)
+    packed = np.array([engine.packed_score(v, r) for v, r in zip(card_values, hand_ranks)], dtype=np.uint64)
+    decoded_ranks, decoded_values = decode_score(packed, 7, 14, packed=True)
+    assert decoded_ranks.tolist() == hand_ranks
+    assert decoded_values.tolist() == card_values
+    assert decode_score(int(packed[0]), 7, 14, packed=True) == (hand_ranks[0], card_values[0])
+
+
+def test_decode_score_rejects_scores_out_of_int64():
+    with pytest.raises(ValueError):
+        decode_score(np.array([2 ** 63 + 5], dtype=np.uint64), 5, 14)
+    with pytest.raises(ValueError):
+        decode_score(np.array([-15]), 5, 14)
@@ -0,0 +1,52 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.batch_evaluator import random_hands  # noqa: E402
+from src.batch_scores import fits_int64  # noqa: E402
+from src.batch_showdown import showdown_batch  # noqa: E402
+from src.deck_config import DeckConfig  # noqa: E402
+from src.showdown import hand_strength, showdown  # noqa: E402
+
+
+def to_cards(codes, suits=4):
+    return [(code // suits, code % suits) for code in codes]
+
+
+def test_showdown_batch_matches_showdown():
+    config = DeckConfig(13, 4, 5)
+    ranking, _ = config.ranking()
+    deals = random_hands(300, 13, 4, 11, rng=np.random.default_rng(2))
+    hands, board = deals[:, :6].reshape(300, 3, 2), deals[:, 6:]
+    winners, hand_rank, sorted_values = showdown_batch(hands, board, config, ranking)
+    assert winners.shape == hand_rank.shape == (300, 3)
+    assert sorted_values.shape == (300, 3, 5)
+    for t in range(300):
+        players = [to_cards(hand) for hand in hands[t].tolist()]
+        expected, _, _ = showdown(players, to_cards(board[t].tolist()), config, ranking)
+        assert np.flatnonzero(winners[t]).tolist() == expected
+        for p, cards in enumerate(players):
+            strength, _ = hand_strength(cards + to_cards(board[t].tolist()), config, ranking)
+            assert (hand_rank[t, p], tuple(sorted_values[t, p].tolist())) == strength
+
+
+def test_showdown_batch_without_board():
+    hands = random_hands(50, 13, 4, 10, rng=np.random.default_rng(4)).reshape(50, 2, 5)
+    winners, _, _ = showdown_batch(hands)
+    assert winners.any(axis=1).all()
+    for t in range(50):
+        expected, _, _ = showdown([to_cards(hand) for hand in hands[t].tolist()])
+        assert np.flatnonzero(winners[t]).tolist() == expected
+
+
+def test_showdown_batch_scores_beyond_64_bits():
+    config = DeckConfig(20, 4, 8)
+    ranking, _ = config.ranking()
+    assert not fits_int64(config.ace_value, config.size, max(ranking.values()))
+    deals = random_hands(40, 20, 4, 14, rng=np.random.default_rng(6))
+    hands, board = deals[:, :6].reshape(40, 3, 2), deals[:, 6:]
+    winners, _, _ = showdown_batch(hands, board, config, ranking)
+    for t in range(40):
+        players = [to_cards(hand) for hand in hands[t].tolist()]
+        expected, _, _ = showdown(players, to_cards(board[t].tolist()), config, ranking)
+        assert np.flatnonzero(winners[t]).tolist() == expected
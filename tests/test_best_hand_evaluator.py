@@ -0,0 +1,72 @@
+import pytest
+import random
+from itertools import combinations
+from src.hand_evaluator import evaluate_hand
+from src.rank_generator import generate_ranking
+from src.score_system import hand_score
+from src.best_hand_evaluator import best_hand, is_straight_values
+
+
+def subset_maximum(cards, size, ranking, ace, royal_flush=True, dual_ace=True):
+    best = None
+    for hand in combinations(cards, size):
+        sorted_hand, frequencies, is_straight, is_flush, is_royal_flush = \
+            evaluate_hand(list(hand), ace, royal_flush, dual_ace)
+        hand_rank = ranking[(frequencies, is_straight, is_flush, is_royal_flush)]
+        score = hand_score([card[0] for card in sorted_hand], hand_rank, ace)
+        if best is None or score > best[-1]:
+            best = (sorted_hand, frequencies, is_straight, is_flush, is_royal_flush, score)
+    return best
+
+
+def check_best_hand(cards, size, ranking, ace, royal_flush=True, dual_ace=True):
+    expected = subset_maximum(cards, size, ranking, ace, royal_flush, dual_ace)
+    result = best_hand(cards, size, ranking, ace, royal_flush, dual_ace)
+    assert len(result[0]) == size
+    assert set(result[0]) <= set(cards) | {(1, card[1]) for card in cards}
+    assert [card[0] for card in result[0]] == [card[0] for card in expected[0]]
+    assert result[1:] == expected[1:]
+    assert best_hand(cards, size, ranking, ace, royal_flush, dual_ace, with_score=False) == result[:-1] + (None, )
+
+
+def test_is_straight_values():
+    assert is_straight_values((9, 8, 7, 6, 5), 14)
+    assert is_straight_values((14, 5, 4, 3, 2), 14)
+    assert not is_straight_values((14, 5, 4, 3, 2), 14, allow_dual_ace=False)
+    assert not is_straight_values((14, 13, 12, 11, 9), 14)
+
+
+def test_best_hand_holdem_royal_flush():
+    ranking, _ = generate_ranking(13, 4, 5)
+    cards = [(14, 'h'), (13, 'h'), (2, 'c'), (12, 'h'), (11, 'h'), (10, 'h'), (10, 's')]
+    sorted_hand, freq_sig, is_straight, is_flush, is_royal_flush, score = best_hand(cards, 5, ranking, 14)
+    assert sorted_hand == [(14, 'h'), (13, 'h'), (12, 'h'), (11, 'h'), (10, 'h')]
+    assert is_straight and is_flush and is_royal_flush
+    assert score == 29043958007812500
+
+
+def test_best_hand_not_enough_cards():
+    ranking, _ = generate_ranking(13, 4, 5)
+    with pytest.raises(ValueError):
+        best_hand([(14, 'h'), (13, 'h')], 5, ranking, 14)
+
+
+def test_best_hand_holdem_random():
+    ranking, _ = generate_ranking(13, 4, 5)
+    deck = [(v, s) for v in range(2, 15) for s in 'cdhs']
+    rng = random.Random(11)
+    for _ in range(300):
+        check_best_hand(rng.sample(deck, 7), 5, ranking, 14)
+
+
+@pytest.mark.parametrize("values, suits, size, n", [
+    (6, 3, 3, 5), (5, 2, 4, 6), (7, 4, 3, 6), (5, 3, 2, 4), (8, 2, 5, 7),
+])
+@pytest.mark.parametrize("royal_flush, dual_ace", [(True, True), (False, True), (True, False)])
+def test_best_hand_small_decks(values, suits, size, n, royal_flush, dual_ace):
+    ace = values + 1
+    ranking, _ = generate_ranking(values, suits, size, royal_flush, dual_ace)
+    deck = [(v, s) for v in range(2, ace + 1) for s in range(suits)]
+    rng = random.Random(values * 100 + suits * 10 + size)
+    for _ in range(200):
+        check_best_hand(rng.sample(deck, n), size, ranking, ace, royal_flush, dual_ace)
@@ -0,0 +1,65 @@
+import pytest
+from itertools import combinations
+from src.hand_evaluator import evaluate_hand
+from src.bitmask_evaluator import (
+    encode_card,
+    decode_card,
+    encode_hand,
+    decode_hand,
+    hand_masks,
+    evaluate_encoded,
+)
+
+
+def test_encode_decode_card():
+    code = encode_card(14, 3, 4)
+    assert code == 59
+    assert decode_card(code, 4) == (14, 3)
+
+
+def test_encode_decode_hand_roundtrip():
+    labels = ['clubs', 'diamonds', 'hearts', 'spades']
+    cards = [(14, 'hearts'), (2, 'clubs'), (10, 'spades')]
+    codes = encode_hand(cards, labels)
+    assert all(isinstance(code, int) for code in codes)
+    assert decode_hand(codes, labels) == cards
+
+
+def test_hand_masks():
+    rank_mask, rank_counts, suit_masks = hand_masks([encode_card(5, 0, 3), encode_card(5, 2, 3),
+                                                     encode_card(7, 2, 3)], 3)
+    assert rank_mask == (1 << 5) | (1 << 7)
+    assert (rank_counts >> (5 * 2)) & 3 == 2
+    assert suit_masks == [1 << 5, 0, (1 << 5) | (1 << 7)]
+
+
+def test_evaluate_encoded_royal_flush():
+    codes = encode_hand([(14, 0), (13, 0), (12, 0), (11, 0), (10, 0)], range(4))
+    sorted_values, freq_sig, is_straight, is_flush, is_royal_flush = evaluate_encoded(codes, 4, 14)
+    assert sorted_values == [14, 13, 12, 11, 10]
+    assert freq_sig == (1, 1, 1, 1, 1)
+    assert is_straight and is_flush and is_royal_flush
+
+
+def test_evaluate_encoded_wheel():
+    codes = encode_hand([(14, 0), (2, 1), (3, 0), (4, 0), (5, 0)], range(4))
+    sorted_values, _, is_straight, is_flush, _ = evaluate_encoded(codes, 4, 14)
+    assert is_straight and not is_flush
+    assert sorted_values == [5, 4, 3, 2, 1]
+
+
+@pytest.mark.parametrize("values, suits, size", [
+    (5, 2, 3), (6, 3, 4), (7, 2, 5), (5, 4, 5), (8, 4, 4), (6, 1, 3), (9, 3, 2),
+])
+@pytest.mark.parametrize("royal_flush, dual_ace, replace_value", [
+    (True, True, True), (False, True, False), (True, False, True),
+])
+def test_evaluate_encoded_matches_evaluate_hand(values, suits, size, royal_flush, dual_ace, replace_value):
+    ace = values + 1
+    deck = [(v, s) for v in range(2, ace + 1) for s in range(suits)]
+    for hand in combinations(deck, size):
+        expected = evaluate_hand(list(hand), ace, royal_flush, dual_ace, replace_value)
+        result = evaluate_encoded(encode_hand(hand, range(suits)), suits, ace,
+                                  royal_flush, dual_ace, replace_value)
+        assert result[0] == [card[0] for card in expected[0]]
+        assert result[1:] == expected[1:]
@@ -0,0 +1,67 @@
+import random
+import tracemalloc
+from itertools import combinations, product
+
+import pytest
+
+from src.buffered_evaluator import EvaluationResult, HandEvaluator
+from src.hand_evaluator import evaluate_hand
+from src.rank_generator import generate_ranking
+from src.score_system import hand_score
+
+
+def expected(cards, ace, flags):
+    royal_flush, dual_ace, replace_value = flags
+    ranking, _ = generate_ranking(ace - 1, 4, len(cards), royal_flush, dual_ace)
+    sorted_hand, signature, *special = evaluate_hand(cards, ace, royal_flush, dual_ace, replace_value)
+    values = [card[0] for card in sorted_hand]
+    rank = ranking[(signature, *special)]
+    return values, signature, tuple(special), rank, hand_score(values, rank, ace)
+
+
+def observed(out):
+    return (list(out.values), out.frequency_signature, (out.is_straight, out.is_flush, out.is_royal_flush),
+            out.hand_rank, out.score)
+
+
+@pytest.mark.parametrize("flags", list(product([True, False], repeat=3)))
+def test_matches_evaluate_hand(flags):
+    deck = [(value, suit) for value in range(2, 8) for suit in range(4)]
+    evaluator = HandEvaluator(6, 4, 5, None, *flags)
+    out = EvaluationResult(5)
+    for hand in list(combinations(deck, 5))[::3]:
+        assert observed(evaluator.evaluate_into(list(hand), out)) == expected(list(hand), 7, flags)
+
+
+def test_seven_card_hands_and_array_buffers():
+    np = pytest.importorskip("numpy")
+    deck = [(value, suit) for value in range(2, 15) for suit in range(4)]
+    evaluator = HandEvaluator(13, 4, 7)
+    buffer = np.zeros((100, 7), dtype=np.int64)
+    rng = random.Random(3)
+    for row in range(100):
+        hand = rng.sample(deck, 7)
+        out = evaluator.evaluate_into(hand, EvaluationResult(7, buffer[row]))
+        assert out.values is buffer[row] or out.values.base is buffer
+        values, _, _, _, score = expected(hand, 14, (True, True, True))
+        assert buffer[row].tolist() == values
+        assert type(out.score) is int and out.score == score
+
+
+def test_no_containers_allocated_per_hand():
+    deck = [(value, suit) for value in range(2, 15) for suit in range(4)]
+    rng = random.Random(0)
+    hands = [rng.sample(deck, 5) for _ in range(2000)]
+    evaluator = HandEvaluator(13, 4, 5)
+    out = EvaluationResult(5)
+    values = out.values
+    evaluator.evaluate_into(hands[0], out)
+
+    tracemalloc.start()
+    for hand in hands:
+        evaluator.evaluate_into(hand, out)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert out.values is values
+    # only a few integers are alive at any time
+    assert peak < 1000
@@ -0,0 +1,116 @@
+import os
+import random
+from itertools import combinations
+
+import pytest
+from src import codegen
+from src.codegen import evaluator_source, make_evaluator, set_cache_dir
+from src.deck_config import DeckConfig
+from src.hand_evaluator import evaluate_hand
+from src.score_system import hand_score
+
+
+def reference_score(cards, config, ranking):
+    sorted_hand, *key = evaluate_hand(cards, config.ace_value, config.royal_flush, config.dual_ace,
+                                      config.replace_value, config.alt_ace_value)
+    return hand_score([card[0] for card in sorted_hand], ranking[tuple(key)], config.ace_value)
+
+
+def evaluator_of(config):
+    return make_evaluator(config.values, config.suits, config.size, config.ace_value, config.royal_flush,
+                          config.dual_ace, config.replace_value, config.alt_ace_value)
+
+
+@pytest.mark.parametrize("config", [DeckConfig(7, 3, 5), DeckConfig(7, 3, 5, False, False), DeckConfig(5, 1, 3),
+                                    DeckConfig(6, 2, 1), DeckConfig(5, 4, 5, replace_value=False),
+                                    DeckConfig(6, 4, 4, main_ace_value=10, alt_ace_value=4), DeckConfig(4, 4, 6)])
+def test_matches_evaluate_hand_on_every_hand(config):
+    ranking, _ = config.ranking()
+    score = evaluator_of(config)
+    rng = random.Random(0)
+    for hand in combinations(config.deck(), config.size):
+        cards = rng.sample(hand, len(hand))
+        assert score(cards) == reference_score(cards, config, ranking)
+
+
+def test_matches_evaluate_hand_on_random_hands():
+    config = DeckConfig(13, 4, 7)
+    ranking, _ = config.ranking()
+    score = evaluator_of(config)
+    rng = random.Random(1)
+    for _ in range(20000):
+        cards = rng.sample(config.deck(), 7)
+        assert score(cards) == reference_score(cards, config, ranking)
+
+
+def test_size_limit():
+    with pytest.raises(ValueError):
+        evaluator_source(20, 4, codegen.MAX_SIZE + 1)
+
+
+def test_disk_cache(tmp_path, monkeypatch):
+    set_cache_dir(str(tmp_path))
+    try:
+        monkeypatch.setattr(codegen, "_evaluators", {})
+        score = make_evaluator(9, 4, 6)
+        files = os.listdir(tmp_path)
+        assert len(files) == 1 and files[0].startswith(f"evaluator-v{codegen.GENERATOR_VERSION}-r{codegen.CACHE_VERSION}-")
+        assert (tmp_path / files[0]).read_text() == evaluator_source(9, 4, 6)
+
+        monkeypatch.setattr(codegen, "_evaluators", {})
+        monkeypatch.setattr(codegen, "evaluator_source", None)
+        cards = [(10, 0), (10, 1), (4, 2), (4, 3), (4, 0), (9, 1)]
+        assert make_evaluator(9, 4, 6)(cards) == score(cards)
+    finally:
+        set_cache_dir(None)
+
+
+def test_disk_cache_regenerates_mismatched_headers(tmp_path, monkeypatch):
+    set_cache_dir(str(tmp_path))
+    try:
+        monkeypatch.setattr(codegen, "_evaluators", {})
+        make_evaluator(9, 4, 6)
+        (path, ) = tmp_path.iterdir()
+        # source of another configuration, with a valid score_hand
+        path.write_text(evaluator_source(9, 4, 6, allow_dual_ace=False))
+        monkeypatch.setattr(codegen, "_evaluators", {})
+        wheel = [(10, 0), (2, 1), (3, 2), (4, 3), (5, 0), (6, 1)]
+        sorted_hand, *key = evaluate_hand(wheel, 10)
+        ranking, _ = DeckConfig(9, 4, 6).ranking()
+        assert make_evaluator(9, 4, 6)(wheel) == hand_score([card[0] for card in sorted_hand], ranking[tuple(key)], 10)
+        assert path.read_text() == evaluator_source(9, 4, 6)
+    finally:
+        set_cache_dir(None)
+
+
+def test_disk_cache_keyed_on_ranking_version(tmp_path, monkeypatch):
+    set_cache_dir(str(tmp_path))
+    try:
+        version = codegen.CACHE_VERSION
+        monkeypatch.setattr(codegen, "_evaluators", {})
+        monkeypatch.setattr(codegen, "CACHE_VERSION", version - 1)
+        make_evaluator(9, 4, 6)
+        (stale, ) = tmp_path.iterdir()
+        # a stale source under the current name is regenerated as well
+        monkeypatch.setattr(codegen, "_evaluators", {})
+        monkeypatch.setattr(codegen, "CACHE_VERSION", version)
+        current = tmp_path / stale.name.replace(f"-r{version - 1}-", f"-r{version}-")
+        current.write_text(stale.read_text())
+        make_evaluator(9, 4, 6)
+        assert f"ranking version {version}\n" in current.read_text()
+        assert current.read_text() == evaluator_source(9, 4, 6)
+    finally:
+        set_cache_dir(None)
+
+
+def test_unwritable_cache_dir(tmp_path, monkeypatch):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    set_cache_dir(str(blocker / "cache"))
+    try:
+        monkeypatch.setattr(codegen, "_evaluators", {})
+        cards = [(10, 0), (10, 1), (4, 2), (4, 3), (4, 0), (9, 1)]
+        assert make_evaluator(9, 4, 6)(cards) > 0
+        assert os.listdir(tmp_path) == ["file"]
+    finally:
+        set_cache_dir(None)
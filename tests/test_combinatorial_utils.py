@@ -1,12 +1,37 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
+from src import combinatorial_utils
 from src.combinatorial_utils import (
     n_choose_k,
+    factorial,
+    falling_factorial,
+    clear_tables,
+    FACTORIAL_TABLE_SIZE,
+    FALLING_FACTORIAL_CACHE_SIZE,
+    _falling_factorial,
+    log_factorial,
+    log_falling_factorial,
+    log_n_choose_k,
+    approximate_n_choose_k,
     k_subsets,
     k_integer_partitions,
     integer_partitions,
+    iter_k_subsets,
+    nth_k_subset,
+    iter_integer_partitions,
+    iter_k_integer_partitions,
 )
 
 
+def brute_force_partitions(n, largest=None):
+    if n == 0:
+        return {()}
+    largest = n if largest is None else largest
+    return {(p, ) + rest for p in range(1, min(n, largest) + 1) for rest in brute_force_partitions(n - p, p)}
+
+
 def test_n_choose_k_basic():
     assert n_choose_k(5, 2) == 10
     assert n_choose_k(6, 3) == 20
@@ -21,6 +46,52 @@ def test_n_choose_k_edges():
     assert n_choose_k(5, 6) == 1
 
 
+def test_factorial_tables():
+    clear_tables()
+    assert [factorial(n) for n in (5, 0, 30, 7)] == [math.factorial(n) for n in (5, 0, 30, 7)]
+    assert all(falling_factorial(n, k) == math.perm(n, k) for n in range(12) for k in range(n + 2))
+    assert all(n_choose_k(n, k) == math.comb(n, k) for n in range(1, 40) for k in range(1, n))
+    assert falling_factorial(300, 150) == math.perm(300, 150)
+
+
+def test_factorial_table_is_bounded():
+    clear_tables()
+    assert factorial(FACTORIAL_TABLE_SIZE + 10) == math.factorial(FACTORIAL_TABLE_SIZE + 10)
+    assert n_choose_k(40000, 20000) == math.comb(40000, 20000)
+    assert len(combinatorial_utils._factorials) <= FACTORIAL_TABLE_SIZE
+
+
+def test_falling_factorial_cache_is_bounded():
+    clear_tables()
+    for n in range(FALLING_FACTORIAL_CACHE_SIZE + 100):
+        falling_factorial(n, n // 2)
+    assert _falling_factorial.cache_info().currsize == FALLING_FACTORIAL_CACHE_SIZE
+
+
+def test_factorial_table_shared_between_threads():
+    clear_tables()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(factorial, range(400, 0, -1)))
+    assert results == [math.factorial(n) for n in range(400, 0, -1)]
+    assert [factorial(n) for n in range(401)] == [math.factorial(n) for n in range(401)]
+
+
+@pytest.mark.parametrize("call", [lambda: factorial(-1), lambda: falling_factorial(5, -1),
+                                  lambda: falling_factorial(-1, 2)])
+def test_factorial_tables_reject_negative_arguments(call):
+    with pytest.raises(ValueError):
+        call()
+    assert factorial(4) == 24 and falling_factorial(5, 2) == 20
+
+
+def test_log_space():
+    assert log_factorial(20) == pytest.approx(math.log(math.factorial(20)))
+    assert log_falling_factorial(50, 7) == pytest.approx(math.log(math.perm(50, 7)))
+    assert log_n_choose_k(52, 5) == pytest.approx(math.log(2598960))
+    assert approximate_n_choose_k(52, 5) == pytest.approx(2598960)
+    assert approximate_n_choose_k(1000, 100) == pytest.approx(float(math.comb(1000, 100)), rel=1e-9)
+
+
 def test_k_subsets_basic():
     # subsets of size 2 from {0,1,2,3}
     result = k_subsets(4, 2)
@@ -70,3 +141,52 @@ def test_integer_partitions_contains_k_parts():
     assert (4, 1, 1) in result
     assert (2, 2, 2) in result
     assert (1, 1, 1, 1, 1, 1) in result
+
+
+def test_iter_k_subsets_lexicographic():
+    subsets = list(iter_k_subsets(5, 3))
+    assert subsets == sorted(subsets)
+    assert {frozenset(s) for s in subsets} == k_subsets(5, 3)
+    assert len(subsets) == n_choose_k(5, 3)
+
+
+def test_iter_k_subsets_is_lazy():
+    first = next(iter(iter_k_subsets(200, 100)))
+    assert first == tuple(range(100))
+
+
+def test_iter_integer_partitions_matches_brute_force():
+    for n in range(1, 13):
+        partitions = list(iter_integer_partitions(n))
+        assert len(partitions) == len(set(partitions))
+        assert set(partitions) == brute_force_partitions(n)
+
+
+def test_iter_integer_partitions_bounds():
+    for n in range(1, 13):
+        expected = brute_force_partitions(n)
+        for bound in range(1, n + 1):
+            assert set(iter_integer_partitions(n, max_part=bound)) == {p for p in expected if p[0] <= bound}
+            assert set(iter_integer_partitions(n, max_parts=bound)) == {p for p in expected if len(p) <= bound}
+
+
+def test_iter_k_integer_partitions_matches_brute_force():
+    for n in range(1, 13):
+        expected = brute_force_partitions(n)
+        for k in range(1, n + 1):
+            partitions = list(iter_k_integer_partitions(n, k))
+            assert len(partitions) == len(set(partitions))
+            assert set(partitions) == {p for p in expected if len(p) == k}
+
+
+def test_iter_integer_partitions_large_bounded():
+    # partitions of 100 into parts of size at most 4
+    assert sum(1 for _ in iter_integer_partitions(100, max_part=4)) == 8037
+
+
+def test_nth_k_subset_and_shards():
+    subsets = list(iter_k_subsets(7, 3))
+    for i, subset in enumerate(subsets):
+        assert nth_k_subset(7, 3, i) == subset
+    assert list(iter_k_subsets(7, 3, start=10)) == subsets[10:]
+    assert list(iter_k_subsets(7, 3, start=len(subsets))) == []
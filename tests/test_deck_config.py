@@ -0,0 +1,15 @@
+from src.deck_config import DeckConfig
+from src.rank_generator import generate_ranking
+
+
+def test_deck_config_defaults():
+    config = DeckConfig()
+    assert config.ace_value == 14
+    assert config.lowest_value == 2
+    assert len(config.deck()) == 52
+    assert config.ranking() == generate_ranking(13, 4, 5)
+
+
+def test_deck_config_labels():
+    config = DeckConfig(values=3, suits=2, size=2, main_ace_value=10, suit_labels=('x', 'y'))
+    assert config.deck() == [(8, 'x'), (8, 'y'), (9, 'x'), (9, 'y'), (10, 'x'), (10, 'y')]
@@ -0,0 +1,56 @@
+from itertools import combinations
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.deck_config import DeckConfig  # noqa: E402
+from src.enumeration import (combinations_at, enumerate_hands, load_state, merge_states,  # noqa: E402
+                             shard_bounds, validate_ranking)
+from src.lookup_tables import binomial_table, combination_index  # noqa: E402
+
+
+def test_combinations_at_follows_combination_index():
+    binomials = binomial_table(10, 4)
+    subsets = combinations_at(np.arange(210), 10, 4)
+    assert [combination_index(list(row), binomials) for row in subsets.tolist()] == list(range(210))
+    assert sorted(map(tuple, subsets.tolist())) == list(combinations(range(10), 4))
+
+
+def test_combinations_at_large_indices():
+    last = combinations_at(np.array([133784559]), 52, 7)
+    assert last.tolist() == [[45, 46, 47, 48, 49, 50, 51]]
+    with pytest.raises(ValueError):
+        combinations_at(np.array([0]), 200, 20)
+
+
+def test_shard_bounds():
+    bounds = shard_bounds(10, 3)
+    assert bounds == [(0, 3), (3, 6), (6, 10)]
+
+
+def test_shards_and_resume_match_full_enumeration(tmp_path):
+    config = DeckConfig(7, 4, 5)
+    full = enumerate_hands(config, chunk_size=5000)
+    assert full["next"] == full["stop"] == 98280
+    assert sum(full["ranks"].values()) == sum(full["scores"].values()) == 98280
+
+    shards = [enumerate_hands(config, start, stop, chunk_size=7000) for start, stop in shard_bounds(98280, 3)]
+    assert merge_states(shards)["ranks"] == full["ranks"]
+    assert merge_states(shards)["scores"] == full["scores"]
+
+    path = str(tmp_path / "state.json")
+    partial = enumerate_hands(config, 0, 40000, chunk_size=10000, checkpoint=path)
+    state = load_state(path)
+    assert state == partial
+    state["stop"] = None
+    resumed = enumerate_hands(config, state=state, chunk_size=10000)
+    assert resumed["ranks"] == full["ranks"]
+    assert resumed["scores"] == full["scores"]
+
+
+@pytest.mark.parametrize("config", [DeckConfig(7, 4, 5), DeckConfig(8, 3, 6), DeckConfig(6, 4, 7),
+                                    DeckConfig(7, 4, 5, royal_flush=False, dual_ace=False)])
+def test_validate_ranking(config):
+    valid, mismatches = validate_ranking(config, workers=1)
+    assert valid, mismatches
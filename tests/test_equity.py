@@ -0,0 +1,65 @@
+import pytest
+from fractions import Fraction
+from itertools import combinations
+from src.best_hand_evaluator import best_hand
+from src.deck_config import DeckConfig
+
+np = pytest.importorskip("numpy")
+from src.equity import split_counts, equity  # noqa: E402
+
+
+def brute_force_equity(players, board, config, board_size):
+    ranking, _ = config.ranking()
+    used = [card for hole in players for card in hole] + list(board)
+    remaining = [card for card in config.deck() if card not in used]
+    shares, boards = [Fraction(0)] * len(players), 0
+    for completion in combinations(remaining, board_size - len(board)):
+        full_board = list(board) + list(completion)
+        scores = [best_hand(hole + full_board, config.size, ranking, config.ace_value,
+                            config.royal_flush, config.dual_ace)[-1] for hole in players]
+        winners = [i for i, score in enumerate(scores) if score == max(scores)]
+        for i in winners:
+            shares[i] += Fraction(1, len(winners))
+        boards += 1
+    return [float(share / boards) for share in shares], boards
+
+
+def test_split_counts():
+    scores = np.array([[3, 1, 3], [5, 2, 1], [1, 1, 1]])
+    counts = split_counts(scores)
+    assert counts[:, 1].tolist() == [1, 0, 0]
+    assert counts[:, 2].tolist() == [1, 0, 1]
+    assert counts[:, 3].tolist() == [1, 1, 1]
+
+
+def test_equity_matches_brute_force():
+    config = DeckConfig(values=7, suits=3, size=4)
+    players = [[(8, 0), (8, 1)], [(7, 2), (6, 2)], [(3, 0), (4, 1)]]
+    board = [(2, 2)]
+    equities, wins, ties, boards = equity(players, board, config=config, board_size=4, workers=1, chunk_size=50)
+    expected, expected_boards = brute_force_equity(players, board, config, 4)
+    assert boards == expected_boards
+    assert equities == pytest.approx(expected)
+    assert sum(equities) == pytest.approx(1)
+
+
+def test_equity_parallel_matches_serial():
+    config = DeckConfig(values=8, suits=4, size=5)
+    players = [[(9, 0), (9, 1)], [(8, 2), (7, 2)]]
+    serial = equity(players, config=config, workers=1, chunk_size=500)
+    parallel = equity(players, config=config, workers=2, chunk_size=500)
+    assert serial == parallel
+
+
+def test_equity_standard_flop():
+    players = [[(14, 'h'), (14, 's')], [(13, 'd'), (12, 'd')]]
+    board = [(2, 'h'), (7, 's'), (9, 'c')]
+    config = DeckConfig(suit_labels=('c', 'd', 'h', 's'))
+    equities, wins, ties, boards = equity(players, board, config=config, workers=1)
+    assert boards == 990
+    assert equities[0] > 0.9
+
+
+def test_equity_repeated_card():
+    with pytest.raises(ValueError):
+        equity([[(14, 0), (13, 0)], [(14, 0), (12, 1)]], workers=1)
@@ -0,0 +1,23 @@
+import os
+
+import pytest
+
+from src.file_utils import atomic_write
+
+
+def test_atomic_write_text_and_bytes(tmp_path):
+    path = str(tmp_path / "file")
+    atomic_write(path, "text")
+    assert open(path).read() == "text"
+    atomic_write(path, b"\x00\x01")
+    assert open(path, "rb").read() == b"\x00\x01"
+    assert os.listdir(tmp_path) == ["file"]
+
+
+def test_atomic_write_failure_keeps_previous_file(tmp_path):
+    path = str(tmp_path / "file")
+    atomic_write(path, "previous")
+    with pytest.raises(TypeError):
+        atomic_write(path, ["not", "a", "string"])
+    assert open(path).read() == "previous"
+    assert os.listdir(tmp_path) == ["file"]
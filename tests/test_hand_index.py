@@ -0,0 +1,57 @@
+from itertools import combinations
+
+import pytest
+
+from src.deck_config import DeckConfig
+from src.hand_index import (canonical_count, canonical_hand, canonical_index, hand_to_index,
+                            index_to_hand, subset_at, subset_index)
+
+
+def test_subset_index_roundtrip():
+    for i, subset in enumerate(sorted(combinations(range(8), 3), key=lambda s: s[::-1])):
+        assert subset_index(list(subset)) == i
+        assert subset_at(i, 3) == list(subset)
+
+
+def test_hand_index_roundtrip():
+    config = DeckConfig(5, 3, 4)
+    indices = []
+    for hand in combinations(config.deck(), 4):
+        index = hand_to_index(list(hand)[::-1], config)
+        assert index_to_hand(index, config) == list(hand)
+        indices.append(index)
+    assert sorted(indices) == list(range(1365))
+
+
+def test_hand_index_bounds_and_labels():
+    config = DeckConfig(13, 4, 7, suit_labels=("s", "h", "d", "c"))
+    assert hand_to_index(config.deck()[:7], config) == 0
+    assert hand_to_index(config.deck()[-7:], config) == 133784559
+    assert index_to_hand(133784559, config) == config.deck()[-7:]
+
+
+@pytest.mark.parametrize("config, expected", [(DeckConfig(13, 4, 5), 134459), (DeckConfig(13, 4, 7), 6009159),
+                                              (DeckConfig(13, 4, 2), 169)])
+def test_canonical_count(config, expected):
+    assert canonical_count(config) == expected
+
+
+@pytest.mark.parametrize("config", [DeckConfig(5, 3, 4), DeckConfig(4, 4, 5), DeckConfig(3, 5, 4)])
+def test_canonical_index_is_dense_and_suit_invariant(config):
+    found = set()
+    for hand in combinations(config.deck(), config.size):
+        index = canonical_index(list(hand), config)
+        found.add(index)
+        assert canonical_index(canonical_hand(index, config), config) == index
+        # a cycle and a transposition generate every permutation of suits
+        for permutation in (list(range(1, config.suits)) + [0], [1, 0] + list(range(2, config.suits))):
+            assert canonical_index([(value, permutation[suit]) for value, suit in hand], config) == index
+    assert found == set(range(canonical_count(config)))
+
+
+def test_canonical_hand_orders_suits():
+    config = DeckConfig(13, 4, 5)
+    hand = canonical_hand(canonical_index([(14, 3), (13, 3), (2, 1), (2, 0), (9, 2)], config), config)
+    assert sorted(hand) == sorted([(14, 0), (13, 0), (9, 1), (2, 2), (2, 3)])
+    with pytest.raises(ValueError):
+        canonical_hand(134459, config)
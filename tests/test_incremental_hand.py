@@ -0,0 +1,84 @@
+import pytest
+import random
+from src.hand_evaluator import evaluate_hand
+from src.rank_generator import generate_ranking
+from src.best_hand_evaluator import best_hand
+from src.incremental_hand import IncrementalHand
+
+
+def test_incremental_hand_streets():
+    ranking, _ = generate_ranking(13, 4, 5)
+    hand = IncrementalHand(5, ranking, 14)
+    for card in [(14, 'h'), (14, 's'), (10, 'h'), (10, 'c'), (10, 'd')]:
+        hand.add(card)
+    assert len(hand) == 5
+    assert hand.frequency_signature == (3, 2)
+    sorted_hand, freq_sig, is_straight, is_flush, is_royal_flush = hand.classify()
+    assert [card[0] for card in sorted_hand] == [10, 10, 10, 14, 14]
+    assert freq_sig == (3, 2)
+    hand.add((2, 'h'))
+    hand.add((3, 'h'))
+    assert hand.frequency_signature == (3, 2, 1, 1)
+    assert hand.score() == best_hand(hand.cards(), 5, ranking, 14)[-1]
+    hand.remove((10, 'd'))
+    hand.remove((3, 'h'))
+    assert hand.frequency_signature == (2, 2, 1)
+    assert hand.classify()[1] == (2, 2, 1)
+
+
+def test_incremental_hand_remove_missing_card():
+    ranking, _ = generate_ranking(13, 4, 5)
+    hand = IncrementalHand(5, ranking, 14)
+    hand.add((5, 'h'))
+    with pytest.raises(ValueError):
+        hand.remove((5, 's'))
+
+
+def test_incremental_hand_duplicate_card():
+    ranking, _ = generate_ranking(13, 4, 5)
+    hand = IncrementalHand(5, ranking, 14)
+    hand.add((5, 'h'))
+    with pytest.raises(ValueError):
+        hand.add((5, 'h'))
+    assert len(hand) == 1 and hand.frequency_signature == (1, )
+    hand.add((5, 's'))
+    assert hand.frequency_signature == (2, )
+
+
+def test_incremental_hand_too_few_cards():
+    ranking, _ = generate_ranking(13, 4, 5)
+    hand = IncrementalHand(5, ranking, 14)
+    hand.add((5, 'h'))
+    with pytest.raises(ValueError):
+        hand.classify()
+
+
+@pytest.mark.parametrize("royal_flush, dual_ace, replace_value", [(True, True, True), (False, True, False),
+                                                                  (True, False, True)])
+def test_incremental_hand_matches_evaluators(royal_flush, dual_ace, replace_value):
+    values, suits, size = 7, 3, 4
+    ranking, _ = generate_ranking(values, suits, size, royal_flush, dual_ace)
+    deck = [(v, s) for v in range(2, values + 2) for s in range(suits)]
+    rng = random.Random(5)
+    hand = IncrementalHand(size, ranking, values + 1, royal_flush, dual_ace, replace_value)
+    held = []
+    for _ in range(2000):
+        if held and (len(held) > 7 or rng.random() < 0.4):
+            card = held.pop(rng.randrange(len(held)))
+            hand.remove(card)
+        else:
+            card = rng.choice([c for c in deck if c not in held])
+            held.append(card)
+            hand.add(card)
+        assert sorted(hand.cards()) == sorted(held)
+        if len(held) == size:
+            expected = evaluate_hand(list(held), values + 1, royal_flush, dual_ace, replace_value)
+            result = hand.classify()
+            assert [card[0] for card in result[0]] == [card[0] for card in expected[0]]
+            assert result[1:] == expected[1:]
+        elif len(held) > size:
+            expected = best_hand(held, size, ranking, values + 1, royal_flush, dual_ace, replace_value)
+            result = hand.classify()
+            assert [card[0] for card in result[0]] == [card[0] for card in expected[0]]
+            assert result[1:] == expected[1:5]
+            assert hand.score() == expected[-1]
@@ -0,0 +1,108 @@
+import json
+import threading
+from itertools import combinations, product
+
+import pytest
+
+from src import best_hand_evaluator, hand_evaluator, instrumentation, rank_generator, score_system
+from src.deck_config import DeckConfig
+from src.hand_evaluator import evaluate_hand
+
+
+DECK = [(value, suit) for value in range(2, 8) for suit in range(3)]
+
+
+def test_instrumented_evaluation_matches_evaluate_hand():
+    for flags in product([True, False], repeat=3):
+        for hand in combinations(DECK, 5):
+            assert instrumentation._evaluate_hand(list(hand), 7, *flags) == evaluate_hand(list(hand), 7, *flags)
+
+
+def test_instrumented_evaluation_matches_evaluate_hand_on_full_deck():
+    # one hand of every class of hands equal up to a permutation of suits:
+    # suits appear in the order 0, 1, 2, ... in the hand
+    for hand in combinations(DeckConfig().deck(), 5):
+        suits = []
+        for _, suit in hand:
+            if suit not in suits:
+                if suit != len(suits):
+                    break
+                suits.append(suit)
+        else:
+            assert instrumentation._evaluate_hand(list(hand), 14) == evaluate_hand(list(hand), 14)
+
+
+@pytest.mark.parametrize("replace_value", [True, False])
+def test_wheels_are_counted(replace_value):
+    with instrumentation.instrumented():
+        hand_evaluator.evaluate_hand([(14, 0), (2, 1), (3, 0), (4, 0), (5, 0)], 14, replace_value=replace_value)
+        hand_evaluator.evaluate_hand(cards=[(14, 0), (13, 1), (12, 0), (11, 0), (10, 0)], main_ace_value=14)
+        hand_evaluator.evaluate_hand([(6, 0), (2, 1), (3, 0), (4, 0), (5, 0)], 14)
+    assert instrumentation.stats()["branches"] == {"straight": 3, "wheel": 1}
+
+
+def test_nesting_is_tracked_per_thread():
+    with instrumentation.instrumented():
+        # the calling thread is inside an instrumented call, other threads are not
+        token = instrumentation._depth.set(1)
+        try:
+            score_system.hand_score([8, 7, 6, 5, 4], 3, 8)
+            thread = threading.Thread(target=score_system.hand_score, args=([8, 7, 6, 5, 4], 3, 8))
+            thread.start()
+            thread.join()
+        finally:
+            instrumentation._depth.reset(token)
+    assert instrumentation.stats()["calls"] == {"hand_score": 1}
+
+
+def test_enable_and_disable_rebind_functions():
+    original = hand_evaluator.evaluate_hand
+    with instrumentation.instrumented():
+        assert instrumentation.is_enabled()
+        assert hand_evaluator.evaluate_hand is not original
+        assert best_hand_evaluator.evaluate_hand is hand_evaluator.evaluate_hand
+        assert score_system.hand_score.__wrapped__ is instrumentation._originals["hand_score"]
+    assert not instrumentation.is_enabled()
+    assert hand_evaluator.evaluate_hand is original
+    assert best_hand_evaluator.evaluate_hand is original
+    assert rank_generator.generate_ranking is instrumentation._originals["generate_ranking"]
+
+
+def test_collected_statistics():
+    hands = [[(8, 0), (7, 0), (6, 0), (5, 0), (4, 0)],
+             [(8, 1), (2, 0), (3, 2), (4, 3), (5, 0)],
+             [(8, 0), (8, 1), (3, 0), (3, 2), (5, 0)],
+             [(8, 2), (7, 2), (6, 2), (3, 2), (2, 2)]]
+    with instrumentation.instrumented():
+        ranking, _ = rank_generator.generate_ranking(7, 4, 5)
+        for hand in hands:
+            sorted_hand, signature, *flags = hand_evaluator.evaluate_hand(hand, 8)
+            score_system.log_score([card[0] for card in sorted_hand], ranking[(signature, *flags)], 8)
+    stats = instrumentation.stats()
+    assert stats["calls"]["evaluate_hand"] == 4
+    assert stats["calls"]["log_score"] == 4
+    assert stats["calls"]["generate_ranking"] == 1
+    assert stats["signatures"] == {(1, 1, 1, 1, 1): 3, (2, 2, 1): 1}
+    assert stats["branches"] == {"royal_flush": 1, "wheel": 1, "straight": 1, "flush": 1}
+    assert "hand_score" not in stats["calls"]
+    assert stats["stages"]["sort"]["count"] == 4
+    assert stats["stages"]["frequency_sort"]["count"] == 1
+    assert stats["stages"]["wheel"]["count"] == 2
+    assert stats["stages"]["generate_ranking"]["count"] == 1
+
+    hand_evaluator.evaluate_hand(hands[0], 8)
+    assert instrumentation.stats()["calls"]["evaluate_hand"] == 4
+
+    assert json.loads(instrumentation.to_json())["signatures"] == {"1,1,1,1,1": 3, "2,2,1": 1}
+    text = instrumentation.to_prometheus()
+    assert "# TYPE poker_calls_total counter" in text
+    assert 'poker_calls_total{function="evaluate_hand"} 4' in text
+    assert 'poker_branches_total{branch="wheel"} 1' in text
+
+    with instrumentation.instrumented():
+        score_system.hand_score([8, 7, 6, 5, 4], 3, 8)
+        score_system.log_score([8, 7, 6, 5, 4], 3, 8)
+    assert instrumentation.stats()["calls"] == {"hand_score": 1, "log_score": 1}
+
+    instrumentation.reset()
+    assert instrumentation.stats() == {"calls": {}, "stages": {}, "signatures": {}, "branches": {}}
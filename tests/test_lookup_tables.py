@@ -0,0 +1,72 @@
+import pytest
+import random
+from itertools import combinations
+from src.hand_evaluator import evaluate_hand
+from src.rank_generator import generate_ranking
+from src.score_system import hand_score
+from src.bitmask_evaluator import encode_hand
+from src.combinatorial_utils import n_choose_k
+from src.lookup_tables import (
+    binomial_table,
+    combination_index,
+    multiset_index,
+    build_lookup_tables,
+    LookupEvaluator,
+)
+
+
+def pipeline_score(cards, values, suits, size, royal_flush=True, dual_ace=True):
+    ace = values + 1
+    ranking, _ = generate_ranking(values, suits, size, royal_flush, dual_ace)
+    sorted_hand, frequencies, is_straight, is_flush, is_royal_flush = \
+        evaluate_hand(cards, ace, royal_flush, dual_ace)
+    hand_rank = ranking[(frequencies, is_straight, is_flush, is_royal_flush)]
+    return hand_score([card[0] for card in sorted_hand], hand_rank, ace)
+
+
+def test_indexes_are_minimal_perfect_hashes():
+    binomials = binomial_table(10, 3)
+    sets = {combination_index(list(c), binomials) for c in combinations(range(8), 3)}
+    assert sets == set(range(n_choose_k(8, 3)))
+    multisets = set()
+    for c in combinations(range(10), 3):
+        multisets.add(multiset_index([x - i for i, x in enumerate(c)], binomials))
+    assert multisets == set(range(n_choose_k(10, 3)))
+
+
+def test_build_lookup_tables_sizes():
+    flush_table, non_flush_table = build_lookup_tables(13, 4, 5)
+    assert len(flush_table) == n_choose_k(13, 5)
+    assert len(non_flush_table) == n_choose_k(17, 5)
+    assert all(score > 0 for score in flush_table)
+
+
+@pytest.mark.parametrize("values, suits, size", [
+    (5, 2, 3), (6, 3, 4), (7, 2, 5), (5, 4, 5), (6, 1, 3), (4, 3, 2),
+])
+@pytest.mark.parametrize("royal_flush, dual_ace", [(True, True), (False, False)])
+def test_lookup_matches_pipeline(values, suits, size, royal_flush, dual_ace):
+    evaluator = LookupEvaluator(values, suits, size, royal_flush, dual_ace)
+    deck = [(v, s) for v in range(2, values + 2) for s in range(suits)]
+    for hand in combinations(deck, size):
+        expected = pipeline_score(list(hand), values, suits, size, royal_flush, dual_ace)
+        assert evaluator.score(list(hand)) == expected
+        assert evaluator.score_encoded(encode_hand(hand, range(suits))) == expected
+
+
+def test_lookup_matches_pipeline_standard_deck():
+    evaluator = LookupEvaluator(13, 4, 5)
+    deck = [(v, s) for v in range(2, 15) for s in 'cdhs']
+    rng = random.Random(7)
+    for _ in range(2000):
+        hand = rng.sample(deck, 5)
+        assert evaluator.score(hand) == pipeline_score(hand, 13, 4, 5)
+
+
+def test_from_tables_matches_built_evaluator():
+    built = LookupEvaluator(6, 3, 4, main_ace_value=9)
+    evaluator = LookupEvaluator.from_tables(6, 3, 4, *build_lookup_tables(6, 3, 4, main_ace_value=9),
+                                            main_ace_value=9)
+    deck = [(v, s) for v in range(4, 10) for s in range(3)]
+    for hand in combinations(deck, 4):
+        assert evaluator.score(list(hand)) == built.score(list(hand))
@@ -0,0 +1,42 @@
+import pytest
+from itertools import islice
+from src.deck_config import DeckConfig
+
+np = pytest.importorskip("numpy")
+from src.equity import equity  # noqa: E402
+from src.monte_carlo import deal_boards, iter_equity_estimates, monte_carlo_equity  # noqa: E402
+
+
+def test_deal_boards():
+    remaining = np.arange(10, 30)
+    boards = deal_boards(remaining, 4, 1000, np.random.default_rng(0))
+    assert boards.shape == (1000, 4)
+    assert np.isin(boards, remaining).all()
+    assert all(len(set(row)) == 4 for row in boards.tolist())
+
+
+def test_monte_carlo_close_to_exact_equity():
+    config = DeckConfig(values=8, suits=4, size=5)
+    players = [[(9, 0), (9, 1)], [(8, 2), (7, 2)], [(2, 0), (3, 3)]]
+    exact, _, _, _ = equity(players, config=config, workers=1)
+    estimates, half_widths, samples = monte_carlo_equity(players, config=config, target_error=0.004,
+                                                         batch_size=5000, seed=1)
+    assert samples >= 5000
+    for estimate, half_width, expected in zip(estimates, half_widths, exact):
+        assert abs(estimate - expected) <= 2 * half_width
+
+
+def test_monte_carlo_reproducible_streams():
+    config = DeckConfig(values=8, suits=4, size=5)
+    players = [[(9, 0), (9, 1)], [(8, 2), (7, 2)]]
+    serial = list(islice(iter_equity_estimates(players, config=config, batch_size=2000, seed=7), 2))
+    parallel = next(iter_equity_estimates(players, config=config, batch_size=2000, seed=7, workers=2))
+    assert serial[1] == parallel
+    again = next(iter_equity_estimates(players, config=config, batch_size=2000, seed=7))
+    assert again == serial[0]
+
+
+def test_monte_carlo_max_samples():
+    players = [[(14, 0), (14, 1)], [(13, 2), (12, 2)]]
+    _, _, samples = monte_carlo_equity(players, target_error=0, max_samples=3000, batch_size=1000, seed=3)
+    assert samples == 3000
@@ -0,0 +1,53 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.parameter_sweep import COLUMNS, category_ranks, sweep  # noqa: E402
+from src.rank_generator import compute_ranking  # noqa: E402
+
+
+def table(result):
+    rows = {}
+    for i in range(len(result["rank"])):
+        config = tuple(result[column][i].item() for column in COLUMNS[:5])
+        category = (result["frequency_signature"][i],) + \
+            tuple(bool(result[column][i]) for column in ("is_straight", "is_flush", "is_royal_flush"))
+        rows.setdefault(config, {})[category] = (result["count"][i], int(result["rank"][i]))
+    return rows
+
+
+def test_sweep_matches_compute_ranking():
+    result = sweep(range(1, 12), range(1, 6), range(1, 8), (True, False), (True, False), workers=1)
+    assert set(result) == set(COLUMNS)
+    rows = table(result)
+    assert len(rows) == 11 * 5 * 7 * 4
+    for config, categories in rows.items():
+        ranking, counts = compute_ranking(*config)
+        assert categories == {key: (counts[key], ranking[key]) for key in counts}
+
+
+def test_sweep_exact_large_counts_and_workers():
+    serial = sweep([13, 52], [4, 8], [5, 13], workers=1)
+    parallel = sweep([13, 52], [4, 8], [5, 13], workers=2)
+    assert table(serial) == table(parallel)
+    ranking, counts = compute_ranking(52, 8, 13)
+    assert table(serial)[(52, 8, 13, True, True)] == {key: (counts[key], ranking[key]) for key in counts}
+    assert max(serial["count"]) > 2 ** 64
+
+
+def test_category_ranks_ties_and_absent_types():
+    counts = np.array([[5, 7, 5, 1], [2, 2, 2, 2]], dtype=object)
+    present = np.array([[True, True, True, True], [True, False, True, True]])
+    assert category_ranks(counts, present).tolist() == [[1, 0, 2, 3], [0, -1, 1, 2]]
+
+
+def test_empty_sweep():
+    assert all(len(column) == 0 for column in sweep([13], [4], []).values())
+
+
+def test_sweep_large_hand_sizes():
+    result = sweep([13, 20], [4, 5], [30, 45], workers=1)
+    rows = table(result)
+    for config in [(20, 5, 30, True, True), (13, 4, 45, True, True)]:
+        ranking, counts = compute_ranking(*config)
+        assert rows[config] == {key: (counts[key], ranking[key]) for key in counts}
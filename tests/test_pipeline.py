@@ -0,0 +1,117 @@
+import importlib
+import io
+import json
+import os
+import runpy
+import tracemalloc
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.batch_evaluator import random_hands  # noqa: E402
+from src.deck_config import DeckConfig  # noqa: E402
+from src.hand_evaluator import evaluate_hand  # noqa: E402
+from src.pipeline import main, run_pipeline  # noqa: E402
+from src.score_system import hand_score  # noqa: E402
+
+
+def to_csv(hands):
+    return "".join(",".join(map(str, hand)) + "\n" for hand in hands.tolist())
+
+
+def test_csv_matches_hand_score():
+    config = DeckConfig()
+    ranking, _ = config.ranking()
+    hands = random_hands(500, 13, 4, 5, rng=np.random.default_rng(0))
+    sink = io.StringIO()
+    stats = run_pipeline(io.StringIO(to_csv(hands)), sink, config, chunk_size=64)
+    assert stats["hands"] == 500 and stats["chunks"] == 8
+    for hand, line in zip(hands.tolist(), sink.getvalue().splitlines()):
+        sorted_hand, *key = evaluate_hand([(code // 4, code % 4) for code in hand], 14)
+        values = [card[0] for card in sorted_hand]
+        assert line == ",".join(map(str, [hand_score(values, ranking[tuple(key)], 14), ranking[tuple(key)]] + values))
+
+
+@pytest.mark.parametrize("output_format", ["csv", "ndjson"])
+def test_seven_card_scores_are_exact(output_format):
+    config = DeckConfig(13, 4, 7)
+    ranking, _ = config.ranking()
+    hands = random_hands(300, 13, 4, 7, rng=np.random.default_rng(2))
+    sink = io.StringIO()
+    run_pipeline(io.StringIO(to_csv(hands)), sink, config, output_format=output_format, chunk_size=100)
+    for hand, line in zip(hands.tolist(), sink.getvalue().splitlines()):
+        sorted_hand, *key = evaluate_hand([(code // 4, code % 4) for code in hand], 14)
+        score = hand_score([card[0] for card in sorted_hand], ranking[tuple(key)], 14)
+        assert (json.loads(line)["score"] if output_format == "ndjson" else line.split(",")[0]) == \
+            (score if output_format == "ndjson" else str(score))
+
+
+def test_formats_and_workers_agree():
+    config = DeckConfig(9, 4, 6)
+    hands = random_hands(3000, 9, 4, 6, rng=np.random.default_rng(1))
+    binary_out = io.BytesIO()
+    run_pipeline(io.BytesIO(hands.astype("<u2").tobytes()), binary_out, config, "binary", "binary", chunk_size=500)
+    records = np.frombuffer(binary_out.getvalue(),
+                            dtype=[("score", "<i8"), ("category", "<i4"), ("sorted_values", "<i2", (6, ))])
+    lines = "".join(json.dumps({"hand": hand}) + "\n" for hand in hands.tolist())
+    ndjson_out = io.StringIO()
+    run_pipeline(io.StringIO(lines), ndjson_out, config, "ndjson", "ndjson", chunk_size=700, workers=2)
+    results = [json.loads(line) for line in ndjson_out.getvalue().splitlines()]
+    assert [result["score"] for result in results] == records["score"].tolist()
+    assert [result["category"] for result in results] == records["category"].tolist()
+    assert [result["sorted_values"] for result in results] == records["sorted_values"].tolist()
+
+
+def test_invalid_input():
+    with pytest.raises(ValueError):
+        run_pipeline(io.StringIO("8,9,10,11,60\n"), io.StringIO())
+    with pytest.raises(ValueError):
+        run_pipeline(io.StringIO("8,9,10,11,11\n"), io.StringIO())
+    with pytest.raises(ValueError):
+        run_pipeline(io.BytesIO(b"\x08\x00\x09"), io.BytesIO(), input_format="binary", output_format="binary")
+    with pytest.raises(ValueError):
+        run_pipeline(io.StringIO(), io.BytesIO(), DeckConfig(26, 8, 7), output_format="binary")
+
+
+class NullSink:
+    def write(self, data):
+        pass
+
+    def flush(self):
+        pass
+
+
+def test_memory_does_not_grow_with_input():
+    peaks = []
+    for n in (5000, 50000):
+        source = io.BytesIO(random_hands(n, 13, 4, 5, rng=np.random.default_rng(n)).astype("<u2").tobytes())
+        tracemalloc.start()
+        run_pipeline(source, NullSink(), input_format="binary", output_format="csv", chunk_size=1000)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    assert peaks[1] < 1.5 * peaks[0]
+
+
+def test_main_files(tmp_path, capsys):
+    (tmp_path / "hands.csv").write_text("8,9,10,11,12\n40,44,48,52,56\n")
+    main([str(tmp_path / "hands.csv"), "-o", str(tmp_path / "scores.ndjson"), "--output-format", "ndjson",
+          "--workers", "1"])
+    results = [json.loads(line) for line in (tmp_path / "scores.ndjson").read_text().splitlines()]
+    assert [result["sorted_values"] for result in results] == [[2, 2, 2, 2, 3], [14, 13, 12, 11, 10]]
+    assert "2 hands" in capsys.readouterr().err
+
+
+def test_console_script_entry_point_imports(monkeypatch):
+    setuptools = pytest.importorskip("setuptools")
+    arguments = {}
+    monkeypatch.setattr(setuptools, "setup", lambda **kwargs: arguments.update(kwargs))
+    runpy.run_path(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "setup.py"))
+    assert arguments["package_dir"] == {"poker_evaluator": "src"}
+    for script in arguments["entry_points"]["console_scripts"]:
+        module, function = script.split("=")[1].split(":")
+        package, _, name = module.partition(".")
+        assert package in arguments["packages"]
+        # the installed package is the src directory of the checkout
+        module = f"{arguments['package_dir'][package]}.{name}"
+        assert callable(getattr(importlib.import_module(module), function))
@@ -1,3 +1,6 @@
+import json
+import math
+
 import pytest
 from src.rank_generator import (
     royal_flushes,
@@ -5,7 +8,15 @@ from src.rank_generator import (
     flush_hands,
     straight_hands,
     repeated_value_hands,
+    log_repeated_value_hands,
+    hand_probabilities,
     generate_ranking,
+    compute_ranking,
+    partition_order,
+    set_cache_dir,
+    cache_info,
+    clear_cache,
+    CACHE_VERSION,
 )
 
 
@@ -81,3 +92,134 @@ def test_generate_ranking_with_royal_flush_disabled():
     ranking, counts = generate_ranking(5, 2, 3, royal_flush=False)
     # no royal flush key present
     assert not any(k[-1] for k in counts.keys())
+
+
+def test_generate_ranking_large_hand_size():
+    ranking, counts = compute_ranking(60, 4, 50)
+    assert len(ranking) == len(counts)
+    assert all(max(hand[0]) <= 4 and len(hand[0]) <= 60 for hand in counts)
+
+
+def test_generate_ranking_memory_cache():
+    clear_cache()
+    first = generate_ranking(13, 4, 5)
+    second = generate_ranking(13, 4, 5)
+    assert first == second == compute_ranking(13, 4, 5)
+    info = cache_info()
+    assert info["misses"] == 1 and info["hits"] == 1 and info["size"] == 1
+    # returned dictionaries are copies
+    first[0].clear()
+    assert generate_ranking(13, 4, 5)[0] == second[0]
+
+
+def test_generate_ranking_disk_cache(tmp_path):
+    clear_cache()
+    set_cache_dir(str(tmp_path))
+    try:
+        expected = generate_ranking(7, 3, 4, royal_flush=False)
+        assert cache_info()["disk_writes"] == 1
+        assert len(list(tmp_path.iterdir())) == 1
+        clear_cache()
+        assert generate_ranking(7, 3, 4, royal_flush=False) == expected
+        assert cache_info()["disk_hits"] == 1
+    finally:
+        set_cache_dir(None)
+        clear_cache()
+
+
+def test_generate_ranking_disk_cache_version_mismatch(tmp_path):
+    clear_cache()
+    set_cache_dir(str(tmp_path))
+    try:
+        generate_ranking(6, 2, 3)
+        path = next(tmp_path.iterdir())
+        path.write_text('{"version": 0, "hands": []}')
+        clear_cache()
+        assert generate_ranking(6, 2, 3) == compute_ranking(6, 2, 3)
+        assert cache_info()["disk_hits"] == 0
+    finally:
+        set_cache_dir(None)
+        clear_cache()
+
+
+@pytest.mark.parametrize("payload", [[1, 2], None, {"version": CACHE_VERSION},
+                                     {"version": CACHE_VERSION, "hands": [[1]]}, {"version": CACHE_VERSION, "hands": 3}])
+def test_generate_ranking_disk_cache_malformed(tmp_path, payload):
+    clear_cache()
+    set_cache_dir(str(tmp_path))
+    try:
+        generate_ranking(6, 2, 3)
+        next(tmp_path.iterdir()).write_text(json.dumps(payload))
+        clear_cache()
+        assert generate_ranking(6, 2, 3) == compute_ranking(6, 2, 3)
+        assert cache_info()["disk_hits"] == 0
+    finally:
+        set_cache_dir(None)
+        clear_cache()
+
+
+def test_generate_ranking_unwritable_cache_dir(tmp_path):
+    clear_cache()
+    (tmp_path / "file").write_text("")
+    set_cache_dir(str(tmp_path / "file" / "cache"))
+    try:
+        assert generate_ranking(6, 2, 3) == compute_ranking(6, 2, 3)
+        assert cache_info()["disk_writes"] == 0
+    finally:
+        set_cache_dir(None)
+        clear_cache()
+
+
+def test_log_repeated_value_hands():
+    for signature in [(1, 1, 1, 1, 1), (2, 1, 1, 1), (3, 2), (4, 1), (2, 2, 2, 1)]:
+        assert log_repeated_value_hands(13, 4, signature) == \
+               pytest.approx(math.log(repeated_value_hands(13, 4, signature)))
+
+
+@pytest.mark.parametrize("config", [(13, 4, 5, True, True), (13, 4, 7, False, True), (6, 3, 4, True, False),
+                                    (300, 6, 40, True, True)])
+def test_hand_probabilities_match_counts(config):
+    _, counts = compute_ranking(*config)
+    probabilities = hand_probabilities(*config)
+    total = math.comb(config[0] * config[1], config[2])
+    assert probabilities.keys() == counts.keys()
+    for key, count in counts.items():
+        assert probabilities[key] == pytest.approx(count / total, rel=1e-9, abs=1e-300)
+
+
+HIGH_5, HIGH_7 = (1, 1, 1, 1, 1), (1, 1, 1, 1, 1, 1, 1)
+
+
+@pytest.mark.parametrize("config, expected", [
+    ((6, 2, 5, True, False), [((2, 1, 1, 1), False, False, False), (HIGH_5, False, False, False),
+                              ((2, 2, 1), False, False, False), (HIGH_5, True, False, False),
+                              (HIGH_5, False, True, False), (HIGH_5, True, True, False), (HIGH_5, True, True, True)]),
+    ((6, 2, 5, False, False), [((2, 1, 1, 1), False, False, False), (HIGH_5, False, False, False),
+                               ((2, 2, 1), False, False, False), (HIGH_5, True, False, False),
+                               (HIGH_5, False, True, False), (HIGH_5, True, True, False)]),
+    ((2, 5, 4, True, True), [((2, 2), False, False, False), ((3, 1), False, False, False), ((4, ), False, False, False),
+                             ((1, 1, 1, 1), True, True, False), ((1, 1, 1, 1), False, True, False),
+                             ((1, 1, 1, 1), True, False, False), ((1, 1, 1, 1), True, True, True)]),
+    ((3, 5, 7, True, True), [((3, 2, 2), False, False, False), ((3, 3, 1), False, False, False),
+                             ((4, 2, 1), False, False, False), ((4, 3), False, False, False),
+                             ((5, 1, 1), False, False, False), ((5, 2), False, False, False),
+                             (HIGH_7, True, True, False), (HIGH_7, False, True, False),
+                             (HIGH_7, True, False, False), (HIGH_7, True, True, True)]),
+    ((4, 3, 7, False, True), [((2, 2, 2, 1), False, False, False), ((3, 2, 1, 1), False, False, False),
+                              ((3, 2, 2), False, False, False), ((3, 3, 1), False, False, False),
+                              (HIGH_7, True, True, False), (HIGH_7, False, True, False), (HIGH_7, True, False, False)]),
+])
+def test_compute_ranking_tie_order(config, expected):
+    ranking, _ = compute_ranking(*config)
+    assert sorted(ranking, key=ranking.get) == expected
+
+
+@pytest.mark.parametrize("values, suits, size", [(9, 3, 6), (8, 3, 7), (14, 3, 9), (7, 3, 18), (7, 3, 19)])
+def test_tied_partitions_follow_partition_order(values, suits, size):
+    ranking, counts = compute_ranking(values, suits, size)
+    position = {partition: i for i, partition in enumerate(partition_order(size))}
+    partitions = [key for key in ranking if not any(key[1:])]
+    for a in partitions:
+        for b in partitions:
+            if counts[a] == counts[b] and position[a[0]] < position[b[0]]:
+                assert ranking[a] < ranking[b]
@@ -0,0 +1,57 @@
+from collections import Counter
+from itertools import combinations
+from math import comb
+
+import pytest
+from src.deck_config import DeckConfig
+from src.hand_evaluator import evaluate_hand
+from src.score_percentile import build_percentile_table, load_percentile_table, score_counts
+from src.score_system import hand_score
+
+
+def brute_force_counts(config):
+    ranking, _ = config.ranking()
+    counts = Counter()
+    for hand in combinations(config.deck(), config.size):
+        sorted_hand, *key = evaluate_hand(list(hand), config.ace_value, config.royal_flush, config.dual_ace,
+                                          config.replace_value, config.alt_ace_value)
+        counts[hand_score([card[0] for card in sorted_hand], ranking[tuple(key)], config.ace_value)] += 1
+    return dict(counts)
+
+
+@pytest.mark.parametrize("config", [DeckConfig(7, 3, 5), DeckConfig(6, 4, 4, False, False), DeckConfig(5, 1, 3),
+                                    DeckConfig(6, 2, 1), DeckConfig(5, 4, 5, replace_value=False)])
+def test_score_counts_match_brute_force(config):
+    assert score_counts(config) == brute_force_counts(config)
+
+
+def test_standard_deck():
+    table = build_percentile_table()
+    assert len(table.scores) == 7462
+    assert table.total == comb(52, 5)
+    assert table.percentile(table.scores[0]) == 0
+    assert table.hands_below(table.scores[-1]) == (comb(52, 5) - 4, 4)
+    assert table.percentile(table.scores[-1] + 1) == 1
+
+
+def test_percentile_between_scores():
+    table = build_percentile_table(DeckConfig(7, 3, 5))
+    below, tied = table.hands_below(table.scores[10])
+    assert tied == table.counts[10]
+    assert table.percentile(table.scores[10]) == below / table.total
+    assert table.percentile(table.scores[10] + 1) == (below + tied) / table.total
+
+
+def test_percentiles_vectorized():
+    np = pytest.importorskip("numpy")
+    table = build_percentile_table(DeckConfig(7, 3, 5))
+    scores = np.array([[table.scores[0], table.scores[5]], [table.scores[-1] + 1, table.scores[7] + 1]])
+    expected = [[table.percentile(int(score)) for score in row] for row in scores]
+    assert table.percentiles(scores).tolist() == expected
+
+
+def test_save_and_load(tmp_path):
+    table = build_percentile_table(DeckConfig(9, 4, 6))
+    table.save(str(tmp_path / "table.json"))
+    loaded = load_percentile_table(str(tmp_path / "table.json"))
+    assert loaded.scores == table.scores and loaded.below == table.below
@@ -1,5 +1,8 @@
 import pytest
-from src.score_system import hand_score, log_score
+import random
+from src.score_system import hand_score, log_score, power_table, ScoreEngine
+from src.hand_evaluator import evaluate_hand
+from src.rank_generator import generate_ranking
 
 
 def test_hand_score_royal_flush():
@@ -42,3 +45,41 @@ def test_log_score_high_card():
     score = log_score(values, hand_rank, ace_value)
     assert isinstance(score, float)
     assert score > 0
+
+
+def test_power_table():
+    assert power_table(14, 5, 9) == tuple(15 ** e for e in range(14))
+
+
+def test_score_engine_matches_hand_score():
+    engine = ScoreEngine(14, 5, 9)
+    assert engine.packable
+    assert engine.score([14, 13, 12, 11, 10], 9) == 29043958007812500
+    assert engine.score([5, 4, 3, 2, 14], 0) == 267344
+    packed = engine.packed_score([14, 13, 12, 11, 10], 9)
+    assert packed < 2 ** 64
+    assert engine.unpack(packed) == (9, engine.kicker([14, 13, 12, 11, 10]))
+    assert engine.to_hand_score(packed) == 29043958007812500
+    assert engine.pack_hand_score(29043958007812500) == packed
+    assert engine.pack_hand_score(0) == 0
+
+
+def test_packed_scores_keep_ordering():
+    ranking, _ = generate_ranking(13, 4, 7)
+    engine = ScoreEngine(14, 7, max(ranking.values()))
+    deck = [(v, s) for v in range(2, 15) for s in range(4)]
+    rng = random.Random(3)
+    scores, packed = [], []
+    for _ in range(3000):
+        sorted_hand, frequencies, is_straight, is_flush, is_royal_flush = evaluate_hand(rng.sample(deck, 7), 14)
+        values = [card[0] for card in sorted_hand]
+        hand_rank = ranking[(frequencies, is_straight, is_flush, is_royal_flush)]
+        scores.append(hand_score(values, hand_rank, 14))
+        packed.append(engine.packed_score(values, hand_rank))
+        assert engine.score(values, hand_rank) == scores[-1]
+    order = sorted(range(len(scores)), key=scores.__getitem__)
+    assert sorted(range(len(packed)), key=packed.__getitem__) == order
+
+
+def test_score_engine_large_deck_not_packable():
+    assert not ScoreEngine(200, 30, 500).packable
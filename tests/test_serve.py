@@ -0,0 +1,163 @@
+import asyncio
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.batch_evaluator import evaluate_batch, random_hands  # noqa: E402
+from src.deck_config import DeckConfig  # noqa: E402
+from src.hand_evaluator import evaluate_hand  # noqa: E402
+from src.score_system import hand_score  # noqa: E402
+from src.serve import HandService, request_binary, request_ndjson, start_server  # noqa: E402
+
+
+CONFIG = DeckConfig(13, 4, 5)
+
+
+def expected(hands):
+    ranking, _ = CONFIG.ranking()
+    result = evaluate_batch(hands, CONFIG.values, CONFIG.suits, ranking=ranking)
+    return result['score'].tolist(), result['hand_rank'].tolist()
+
+
+def run_with_server(protocol, client, tmp_path, config=CONFIG, limit=2 ** 24, **kwargs):
+    async def main():
+        service = HandService(config, **kwargs)
+        path = str(tmp_path / "serve.sock")
+        server, batching = await start_server(service, protocol, path=path, limit=limit)
+        try:
+            return await client(service, path)
+        finally:
+            server.close()
+            await server.wait_closed()
+            batching.cancel()
+    return asyncio.run(main())
+
+
+def test_ndjson_concurrent_requests_are_coalesced(tmp_path):
+    hands = [random_hands(50, 13, 4, 5, rng=np.random.default_rng(seed)) for seed in range(8)]
+
+    async def client(service, path):
+        async def one(batch):
+            reader, writer = await asyncio.open_unix_connection(path)
+            response = await request_ndjson(reader, writer, {"hands": batch.tolist()})
+            writer.close()
+            await writer.wait_closed()
+            return response
+        responses = await asyncio.gather(*(one(batch) for batch in hands))
+        reader, writer = await asyncio.open_unix_connection(path)
+        stats = await request_ndjson(reader, writer, {"stats": True})
+        writer.close()
+        await writer.wait_closed()
+        return responses, stats
+
+    responses, stats = run_with_server("ndjson", client, tmp_path, max_delay=0.05)
+    for batch, response in zip(hands, responses):
+        scores, categories = expected(batch)
+        assert response == {"scores": scores, "categories": categories}
+    assert stats["hands"] == 400
+    assert stats["batches"] < 8
+    assert 0 <= stats["p50"] <= stats["p99"] <= stats["max"]
+
+
+def test_ndjson_errors(tmp_path):
+    async def client(service, path):
+        reader, writer = await asyncio.open_unix_connection(path)
+        responses = [await request_ndjson(reader, writer, {"hands": [[8, 9, 10, 11]]}),
+                     await request_ndjson(reader, writer, {"hands": [[8, 8, 10, 11, 12]]}),
+                     await request_ndjson(reader, writer, {"hands": [[8, 9, 10, 11, 60]]}),
+                     await request_ndjson(reader, writer, {"cards": []}),
+                     await request_ndjson(reader, writer, {"hands": [[8, 9, 10, 11, 12]]})]
+        writer.close()
+        await writer.wait_closed()
+        return responses
+
+    responses = run_with_server("ndjson", client, tmp_path)
+    assert all("error" in response for response in responses[:4])
+    assert responses[4]["scores"] == expected(np.array([[8, 9, 10, 11, 12]]))[0]
+
+
+def test_ndjson_large_requests_and_exact_scores(tmp_path):
+    config = DeckConfig(13, 4, 7)
+    hands = random_hands(4000, 13, 4, 7, rng=np.random.default_rng(2))
+
+    async def client(service, path):
+        reader, writer = await asyncio.open_unix_connection(path, limit=2 ** 24)
+        response = await request_ndjson(reader, writer, {"hands": hands.tolist()})
+        writer.close()
+        await writer.wait_closed()
+        return response
+
+    response = run_with_server("ndjson", client, tmp_path, config=config)
+    ranking, _ = config.ranking()
+    for hand, score, category in zip(hands.tolist()[::40], response["scores"][::40], response["categories"][::40]):
+        sorted_hand, signature, *special = evaluate_hand([(code // 4, code % 4) for code in hand], 14)
+        assert category == ranking[(signature, *special)]
+        assert score == hand_score([card[0] for card in sorted_hand], category, 14)
+
+
+def test_ndjson_line_over_limit(tmp_path):
+    hands = random_hands(200, 13, 4, 5, rng=np.random.default_rng(3))
+
+    async def client(service, path):
+        reader, writer = await asyncio.open_unix_connection(path)
+        response = await request_ndjson(reader, writer, {"hands": hands.tolist()})
+        closed = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+        await writer.wait_closed()
+        return response, closed
+
+    response, closed = run_with_server("ndjson", client, tmp_path, limit=1024)
+    assert "error" in response
+    assert closed == b""
+
+
+def test_binary_protocol(tmp_path):
+    hands = random_hands(1000, 13, 4, 5, rng=np.random.default_rng(0))
+
+    async def client(service, path):
+        reader, writer = await asyncio.open_unix_connection(path)
+        results = [await request_binary(reader, writer, hands[:400]),
+                   await request_binary(reader, writer, hands[400:])]
+        writer.close()
+        await writer.wait_closed()
+        return results
+
+    results = run_with_server("binary", client, tmp_path)
+    scores = np.concatenate([result[0] for result in results])
+    categories = np.concatenate([result[1] for result in results])
+    assert (scores.tolist(), categories.tolist()) == expected(hands)
+
+
+@pytest.mark.parametrize("request_bytes", [
+    (400).to_bytes(4, "little") + bytes(10),  # truncated body
+    (2 ** 32 - 1).to_bytes(4, "little"),  # more hands than max_batch
+])
+def test_binary_protocol_closes_bad_requests(tmp_path, request_bytes):
+    async def client(service, path):
+        reader, writer = await asyncio.open_unix_connection(path)
+        writer.write(request_bytes)
+        await writer.drain()
+        writer.write_eof()
+        response = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+        await writer.wait_closed()
+        reader, writer = await asyncio.open_unix_connection(path)
+        hands = random_hands(10, 13, 4, 5, rng=np.random.default_rng(1))
+        result = await request_binary(reader, writer, hands)
+        writer.close()
+        await writer.wait_closed()
+        return response, result, hands
+
+    response, (scores, categories), hands = run_with_server("binary", client, tmp_path, max_batch=1000)
+    assert response == b""
+    assert (scores.tolist(), categories.tolist()) == expected(hands)
+
+
+def test_binary_protocol_needs_exact_scores(tmp_path):
+    service = HandService(DeckConfig(40, 4, 12))
+
+    async def main():
+        with pytest.raises(ValueError):
+            await start_server(service, "binary", path=str(tmp_path / "serve.sock"))
+    asyncio.run(main())
@@ -0,0 +1,58 @@
+import random
+from itertools import combinations
+
+from src.deck_config import DeckConfig
+from src.hand_evaluator import evaluate_hand
+from src.rank_generator import generate_ranking
+from src.score_system import hand_score
+from src.showdown import compare, hand_strength, showdown
+
+
+def best_score(cards, config, ranking):
+    best = 0
+    for hand in combinations(cards, config.size):
+        sorted_hand, *key = evaluate_hand(list(hand), config.ace_value)
+        best = max(best, hand_score([card[0] for card in sorted_hand], ranking[tuple(key)], config.ace_value))
+    return best
+
+
+def test_strength_order_matches_scores():
+    config = DeckConfig(8, 4, 5)
+    ranking, _ = generate_ranking(8, 4, 5)
+    hands = list(combinations(config.deck(), 5))[::97]
+    by_strength = sorted(hands, key=lambda hand: hand_strength(list(hand), config, ranking)[0])
+    scores = [best_score(hand, config, ranking) for hand in by_strength]
+    assert scores == sorted(scores)
+
+
+def test_compare():
+    board = [(13, 0), (9, 1), (9, 2), (4, 3), (2, 0)]
+    assert compare([(14, 1), (13, 1)], [(13, 2), (12, 2)], board) == 1
+    assert compare([(3, 1), (3, 2)], [(14, 1), (14, 2)], board) == -1
+    assert compare([(6, 1), (7, 2)], [(6, 2), (7, 1)], board) == 0
+    assert compare([(14, 0), (13, 0), (12, 0), (11, 0), (10, 0)], [(14, 1), (14, 2), (14, 3), (2, 1), (2, 2)]) == 1
+
+
+def test_showdown_groups_and_category():
+    board = [(14, 0), (13, 0), (7, 1), (7, 2), (2, 3)]
+    hands = [[(3, 1), (4, 1)], [(14, 1), (5, 2)], [(14, 2), (5, 1)], [(7, 0), (7, 3)], [(3, 0), (4, 2)]]
+    winners, groups, category = showdown(hands, board)
+    assert winners == [3]
+    assert groups == [[3], [1, 2], [0, 4]]
+    assert category == ((4, 1), False, False, False)
+
+
+def test_showdown_matches_scores():
+    config = DeckConfig(13, 4, 5)
+    ranking, _ = generate_ranking(13, 4, 5)
+    rng = random.Random(5)
+    for _ in range(200):
+        cards = rng.sample(config.deck(), 11)
+        hands, board = [cards[0:2], cards[2:4], cards[4:6]], cards[6:]
+        scores = [best_score(hand + board, config, ranking) for hand in hands]
+        winners, groups, _ = showdown(hands, board, config, ranking)
+        assert winners == [i for i, score in enumerate(scores) if score == max(scores)]
+        assert sorted(sum(groups, [])) == [0, 1, 2]
+        group_scores = [{scores[i] for i in group} for group in groups]
+        assert all(len(group) == 1 for group in group_scores)
+        assert [group.pop() for group in group_scores] == sorted(set(scores), reverse=True)
@@ -0,0 +1,64 @@
+from collections import Counter
+from itertools import combinations, permutations
+
+import pytest
+
+from src.combinatorial_utils import n_choose_k
+from src.deck_config import DeckConfig
+from src.hand_evaluator import evaluate_hand
+from src.hand_index import canonical_hand, canonical_index
+from src.rank_generator import generate_ranking
+from src.suit_isomorphism import (canonicalize, canonicalize_groups, isomorphic_variants, iter_canonical_hands,
+                                  suit_permutation)
+
+
+def test_canonicalize_is_suit_invariant():
+    config = DeckConfig(13, 4, 5, suit_labels=("s", "h", "d", "c"))
+    hand = [(14, "d"), (13, "d"), (9, "h"), (2, "c"), (2, "s")]
+    canonical, variants = canonicalize(hand, config)
+    assert canonical == [(2, "d"), (2, "c"), (9, "h"), (13, "s"), (14, "s")]
+    assert variants == 12
+    for permutation in permutations(config.labels):
+        relabel = dict(zip(config.labels, permutation))
+        assert canonicalize([(value, relabel[suit]) for value, suit in hand], config) == (canonical, variants)
+
+
+def test_canonicalize_matches_canonical_hand():
+    config = DeckConfig(5, 4, 4)
+    for hand in combinations(config.deck(), 4):
+        canonical, _ = canonicalize(list(hand), config)
+        assert canonical == canonical_hand(canonical_index(list(hand), config), config)
+
+
+@pytest.mark.parametrize("config", [DeckConfig(5, 3, 4), DeckConfig(4, 5, 4), DeckConfig(3, 6, 3)])
+def test_variants_count_equivalent_hands(config):
+    classes = Counter(tuple(canonicalize(list(hand), config)[0]) for hand in combinations(config.deck(), config.size))
+    for canonical, count in classes.items():
+        assert isomorphic_variants([list(canonical)], config) == count
+    hands = list(iter_canonical_hands(config))
+    assert len(hands) == len(classes)
+    assert sum(variants for _, variants in hands) == n_choose_k(config.values * config.suits, config.size)
+
+
+def test_canonical_hands_reproduce_ranking_counts():
+    config = DeckConfig(6, 4, 5)
+    _, counts = generate_ranking(config.values, config.suits, config.size)
+    found = Counter()
+    for cards, variants in iter_canonical_hands(config):
+        _, signature, straight, flush, royal = evaluate_hand(cards, config.ace_value)
+        found[(signature, straight, flush, royal)] += variants
+    assert found == {key: count for key, count in counts.items() if count}
+
+
+def test_canonicalize_groups():
+    config = DeckConfig(13, 4, 5)
+    hole, board = [(14, 2), (14, 3)], [(10, 3), (9, 3), (2, 0)]
+    (canonical_hole, canonical_board), variants = canonicalize_groups([hole, board], config)
+    assert canonical_hole == [(14, 0), (14, 1)]
+    assert canonical_board == [(2, 2), (9, 0), (10, 0)]
+    assert variants == 24
+    assert suit_permutation([hole, board], config) == {3: 0, 2: 1, 0: 2, 1: 3}
+    # same cards, different split between hole cards and board
+    other, _ = canonicalize_groups([[(14, 2), (10, 3)], [(14, 3), (9, 3), (2, 0)]], config)
+    assert other != [canonical_hole, canonical_board]
+    assert isomorphic_variants([[(14, 0), (14, 1)], []], config) == 6
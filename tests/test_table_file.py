@@ -0,0 +1,120 @@
+import random
+import struct
+import zlib
+from itertools import combinations
+
+import pytest
+
+from src.deck_config import DeckConfig
+from src.lookup_tables import LookupEvaluator, build_lookup_tables
+from src.score_system import ScoreEngine
+from src.table_file import FORMAT_VERSION, MappedTables, load_evaluator, write_tables
+
+
+CONFIG = DeckConfig(8, 4, 5)
+
+
+@pytest.fixture
+def table_path(tmp_path):
+    path = str(tmp_path / "tables.bin")
+    write_tables(path, CONFIG)
+    return path
+
+
+def test_mapped_tables_match_built_tables(table_path):
+    flush_table, non_flush_table = build_lookup_tables(8, 4, 5)
+    with MappedTables(table_path, CONFIG, verify=True) as tables:
+        assert tables.config == CONFIG._replace(main_ace_value=9)
+        assert tables.flush_scores.tolist() == flush_table
+        assert tables.non_flush_scores.tolist() == non_flush_table
+        assert tables.flush_table.tolist() == [tables.engine.pack_hand_score(score) for score in flush_table]
+        assert tables.verify()
+
+
+def test_loaded_evaluator_scores(table_path):
+    evaluator, tables = load_evaluator(table_path)
+    reference = LookupEvaluator(8, 4, 5)
+    for hand in combinations(CONFIG.deck()[::3], 5):
+        assert evaluator.score(list(hand)) == reference.score(list(hand))
+    assert not hasattr(evaluator, "tables")
+    tables.close()
+
+
+def test_numpy_arrays_share_the_mapping(table_path):
+    np = pytest.importorskip("numpy")
+    tables = MappedTables(table_path)
+    flush_array, non_flush_array = tables.arrays()
+    assert flush_array.tolist() == tables.flush_table.tolist()
+    assert non_flush_array.tolist() == tables.non_flush_table.tolist()
+    assert flush_array.dtype == np.dtype("<u8")
+    assert not non_flush_array.flags.writeable
+    assert not non_flush_array.flags.owndata
+    del flush_array, non_flush_array
+    tables.close()
+    assert np is not None
+
+
+def test_integrity_checks(table_path):
+    with open(table_path, "rb") as file:
+        data = bytearray(file.read())
+
+    def reopen(content, **kwargs):
+        with open(table_path, "wb") as file:
+            file.write(content)
+        MappedTables(table_path, **kwargs).close()
+
+    with pytest.raises(ValueError, match="tables of"):
+        reopen(data, config=DeckConfig(9, 4, 5))
+    with pytest.raises(ValueError, match="not a score table"):
+        reopen(b"x" + data[1:])
+    with pytest.raises(ValueError, match="version"):
+        reopen(data[:8] + (FORMAT_VERSION + 1).to_bytes(4, "little") + data[12:])
+    header = data[:16] + b"<i8\0" + data[20:92]
+    with pytest.raises(ValueError, match="table type"):
+        reopen(header + zlib.crc32(header).to_bytes(4, "little") + data[96:])
+    with pytest.raises(ValueError, match="header"):
+        reopen(data[:20] + b"\x07" + data[21:])
+    with pytest.raises(ValueError, match="truncated"):
+        reopen(data[:-8])
+
+    corrupted = data[:-1] + bytes([data[-1] ^ 1])
+    reopen(corrupted)
+    with pytest.raises(ValueError, match="corrupted tables"):
+        reopen(corrupted, verify=True)
+
+
+def test_seven_card_tables(tmp_path):
+    config = DeckConfig(13, 4, 7)
+    path = str(tmp_path / "seven.bin")
+    write_tables(path, config)
+    evaluator, tables = load_evaluator(path, config, verify=True)
+    reference = LookupEvaluator(13, 4, 7)
+    rng = random.Random(0)
+    for _ in range(2000):
+        hand = rng.sample(config.deck(), 7)
+        assert evaluator.score(hand) == reference.score(hand)
+    assert max(reference.non_flush_table) >= 2 ** 63
+    tables.close()
+
+
+def test_packed_scores_must_fit_64_bits(tmp_path):
+    config = DeckConfig(40, 4, 12)
+    ranking, _ = config.ranking()
+    assert not ScoreEngine(config.ace_value, config.size, max(ranking.values())).packable
+    with pytest.raises(ValueError):
+        write_tables(str(tmp_path / "big.bin"), config)
+
+
+def test_other_byte_order(table_path):
+    with MappedTables(table_path) as tables:
+        flush_scores, non_flush_scores = tables.flush_scores.tolist(), tables.non_flush_scores.tolist()
+        count = len(tables.flush_table) + len(tables.non_flush_table)
+    with open(table_path, "rb") as file:
+        data = file.read()
+    payload = struct.pack(f">{count}Q", *struct.unpack(f"<{count}Q", data[128:]))
+    header = data[:16] + b">u8\0" + data[20:88] + zlib.crc32(payload).to_bytes(4, "little")
+    with open(table_path, "wb") as file:
+        file.write(header + zlib.crc32(header).to_bytes(4, "little") + data[96:128] + payload)
+    with MappedTables(table_path, verify=True) as tables:
+        assert tables.flush_scores.tolist() == flush_scores
+        assert tables.non_flush_scores.tolist() == non_flush_scores